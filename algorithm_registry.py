@@ -0,0 +1,163 @@
+"""
+Registry of the algorithms benchmark.py can measure.
+
+C algorithms are discovered from sorting_algorithms/*.c (every file that includes
+sort_harness.h). sorting_algorithms/algorithms.json gives each one its display label,
+the plot groups it belongs to and, where they differ from the defaults, its capabilities
+and extra compiler flags.
+A source file that is not listed there is benchmarked in the "main" group under a label
+derived from its name.
+
+Python baselines are sorted in-process on the same inputs, to show how far the C
+implementations are from the platform sorts used in production code.
+"""
+import json
+import operator
+import os
+import platform
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# kind is "c" or "python"; source is the .c file of a C algorithm (None for baselines);
+# groups are the plot groups it is reported in; compile_flags are added to the usual flags
+# when it is built (e.g. -pthread); capabilities is a frozenset of:
+#   comparisons       - reports its element comparisons
+#   memory_metrics    - reports peak RSS and heap allocations (sort_harness.h)
+#   hardware_counters - can read perf_event counters (sort_harness.h)
+#   server            - supports `--server`
+#   shared_library    - can be built as a shared library for --in-process
+#   negative_keys     - sorts negative keys correctly; without it, inputs holding a negative
+#                       key are skipped for the algorithm (benchmark.py supports_input)
+#   float_keys        - can be built for float64 elements (see element_types.py)
+#   threads           - takes a thread count (`--threads N`, see parallel_harness.h) and is
+#                       measured once per thread count, as the variants "<name>@<threads>"
+# When several build variants are benchmarked (benchmark.py --builds), every C algorithm is
+# measured once per build, as the variants "<name>+<build>" (thread variants: "<name>+<build>@<threads>").
+Algorithm = namedtuple("Algorithm", ["name", "kind", "label", "groups", "capabilities", "source", "compile_flags"])
+
+DEFAULT_C_CAPABILITIES = ["comparisons", "memory_metrics", "hardware_counters", "server", "shared_library", "negative_keys",
+                          "float_keys"]
+DEFAULT_GROUPS = ["main"]
+HARNESS_HEADER = "sort_harness.h"
+REGISTRY_FILE = "algorithms.json"
+
+# Executable paths of the Python baselines, so they travel through the experiment matrix
+# like the C executables
+PYTHON_BASELINE_PREFIX = "python:"
+# Separates an algorithm name from the thread count of one of its variants
+THREAD_VARIANT_SEPARATOR = "@"
+# Separates an algorithm name from the build variant (compiler and flags) it was built with
+BUILD_VARIANT_SEPARATOR = "+"
+
+def _as_list(data):
+    return np.asarray(data).tolist()
+
+def _as_array(data):
+    return np.array(data)
+
+def _list_key(values):
+    """Records become (key, payload) tuples in a list and are sorted by the key alone."""
+    return operator.itemgetter(0) if values and isinstance(values[0], tuple) else None
+
+def _array_order(values):
+    """Records are structured arrays and are sorted by their key field alone."""
+    return "key" if values.dtype.names else None
+
+# name: (label, prepare, sort). prepare copies the input outside the timed region;
+# sort sorts that copy (in place, or returning the sorted result).
+PYTHON_BASELINES = {
+    "python_sorted": ("Python sorted()", _as_list, lambda values: sorted(values, key=_list_key(values))),
+    "python_list_sort": ("Python list.sort()", _as_list, lambda values: values.sort(key=_list_key(values))),
+    "numpy_quicksort": ("NumPy sort (quicksort)", _as_array,
+                        lambda values: values.sort(kind="quicksort", order=_array_order(values))),
+    "numpy_mergesort": ("NumPy sort (mergesort)", _as_array,
+                        lambda values: values.sort(kind="mergesort", order=_array_order(values))),
+    "numpy_stable": ("NumPy sort (stable)", _as_array,
+                     lambda values: values.sort(kind="stable", order=_array_order(values))),
+}
+PYTHON_BASELINE_GROUPS = ["baselines"]
+
+def label_from_name(name):
+    """Fallback display label: quick_sort_random_pivot -> Quick Sort Random Pivot."""
+    return name.replace('_', ' ').title()
+
+def discover_algorithms(source_dir):
+    """Returns {name: Algorithm} for the C sources in source_dir and the Python baselines."""
+    registry_path = os.path.join(source_dir, REGISTRY_FILE)
+    config = {}
+    if os.path.exists(registry_path):
+        with open(registry_path) as f:
+            config = json.load(f)
+
+    algorithms = {}
+    for filename in sorted(os.listdir(source_dir)):
+        name, extension = os.path.splitext(filename)
+        if extension != ".c":
+            continue
+        path = os.path.join(source_dir, filename)
+        with open(path) as f:
+            if HARNESS_HEADER not in f.read():
+                continue  # Not a benchmarkable program
+        entry = config.get(name, {})
+        algorithms[name] = Algorithm(
+            name=name,
+            kind="c",
+            label=entry.get("label", label_from_name(name)),
+            groups=list(entry.get("groups", DEFAULT_GROUPS)),
+            capabilities=frozenset(entry.get("capabilities", DEFAULT_C_CAPABILITIES)),
+            source=path,
+            compile_flags=list(entry.get("compile_flags", [])),
+        )
+    for name in config:
+        if name not in algorithms:
+            print(f"Warning: {registry_path} lists '{name}' but there is no {name}.c using {HARNESS_HEADER}")
+
+    for name, (label, prepare, sort) in PYTHON_BASELINES.items():
+        algorithms[name] = Algorithm(name, "python", label, list(PYTHON_BASELINE_GROUPS),
+                                     frozenset(["negative_keys", "float_keys"]), None, [])
+    return algorithms
+
+def group_members(algorithms, group):
+    """Names of the algorithms reported in a group, in registry order."""
+    return [name for name, algorithm in algorithms.items() if group in algorithm.groups]
+
+def thread_variant(name, threads):
+    """Name of an algorithm run with a given thread count: parallel_merge_sort@4."""
+    return f"{name}{THREAD_VARIANT_SEPARATOR}{threads}"
+
+def split_thread_variant(name):
+    """Returns (algorithm name, thread count) of a variant, or (name, None) for any other name."""
+    base, separator, threads = name.rpartition(THREAD_VARIANT_SEPARATOR)
+    if separator and threads.isdigit():
+        return base, int(threads)
+    return name, None
+
+def build_variant(name, build):
+    """Name of an algorithm built as a given build variant: merge_sort+gcc-O3."""
+    return f"{name}{BUILD_VARIANT_SEPARATOR}{build}"
+
+def split_build_variant(name):
+    """Returns (algorithm name, build variant) of a build variant, or (name, None) for any other name."""
+    base, separator, build = name.partition(BUILD_VARIANT_SEPARATOR)
+    return (base, build) if separator else (name, None)
+
+def baseline_path(name):
+    """The executable path standing for a Python baseline in the experiment matrix."""
+    return PYTHON_BASELINE_PREFIX + name
+
+def is_baseline_path(executable_path):
+    return executable_path.startswith(PYTHON_BASELINE_PREFIX)
+
+def baseline_version():
+    """Identifies what a Python baseline ran on, in place of a compiler version."""
+    return f"python {platform.python_version()} numpy {np.__version__}"
+
+def run_python_baseline(executable_path, data):
+    """Sorts a copy of data with a Python baseline. Returns (time, comparisons, metrics)."""
+    label, prepare, sort = PYTHON_BASELINES[executable_path[len(PYTHON_BASELINE_PREFIX):]]
+    values = prepare(data)
+    start = time.perf_counter()
+    sort(values)
+    return time.perf_counter() - start, 0, {}
@@ -0,0 +1,100 @@
+"""
+Search space and search strategy of `benchmark.py tune`.
+
+The tunable C programs take their parameters as preprocessor macros whose defaults keep
+the untuned behavior: the insertion-sort cutoff of merge_sort.c and tuned_quick_sort.c,
+the pivot strategy of tuned_quick_sort.c (the strategies of the three quicksort variants)
+and the digit base of radix_sort.c. Every configuration is its own build.
+
+The configurations of an algorithm are compared by successive halving: all of them are
+measured with a few repetitions, the better third is kept and measured with three times
+as many, and so on until one is left or the time budget is used up. Each (input
+distribution, size band) gets its own search, because the best cutoff for 1,000 sorted
+elements need not be the best for 100,000 random ones.
+"""
+import itertools
+import time
+from collections import namedtuple
+
+import numpy as np
+
+# name: (macro, {value: macro value}); the first value is the program's default
+TUNING_PARAMETERS = {
+    "insertion_cutoff": ("SORT_INSERTION_CUTOFF", {value: str(value) for value in (1, 8, 16, 24, 32, 48, 64)}),
+    "pivot": ("SORT_PIVOT", {"median_of_three": "PIVOT_MEDIAN_OF_THREE", "first": "PIVOT_FIRST",
+                             "random": "PIVOT_RANDOM"}),
+    "radix_base": ("SORT_RADIX_BASE", {value: str(value) for value in (10, 16, 256, 1024, 65536)}),
+}
+# The parameters each tunable algorithm takes
+TUNABLE_ALGORITHMS = {
+    "merge_sort": ["insertion_cutoff"],
+    "tuned_quick_sort": ["pivot", "insertion_cutoff"],
+    "radix_sort": ["radix_base"],
+}
+# Upper bounds (inclusive) of the size bands inputs are tuned in
+SIZE_BANDS = [1000, 10000, 100000, float('inf')]
+HALVING_RATE = 3  # Successive halving keeps the best 1/HALVING_RATE and multiplies the repetitions by it
+MIN_REPETITIONS = 3
+
+# The measured times of one configuration on one search: times[i] is the total over the
+# band's inputs of repetition i
+Candidate = namedtuple("Candidate", ["config", "times"])
+
+def configurations(algorithm):
+    """Every configuration of an algorithm as a {parameter: value} dict, the default first."""
+    names = TUNABLE_ALGORITHMS[algorithm]
+    values = [list(TUNING_PARAMETERS[name][1]) for name in names]
+    return [dict(zip(names, combination)) for combination in itertools.product(*values)]
+
+def default_configuration(algorithm):
+    """The configuration the program is built with when no parameter is given."""
+    return configurations(algorithm)[0]
+
+def config_flags(config):
+    """The -D flags building a configuration."""
+    return [f"-D{TUNING_PARAMETERS[name][0]}={TUNING_PARAMETERS[name][1][value]}" for name, value in config.items()]
+
+def config_label(config):
+    """A configuration as text: "pivot=random, insertion_cutoff=16"."""
+    return ", ".join(f"{name}={value}" for name, value in config.items())
+
+def size_band(n):
+    """The size band of an input size, as its (lower, upper] bounds."""
+    lower = 0
+    for upper in SIZE_BANDS:
+        if n <= upper:
+            return lower, upper
+        lower = upper
+
+def band_label(band):
+    """A size band as text: "1000 < n <= 10000"."""
+    lower, upper = band
+    if upper == float('inf'):
+        return f"n > {lower}"
+    return f"n <= {upper}" if lower == 0 else f"{lower} < n <= {upper}"
+
+def score(candidate):
+    """Median total time of a candidate's repetitions; failed runs make it infinite."""
+    return float(np.median(candidate.times)) if candidate.times else float('inf')
+
+def successive_halving(configs, measure, deadline, min_repetitions=MIN_REPETITIONS, rate=HALVING_RATE):
+    """
+    Finds the fastest of configs. measure(config, repetitions) returns the total time over the
+    inputs of each repetition. Rounds stop early once time.monotonic() passes deadline, and the
+    ranking of the last completed measurements is used. Returns the candidates from fastest to slowest.
+    """
+    candidates = [Candidate(config, []) for config in configs]
+    survivors = candidates
+    repetitions = min_repetitions
+    while True:
+        for candidate in survivors:
+            if time.monotonic() > deadline and candidate.times:
+                continue  # Out of budget: keep what was measured
+            candidate.times.extend(measure(candidate.config, repetitions - len(candidate.times)))
+        survivors = sorted(survivors, key=score)
+        if len(survivors) == 1 or time.monotonic() > deadline:
+            break
+        survivors = survivors[:max(1, len(survivors) // rate)]
+        repetitions *= rate
+    # The survivors of the last round first, then the others by their last score
+    return survivors + sorted((candidate for candidate in candidates if candidate not in survivors), key=score)
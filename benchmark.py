@@ -1,135 +1,896 @@
 import os
+import argparse
+import atexit
+import concurrent.futures
+import ctypes
+import functools
+import hashlib
+import itertools
+import multiprocessing
+import random
+import struct
 import subprocess
+import sys
+import tempfile
+import threading
 import time
-import matplotlib.pyplot as plt
+import json
 import re
-import pandas as pd
+import shutil
 import numpy as np
-from scipy.stats import pearsonr
+from collections import namedtuple
+from autotune import (TUNABLE_ALGORITHMS, band_label, config_flags, config_label, configurations, default_configuration,
+                      score, size_band, successive_halving)
+from complexity_fit import fit_models, max_n_within, predict
+from environment import available_cores, environment_fingerprint, isolated_cores
+from external_sort import BYTES_PER_MB, DEFAULT_CHUNK_SIZES, RunMerger, external_sort, throughput_mb_s
+from element_types import (DEFAULT_ELEMENT_TYPE, ELEMENT_TYPES, case_name, element_compile_flags, element_keys,
+                           split_case)
+from algorithm_registry import (baseline_path, baseline_version, discover_algorithms, group_members,
+                                build_variant, is_baseline_path, label_from_name, run_python_baseline,
+                                split_build_variant, split_thread_variant, thread_variant)
+from result_store import MEMORY_PASS_STATUS, ResultStore, RunKey, current_host
 
 # --- Configuration ---
-C_FILES = [
-    "bubble_sort.c",
-    "heap_sort.c",
-    "insertion_sort.c",
-    "merge_sort.c",
-    "quick_sort_median_of_three_pivot.c",  # Using median of three pivot
-    "radix_sort.c",
-    "selection_sort.c",
-]
-
-# Quick Sort variants for analysis
-QUICK_SORT_VARIANTS = [
-    "quick_sort_first_pivot.c",  # Last element pivot
-    "quick_sort_median_of_three_pivot.c",  # Median of three pivot
-    "quick_sort_random_pivot.c",  # Random pivot
-]
-
-C_FILE_PATHS = [os.path.join("sorting_algorithms", f) for f in C_FILES]
-QUICK_SORT_PATHS = [os.path.join("sorting_algorithms", f) for f in QUICK_SORT_VARIANTS]
+ALGORITHMS_DIR = "sorting_algorithms"
+# Every algorithm that can be benchmarked: sorting_algorithms/*.c, described in
+# sorting_algorithms/algorithms.json, plus the Python/NumPy baselines (see algorithm_registry.py)
+ALGORITHMS = discover_algorithms(ALGORITHMS_DIR)
+
 EXECUTABLES_DIR = "executables"
+COMPILER = "gcc"
+# The recursive sorts need a large stack on big inputs: linked in on Windows,
+# raised with setrlimit before running the executables elsewhere
+COMPILE_FLAGS = ["-Wl,--stack=268435456"] if os.name == "nt" else []
+# The ways the C programs can be built (--builds): compiler, optimization flags and whether
+# the build is profile-guided, i.e. trained on the random inputs first (gcc only, see train_profile)
+BuildVariant = namedtuple("BuildVariant", ["compiler", "flags", "pgo"])
+BUILD_VARIANTS = {
+    "gcc-O0": BuildVariant("gcc", ["-O0"], False),
+    "gcc-O2": BuildVariant("gcc", ["-O2"], False),
+    "gcc-O3": BuildVariant("gcc", ["-O3"], False),
+    "gcc-O3-native": BuildVariant("gcc", ["-O3", "-march=native"], False),
+    "gcc-O3-pgo": BuildVariant("gcc", ["-O3"], True),
+    "clang-O0": BuildVariant("clang", ["-O0"], False),
+    "clang-O2": BuildVariant("clang", ["-O2"], False),
+    "clang-O3": BuildVariant("clang", ["-O3"], False),
+    "clang-O3-native": BuildVariant("clang", ["-O3", "-march=native"], False),
+}
+DEFAULT_BUILDS = ["gcc-O0"]  # gcc's default level, which the committed results were measured with
+PGO_TRAINING_MAX_N = 10000  # Profile-guided builds are trained on the random inputs up to this size
+# Extra flags for the shared-library builds used by --in-process (see sort_harness.h)
+SHARED_LIBRARY_FLAGS = ["-shared", "-fPIC", "-DSORT_SHARED_LIBRARY"]
+SHARED_LIBRARY_SUFFIX = ".dll" if os.name == "nt" else ".so"
+# How each run is executed: a new process per run with text input (default), a reused
+# --server process with binary input, or a ctypes call into a shared library
+EXECUTION_MODES = ["process", "server", "in-process"]
+STACK_SIZE_BYTES = 268435456
 TEST_DATA_DIR = "test_data"
 OUTPUT_GRAPHS_DIR = "graphs"
 OUTPUT_7_ALGOS_DIR = os.path.join(OUTPUT_GRAPHS_DIR, "7_sorting_algo_comparisons")
 OUTPUT_QUICK_SORT_DIR = os.path.join(OUTPUT_GRAPHS_DIR, "quick_sort_analysis")
+OUTPUT_BASELINES_DIR = os.path.join(OUTPUT_GRAPHS_DIR, "baseline_comparison")
+OUTPUT_PARALLEL_DIR = os.path.join(OUTPUT_GRAPHS_DIR, "parallel_scaling")
+OUTPUT_BUILDS_DIR = os.path.join(OUTPUT_GRAPHS_DIR, "build_comparison")  # Only with several --builds
 OUTPUT_CSV_DIR = os.path.join(OUTPUT_GRAPHS_DIR, "csv_data")
+RESULTS_DB_PATH = os.path.join(OUTPUT_CSV_DIR, "benchmark_results.sqlite")
+# Input hash of every rendered plot, so `report` only re-renders the plots whose data changed
+PLOT_MANIFEST_PATH = os.path.join(OUTPUT_GRAPHS_DIR, "plot_hashes.json")
+# Hash and key range of every test data file by its mtime and size, so that planning a run
+# (and `report`) does not read the unchanged inputs again
+DATA_INDEX_PATH = os.path.join(OUTPUT_GRAPHS_DIR, "test_data_index.json")
+# The plot groups an algorithm can belong to in algorithms.json: description and output directory
+GROUPS = {
+    "main": ("7 sorting algorithm comparisons", OUTPUT_7_ALGOS_DIR),
+    "quick_sort": ("Quick sort analysis", OUTPUT_QUICK_SORT_DIR),
+    "baselines": ("C algorithms vs. platform sorts", OUTPUT_BASELINES_DIR),
+    "parallel": ("Parallel scaling", OUTPUT_PARALLEL_DIR),
+}
 NUM_REPETITIONS = 7  # Number of times to run each experiment for averaging
+# Adaptive mode (--adaptive): repetitions per cell are chosen from the measured noise
+ADAPTIVE_WARMUP_RUNS = 1
+ADAPTIVE_MIN_REPETITIONS = 5
+ADAPTIVE_MAX_REPETITIONS = 100
+ADAPTIVE_CI_TARGET = 0.05  # Width of the median's 95% CI relative to the median
+ADAPTIVE_CELL_BUDGET_S = 30.0
+# Plot titles of the input cases
+STANDARD_CASE_LABELS = {
+    "random": "Average Case (Random Input)",
+    "reverse_sorted": "Worst Case (Reverse Sorted Input)",
+    "sorted": "Best Case (Sorted Input)",
+}
+# Plot titles of the input distributions beyond random/sorted/reverse_sorted (see generate_test_data.py)
+EXTRA_CASE_LABELS = {
+    "nearly_sorted": "Nearly Sorted Input",
+    "few_unique": "Few Unique Values Input",
+    "organ_pipe": "Organ Pipe Input",
+    "sawtooth": "Sawtooth Input",
+    "zipf": "Zipf Distributed Input",
+    "full_range": "Full 32-bit Range Input",
+}
+# Memory metrics reported by the C harness (sort_harness.h), with their CSV column names.
+# Peak RSS is the whole process's high-water mark, so in the default text mode it includes
+# the input array; the heap metrics only count what the sorting code allocates itself.
+MEMORY_METRICS = {
+    "peak_rss_kb": "Peak RSS (KB)",
+    "allocations": "Allocations",
+    "allocated_bytes": "Allocated Bytes",
+    "peak_heap_bytes": "Peak Heap Bytes",
+}
+# The heap metrics are only counted by builds with these flags (see sort_harness.h), which
+# measure() runs once per cell in a memory pass after the timed repetitions
+HEAP_METRICS = ["allocations", "allocated_bytes", "peak_heap_bytes"]
+ALLOCATION_COUNTING_FLAGS = ["-DSORT_COUNT_ALLOCATIONS"]
+# Memory metrics plotted against n for every input case
+MEMORY_PLOT_METRICS = ["peak_heap_bytes", "peak_rss_kb"]
+# Hardware performance counters read around the sort with --counters (perf_event, Linux only),
+# in the order of sort_harness.h's hardware_counters array, with their CSV column names
+HARDWARE_COUNTERS = {
+    "instructions": "Instructions",
+    "cycles": "Cycles",
+    "l1d_misses": "L1D Misses",
+    "llc_misses": "LLC Misses",
+    "branch_misses": "Branch Misses",
+}
+# Candidate predictors of time in the counter correlation analysis
+COUNTER_PREDICTORS = ["comparisons", *HARDWARE_COUNTERS]
+# compare: a cell is only reported as changed when the test is significant at COMPARE_ALPHA
+# (after the Benjamini-Hochberg correction over all cells), and the comparison fails when a
+# cell is significantly slower by more than COMPARE_THRESHOLD. Cells faster than
+# COMPARE_MIN_TIME_S on the baseline are too noisy to fail it
+COMPARE_ALPHA = 0.05
+COMPARE_THRESHOLD = 0.05
+COMPARE_MIN_TIME_S = 1e-4
+# Complexity fits: the size predicted for, and the time budget of "largest n sortable within"
+PREDICT_N = 10_000_000
+TIME_BUDGET_S = 0.01
+# tune: the search's time budget and where the best configurations are saved
+TUNE_BUDGET_S = 600.0  # Total time budget of `tune`, shared equally by its searches
+TUNE_RESULTS_PATH = os.path.join(OUTPUT_CSV_DIR, "tuning_results.csv")
+# external: its outputs, the default in-memory algorithms of the run phase, the merge phase's
+# source and the external sorts per cell
+OUTPUT_EXTERNAL_DIR = os.path.join(OUTPUT_GRAPHS_DIR, "external_sort")
+EXTERNAL_RESULTS_PATH = os.path.join(OUTPUT_CSV_DIR, "external_sort_results.csv")
+EXTERNAL_ALGORITHMS = ["merge_sort", "quick_sort_median_of_three_pivot", "heap_sort", "radix_sort"]
+EXTERNAL_MERGE_SOURCE = "kway_merge.c"
+EXTERNAL_REPETITIONS = 3
 # The maximum input size to consider for plotting. Adjust if needed.
 MAX_PLOT_N = 100000 
 
 # --- Helper Functions ---
 
-def compile_c_code(c_file_path, output_executable_path):
-    """Compiles a C source file into an executable."""
+def compile_c_code(c_file_path, output_executable_path, flags=COMPILE_FLAGS, compiler=COMPILER):
+    """Compiles a C source file into an executable. Raises RuntimeError with the compiler's output if it fails."""
     print(f"Compiling {c_file_path}...")
     try:
         subprocess.run(
-            ["gcc", c_file_path, "-o", output_executable_path, "-Wl,--stack=268435456"],
+            [compiler, c_file_path, "-o", output_executable_path, *flags],
             check=True,
             capture_output=True,
             text=True
         )
         print(f"Successfully compiled {c_file_path} to {output_executable_path}")
     except subprocess.CalledProcessError as e:
-        print(f"Error compiling {c_file_path}:")
-        print(f"Stdout: {e.stdout}")
-        print(f"Stderr: {e.stderr}")
-        exit(1)
+        raise RuntimeError(f"Error compiling {c_file_path}:\nStdout: {e.stdout}\nStderr: {e.stderr}") from e
+
+@functools.lru_cache(maxsize=None)
+def compiler_version(compiler=COMPILER):
+    """Returns the first line of `<compiler> --version`, which is part of every build cache key."""
+    result = subprocess.run([compiler, "--version"], capture_output=True, text=True, check=True)
+    return result.stdout.splitlines()[0]
+
+def source_dependencies(c_file_path):
+    """Returns the C file followed by the local headers it includes with #include "...", also through other local headers."""
+    dependencies = [c_file_path]
+    for path in dependencies:  # Grows with the headers found
+        with open(path) as f:
+            headers = re.findall(r'^#include\s+"([^"]+)"', f.read(), re.MULTILINE)
+        for header in headers:
+            header_path = os.path.join(os.path.dirname(path), header)
+            if header_path not in dependencies:
+                dependencies.append(header_path)
+    return dependencies
+
+@functools.lru_cache(maxsize=None)
+def file_sha256(path):
+    """Returns the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def source_hash(c_file_path):
+    """Hashes a C file together with its local headers."""
+    digest = hashlib.sha256()
+    for path in source_dependencies(c_file_path):
+        digest.update(file_sha256(path).encode())
+    return digest.hexdigest()[:16]
+
+def build_cache_key(c_file_path, flags=COMPILE_FLAGS, compiler=COMPILER):
+    """Hashes the source (and its local headers), the compiler version and the flags."""
+    digest = hashlib.sha256()
+    digest.update(source_hash(c_file_path).encode())
+    digest.update(compiler_version(compiler).encode())
+    digest.update(" ".join(flags).encode())
+    return digest.hexdigest()[:16]
+
+def algorithm_flags(algorithm, shared=False, flags=COMPILE_FLAGS):
+    """The flags a C algorithm is built with: the common ones, its own (algorithms.json) and the shared-library ones."""
+    return flags + algorithm.compile_flags + (SHARED_LIBRARY_FLAGS if shared else [])
+
+def build_flags(build, element_type=DEFAULT_ELEMENT_TYPE):
+    """The flags every C program of a build variant is built with for one element type."""
+    return COMPILE_FLAGS + BUILD_VARIANTS[build].flags + element_compile_flags(element_type)
+
+def available_builds(builds):
+    """The build variants whose compiler is installed, warning about the others."""
+    available = [build for build in builds if shutil.which(BUILD_VARIANTS[build].compiler)]
+    for build in builds:
+        if build not in available:
+            print(f"Warning: {BUILD_VARIANTS[build].compiler} not found; skipping the {build} build.")
+    return available
+
+def train_profile(c_file_path, executable_path, flags, compiler, training_files):
+    """
+    First half of a profile-guided build: builds an instrumented executable in a profile
+    directory next to executable_path, runs it on each training input and returns the flags
+    that compile with the recorded profile. A shared library is trained as an executable.
+    """
+    profile_dir = os.path.abspath(executable_path) + ".profile"
+    shutil.rmtree(profile_dir, ignore_errors=True)
+    os.makedirs(profile_dir)
+    # gcc names the profile after -dumpdir and -dumpbase, which must match in both builds
+    profile_flags = ["-dumpdir", profile_dir + os.sep, "-dumpbase", os.path.splitext(os.path.basename(c_file_path))[0]]
+    instrumented_path = os.path.join(profile_dir, "instrumented" + (".exe" if os.name == "nt" else ""))
+    instrumented_flags = [flag for flag in flags if flag not in SHARED_LIBRARY_FLAGS]
+    compile_c_code(c_file_path, instrumented_path, instrumented_flags + profile_flags + [f"-fprofile-generate={profile_dir}"],
+                   compiler)
+    for path in training_files:
+        run_benchmark(instrumented_path, read_test_data(path))
+    # The shared library leaves out main(), whose profile then does not match
+    return profile_flags + [f"-fprofile-use={profile_dir}", "-fprofile-correction", "-Wno-missing-profile",
+                            "-Wno-coverage-mismatch"]
+
+def build_executables(c_files, flags=COMPILE_FLAGS, shared=False, extra_flags=None, compiler=COMPILER, training_files=None):
+    """
+    Compiles each distinct source once into EXECUTABLES_DIR and returns {base_name: executable_path}.
+    Executables are named after their build cache key, so unchanged sources are not rebuilt;
+    the remaining ones are compiled in parallel, and the first failing compile raises RuntimeError.
+    extra_flags maps a source to the flags it needs on top of `flags`. With shared=True, shared
+    libraries for --in-process are built instead.
+    With training_files (data file paths), the builds are profile-guided (see train_profile),
+    and the training inputs are part of the cache key.
+    """
+    extra_flags = extra_flags or {}
+    file_flags = {c_file: flags + extra_flags.get(c_file, []) + (SHARED_LIBRARY_FLAGS if shared else [])
+                  for c_file in c_files}
+    training_key = ["-fprofile-use", *(data_hash(path) for path in training_files)] if training_files else []
+    executables = {}
+    pending = {}
+    for c_file in dict.fromkeys(c_files):
+        base_name = os.path.splitext(c_file)[0]
+        c_file_path = os.path.join(ALGORITHMS_DIR, c_file)
+        executable_name = f"{base_name}-{build_cache_key(c_file_path, file_flags[c_file] + training_key, compiler)}"
+        if shared:
+            executable_name += SHARED_LIBRARY_SUFFIX
+        elif os.name == "nt":
+            executable_name += ".exe"
+        executable_path = os.path.join(EXECUTABLES_DIR, executable_name)
+        executables[base_name] = executable_path
+        if os.path.exists(executable_path):
+            print(f"Up to date: {c_file_path} ({executable_path})")
+        else:
+            pending[c_file_path] = (executable_path, file_flags[c_file])
+
+    def compile_atomically(c_file_path, executable_path, c_file_flags):
+        # Build under a temporary name so an interrupted compile never looks cached
+        root, ext = os.path.splitext(executable_path)
+        tmp_path = f"{root}.tmp{os.getpid()}{ext}"
+        try:
+            if training_files:
+                c_file_flags = c_file_flags + train_profile(c_file_path, executable_path, c_file_flags, compiler, training_files)
+            compile_c_code(c_file_path, tmp_path, c_file_flags, compiler)
+            os.replace(tmp_path, executable_path)
+        finally:
+            if os.path.exists(tmp_path):  # The compile failed: leave nothing half-written in the cache
+                os.remove(tmp_path)
+
+    with concurrent.futures.ThreadPoolExecutor(max_workers=len(available_cores())) as executor:
+        futures = [executor.submit(compile_atomically, c_file_path, *build)
+                   for c_file_path, build in pending.items()]
+        try:
+            for future in concurrent.futures.as_completed(futures):
+                future.result()
+        except BaseException:
+            # Stop at the first failure: the compiles that have not started yet are cancelled
+            for future in futures:
+                future.cancel()
+            raise
+    return executables
+
+def raise_stack_limit(stack_size=STACK_SIZE_BYTES):
+    """Raises this process's soft stack limit, which the spawned C programs inherit (POSIX only)."""
+    try:
+        import resource
+    except ImportError:
+        return  # Windows: the stack size is linked into the executables instead
+    soft, hard = resource.getrlimit(resource.RLIMIT_STACK)
+    if soft != resource.RLIM_INFINITY and soft < stack_size:
+        new_soft = stack_size if hard == resource.RLIM_INFINITY else min(stack_size, hard)
+        resource.setrlimit(resource.RLIMIT_STACK, (new_soft, hard))
 
 def read_test_data(filepath):
-    """Reads integers from a given test data file, one integer per line."""
+    """
+    Reads integers from a given test data file. Binary .npy files (see generate_test_data.py)
+    are memory-mapped without copying; .txt files hold one integer per line.
+    """
+    if filepath.endswith(".npy"):
+        return np.load(filepath, mmap_mode='r')
     with open(filepath, 'r') as f:
         data = [int(line.strip()) for line in f if line.strip()] # Read all non-empty lines as integers
     return data
 
-def run_benchmark(executable_path, data):
+def parse_benchmark_output(lines):
+    """
+    Extracts (time, comparisons, metrics) from the "NAME: value" lines printed by the C programs.
+    Lines other than TIME:/COMPARISONS: (PEAK_RSS_KB:, ALLOCATIONS:, ...) go into the metrics
+    dict under their lowercased name; negative values mean "not available" and are left out.
+    """
+    timing = float('inf')
+    comparisons = 0
+    metrics = {}
+    for line in lines:
+        if line.startswith("TIME:"):
+            timing = float(line.split(":")[1].strip())
+        elif line.startswith("COMPARISONS:"):
+            comparisons = int(line.split(":")[1].strip())
+        elif ":" in line:
+            name, value = line.split(":", 1)
+            try:
+                value = float(value)
+            except ValueError:
+                continue
+            if value >= 0:
+                metrics[name.strip().lower()] = value
+    return timing, comparisons, metrics
+
+class SortServer:
+    """
+    A long-lived C sorting process started with `--server`. Arrays are sent as a
+    native int32 length followed by the elements (see element_types.py); the process answers each
+    one with TIME/COMPARISONS and memory metric lines on stdout, ended by an END line.
+    """
+
+    def __init__(self, executable_path, threads=None):
+        self.executable_path = executable_path
+        self.process = subprocess.Popen(
+            [executable_path, "--server", *thread_arguments(threads)],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+        )
+
+    def sort(self, data, timeout=None):
+        """
+        Sends one array to the server and returns (time, comparisons, metrics). If no answer arrives
+        within `timeout` seconds the server is killed and subprocess.TimeoutExpired is raised.
+        """
+        timed_out = threading.Event()
+
+        def kill():
+            timed_out.set()
+            self.process.kill()
+
+        timer = threading.Timer(timeout, kill) if timeout is not None else None
+        if timer is not None:
+            timer.start()
+        try:
+            # No copy when the data is already a contiguous array (e.g. a memory-mapped .npy), whose
+            # elements are laid out like the element_t the server was built with
+            payload = np.ascontiguousarray(data) if isinstance(data, np.ndarray) else np.asarray(data, dtype=np.intc)
+            self.process.stdin.write(struct.pack("=i", len(payload)))
+            self.process.stdin.write(memoryview(payload))
+            self.process.stdin.flush()
+            lines = []
+            while not lines or lines[-1] not in ("END", ""):
+                lines.append(self.process.stdout.readline().decode().strip())
+        except OSError:
+            if not timed_out.is_set():
+                raise
+            lines = [""]
+        finally:
+            if timer is not None:
+                timer.cancel()
+
+        if lines[-1] != "END":
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(self.executable_path, timeout)
+            raise RuntimeError(f"server exited with code {self.process.wait()}")
+        return parse_benchmark_output(lines)
+
+    def close(self):
+        """Asks the server to stop and waits for it to exit."""
+        try:
+            self.process.stdin.write(struct.pack("=i", -1))
+            self.process.stdin.close()
+        except OSError:
+            pass  # Already gone
+        self.process.wait()
+
+def thread_arguments(threads):
+    """Command-line arguments giving a parallel program its thread count (see parallel_harness.h)."""
+    return ["--threads", str(threads)] if threads is not None else []
+
+# One server per (executable, thread count), per (worker) process
+_sort_servers = {}
+
+def get_sort_server(executable_path, threads=None):
+    """Returns the running server for an executable and thread count, starting it on first use."""
+    if (executable_path, threads) not in _sort_servers:
+        _sort_servers[(executable_path, threads)] = SortServer(executable_path, threads)
+    return _sort_servers[(executable_path, threads)]
+
+@atexit.register
+def close_sort_servers():
+    """Stops every server started by this process."""
+    while _sort_servers:
+        _sort_servers.popitem()[1].close()
+
+class SharedLibrarySorter:
+    """
+    A sorting algorithm built as a shared library and called in-process through ctypes.
+    The input is copied into a reused buffer of its element type with a single memcpy before
+    every run, and the library sorts that buffer in place.
+    """
+
+    def __init__(self, library_path):
+        self.library = ctypes.CDLL(os.path.abspath(library_path))
+        self.library.benchmarkSort.argtypes = [ctypes.c_void_p, ctypes.c_int]
+        self.library.benchmarkSort.restype = ctypes.c_double
+        self.comparison_count = ctypes.c_longlong.in_dll(self.library, "comparison_count")
+        self.memory_counters = {name: ctypes.c_longlong.in_dll(self.library, name)
+                                for name in ("allocation_count", "allocated_bytes", "peak_heap_bytes")}
+        self.hardware_counters = (ctypes.c_longlong * len(HARDWARE_COUNTERS)).in_dll(self.library, "hardware_counters")
+        self.element_bytes = ctypes.c_int.in_dll(self.library, "sort_element_bytes").value
+        self.buffer = np.empty(0, dtype=np.intc)
+
+    def sort(self, data, threads=None):
+        """
+        Sorts a copy of data and returns (time, comparisons, metrics). Peak RSS is left out:
+        the process is the Python interpreter, whose high-water mark says nothing about the sort.
+        threads sets the thread count of a parallel algorithm (its exported sort_threads).
+        """
+        if threads is not None:
+            ctypes.c_int.in_dll(self.library, "sort_threads").value = threads
+        dtype = data.dtype if isinstance(data, np.ndarray) else np.dtype(np.intc)
+        if dtype.itemsize != self.element_bytes:
+            raise ValueError(f"{dtype} elements do not match the {self.element_bytes}-byte elements the library was built for")
+        if len(self.buffer) != len(data) or self.buffer.dtype != dtype:
+            self.buffer = np.empty(len(data), dtype=dtype)
+        np.copyto(self.buffer, data, casting="unsafe")
+        elapsed = self.library.benchmarkSort(self.buffer.ctypes.data, len(self.buffer))
+        # -1 marks a counter that was not requested or is not available: the heap counters
+        # outside the allocation-counting builds, the hardware counters without --counters
+        metrics = {name: counter.value for name, counter in zip(HEAP_METRICS, self.memory_counters.values())
+                   if counter.value >= 0}
+        metrics.update((name, value) for name, value in zip(HARDWARE_COUNTERS, self.hardware_counters) if value >= 0)
+        return elapsed, self.comparison_count.value, metrics
+
+# One loaded library per path, per (worker) process
+_shared_library_sorters = {}
+
+def get_shared_library_sorter(library_path):
+    """Returns the loaded shared library for a path, loading it on first use."""
+    if library_path not in _shared_library_sorters:
+        _shared_library_sorters[library_path] = SharedLibrarySorter(library_path)
+    return _shared_library_sorters[library_path]
+
+def text_input(data):
+    """
+    The text a C program reads its input from outside --server mode: the element count, then the
+    keys. Records are sent as their keys; the program fills in the payload (see read_element).
+    """
+    return f"{len(data)}\n" + " ".join(map(str, element_keys(data)))
+
+def run_benchmark(executable_path, data, mode="process", timeout=None, threads=None):
     """
     Runs the compiled C program with the given data, reads timing from C code.
-    Input data is passed via stdin. Returns (time, comparisons).
+    Input data is passed via stdin. Returns (time, comparisons, metrics), metrics being the
+    memory measurements reported by the program (see MEMORY_METRICS).
     Time is measured inside C code using clock_gettime(), not Python subprocess overhead.
+    In "server" mode, the data is sent in binary to a reused `--server` process instead
+    of starting the program and encoding the data as text for every run. In "in-process"
+    mode, executable_path is a shared library that is called directly through ctypes.
+    Raises subprocess.TimeoutExpired if the run takes longer than `timeout` seconds
+    (in-process runs cannot be interrupted, so they are only flagged afterwards).
+    threads is the thread count of a parallel algorithm, None for the others.
     """
-    input_str = f"{len(data)}\n" + " ".join(map(str, data))
+    if mode == "in-process" or is_baseline_path(executable_path):
+        # Python baselines always run in this process, whatever the mode
+        if is_baseline_path(executable_path):
+            time_taken, comparisons, metrics = run_python_baseline(executable_path, data)
+        else:
+            time_taken, comparisons, metrics = get_shared_library_sorter(executable_path).sort(data, threads)
+        if timeout is not None and time_taken > timeout:
+            raise subprocess.TimeoutExpired(executable_path, timeout)
+        return time_taken, comparisons, metrics
+
+    if mode == "server":
+        try:
+            return get_sort_server(executable_path, threads).sort(data, timeout)
+        except subprocess.TimeoutExpired:
+            # The server was killed; the next run starts a fresh one
+            _sort_servers.pop((executable_path, threads)).close()
+            raise
+        except (OSError, RuntimeError) as e:
+            print(f"Error running {executable_path} in server mode with data size {len(data)}: {e}")
+            # Drop the dead server so the next run starts a fresh one
+            _sort_servers.pop((executable_path, threads)).close()
+            return float('inf'), 0, {}  # Return infinity for failed runs
+
+    input_str = text_input(data)
     
     try:
         # Use subprocess.run to send input via stdin and capture stdout/stderr
         process = subprocess.run(
-            [executable_path],
+            [executable_path, *thread_arguments(threads)],
             input=input_str,
             capture_output=True,
             text=True,
-            check=True
+            check=True,
+            timeout=timeout
         )
         
         # Extract timing and comparison count from stderr
-        timing = float('inf')
-        comparisons = 0
-        stderr_lines = process.stderr.strip().split('\n')
-        for line in stderr_lines:
-            if line.startswith("TIME:"):
-                timing = float(line.split(":")[1].strip())
-            elif line.startswith("COMPARISONS:"):
-                comparisons = int(line.split(":")[1].strip())
-        
-        return timing, comparisons
+        return parse_benchmark_output(process.stderr.strip().split('\n'))
     except subprocess.CalledProcessError as e:
         print(f"Error running {executable_path} with data size {len(data)}:")
         print(f"Stdout: {e.stdout}")
         print(f"Stderr: {e.stderr}")
-        return float('inf'), 0  # Return infinity for failed runs
+        return float('inf'), 0, {}  # Return infinity for failed runs
+
+def measure_run(executable_path, data, mode="process", timeout=None, threads=None):
+    """
+    Runs the benchmark once and returns (time, comparisons, status, metrics), where status is
+    "ok", "crashed" or "timeout". Failed runs have an infinite time.
+    """
+    try:
+        time_taken, comparisons, metrics = run_benchmark(executable_path, data, mode, timeout, threads)
+    except subprocess.TimeoutExpired:
+        return float('inf'), 0, "timeout", {}
+    return time_taken, comparisons, "ok" if time_taken != float('inf') else "crashed", metrics
+
+def thread_counts(max_threads):
+    """The thread counts parallel algorithms are measured with: 1, 2, 4, ... and max_threads itself."""
+    counts = [1]
+    while counts[-1] * 2 < max_threads:
+        counts.append(counts[-1] * 2)
+    if max_threads > 1:
+        counts.append(max_threads)
+    return counts
+
+def low_noise_cores():
+    """
+    The cores --low-noise pins the benchmark to: the cores isolated with isolcpus= if there are
+    any, otherwise the last core this process may use (the first ones usually handle more interrupts).
+    """
+    return isolated_cores() or available_cores()[-1:]
+
+def _init_worker(core_queue):
+    """Pins a pool worker (and the C programs it spawns) to the core it takes from the queue."""
+    core = core_queue.get()
+    if hasattr(os, "sched_setaffinity"):
+        os.sched_setaffinity(0, {core})
+
+@functools.lru_cache(maxsize=4)
+def _load_test_data(filepath):
+    """Per-process cache so a worker reads each data file once for all its repetitions."""
+    return read_test_data(filepath)
+
+# One task of the experiment matrix. `repetition` is the repetition index for fixed
+# repetition counts, or None when `adaptive` (an AdaptivePolicy) decides how many to run.
+# `timeout` is the per-run time limit in seconds, or None for no limit. `threads` is the
+# thread count of a parallel algorithm's variant, None for the single-threaded algorithms.
+Experiment = namedtuple("Experiment", ["algorithm", "executable_path", "data_filepath", "repetition", "mode", "adaptive",
+                                       "timeout", "threads"])
+
+# Adaptive mode: after warmup_runs discarded runs, repeat until the median's confidence
+# interval is narrower than ci_target (relative to the median) with at least
+# min_repetitions, or until max_repetitions or time_budget seconds are used up.
+AdaptivePolicy = namedtuple("AdaptivePolicy", ["warmup_runs", "min_repetitions", "max_repetitions", "ci_target", "time_budget"])
+
+def median_confidence_interval(values, confidence=0.95):
+    """Distribution-free confidence interval of the median, from binomial order statistics."""
+    from scipy.stats import binom
+    ordered = np.sort(values)
+    n = len(ordered)
+    rank = max(int(binom.ppf((1 - confidence) / 2, n, 0.5)), 1)
+    return ordered[rank - 1], ordered[n - rank]
+
+def summarize_runs(times):
+    """
+    Returns min/mean/median/p95/stddev and the 95% CIs of the median (ci_low/ci_high)
+    and of the mean (mean_ci_low/mean_ci_high) for one cell's run times.
+    """
+    from scipy.stats import t as student_t
+    times = np.asarray(times, dtype=float)
+    if len(times) == 0 or not np.all(np.isfinite(times)):
+        # Any crashed run marks the whole cell as failed
+        failed = {key: float('inf') for key in ("min", "mean", "median", "p95", "stddev",
+                                                 "ci_low", "ci_high", "mean_ci_low", "mean_ci_high")}
+        failed["repetitions"] = len(times)
+        return failed
+    ci_low, ci_high = median_confidence_interval(times)
+    stddev = float(times.std(ddof=1)) if len(times) > 1 else 0.0
+    mean_half_width = student_t.ppf(0.975, len(times) - 1) * stddev / np.sqrt(len(times)) if len(times) > 1 else 0.0
+    return {
+        "repetitions": len(times),
+        "min": float(times.min()),
+        "mean": float(times.mean()),
+        "median": float(np.median(times)),
+        "p95": float(np.percentile(times, 95)),
+        "stddev": stddev,
+        "ci_low": float(ci_low),
+        "ci_high": float(ci_high),
+        "mean_ci_low": float(times.mean() - mean_half_width),
+        "mean_ci_high": float(times.mean() + mean_half_width),
+    }
+
+def run_adaptive(executable_path, data, policy, mode="process", timeout=None, threads=None):
+    """
+    Runs one cell until its median is precise enough or its budget is spent.
+    Returns [(time, comparisons, status, metrics), ...]; a failed run ends the cell.
+    """
+    for _ in range(policy.warmup_runs):
+        if measure_run(executable_path, data, mode, timeout, threads)[2] != "ok":
+            break  # Measure the failure below so it gets recorded
+
+    runs = []
+    started = time.perf_counter()
+    while len(runs) < policy.max_repetitions:
+        runs.append(measure_run(executable_path, data, mode, timeout, threads))
+        if runs[-1][2] != "ok" or time.perf_counter() - started >= policy.time_budget:
+            break
+        if len(runs) >= policy.min_repetitions:
+            times = [t for t, c, status, metrics in runs]
+            ci_low, ci_high = median_confidence_interval(times)
+            median = np.median(times)
+            if median > 0 and (ci_high - ci_low) / median <= policy.ci_target:
+                break
+    return runs
+
+def _run_experiment(experiment):
+    """Runs one task of the experiment matrix. Returns (experiment, [(repetition, time, comparisons, status, metrics), ...])."""
+    data = _load_test_data(experiment.data_filepath)
+    if experiment.adaptive is None:
+        run = measure_run(experiment.executable_path, data, experiment.mode, experiment.timeout, experiment.threads)
+        return experiment, [(experiment.repetition, *run)]
+    runs = run_adaptive(experiment.executable_path, data, experiment.adaptive, experiment.mode, experiment.timeout,
+                        experiment.threads)
+    return experiment, [(repetition, *run) for repetition, run in enumerate(runs)]
+
+def build_experiment_matrix(executables, test_data_files, mode="process", adaptive=None, timeout=None,
+                            repetitions=NUM_REPETITIONS):
+    """
+    Expands every (data file x algorithm x repetition) combination into a list of tasks,
+    with `repetitions` repetitions per cell.
+    executables is {algorithm: {element type: executable path}}; data files of an element type
+    an algorithm was not built for are left out for it.
+    With an AdaptivePolicy there is a single task per (data file x algorithm) cell. The thread
+    count of a parallel algorithm's variant is taken from its name (see thread_variant).
+    """
+    tasks = []
+    for data_file in test_data_files:
+        data_filepath = os.path.join(TEST_DATA_DIR, data_file)
+        element_type = split_case(extract_n_and_type(data_file)[1])[1]
+        for algo_base_name, executables_by_type in executables.items():
+            if element_type not in executables_by_type:
+                continue
+            executable_path = executables_by_type[element_type]
+            for repetition in [None] if adaptive is not None else range(repetitions):
+                tasks.append(Experiment(algo_base_name, executable_path, data_filepath, repetition, mode, adaptive, timeout,
+                                        split_thread_variant(algo_base_name)[1]))
+    return tasks
+
+def unmeasured_tasks(tasks, run_keys, measured):
+    """
+    The tasks --resume still has to run: those whose (RunKey, repetition) is not in measured
+    (see ResultStore.measured_repetitions). An adaptive task stands for its whole cell.
+    """
+    measured_cells = {run_key for run_key, repetition in measured}
+
+    def already_measured(task):
+        run_key = run_keys[(task.algorithm, task.data_filepath)]
+        if task.repetition is None:
+            return run_key in measured_cells  # Adaptive cells are measured as a whole
+        return (run_key, task.repetition) in measured
+
+    return [task for task in tasks if not already_measured(task)]
+
+def run_experiments(tasks, jobs=1, on_result=None):
+    """
+    Runs the experiment matrix, sequentially or on a pool of `jobs` workers pinned to
+    separate cores. The thread variants of parallel algorithms need cores of their own and
+    must be timed alike for their speedups to be meaningful, so with a pool they all run
+    afterwards, one at a time, in this (unpinned) process.
+    Returns {(algo, data_filepath): [(time, comparisons, status, metrics), ...]}.
+    on_result(algo, data_filepath, repetition, time, comparisons, status, metrics) is called for each finished run.
+    """
+    measurements = {}
+    if jobs <= 1:
+        results = map(_run_experiment, tasks)
+        pool = None
+    else:
+        cores = available_cores()
+        if jobs > len(cores):
+            print(f"Warning: {jobs} jobs requested but only {len(cores)} cores available; cores will be shared.")
+        core_queue = multiprocessing.Queue()
+        for i in range(jobs):
+            core_queue.put(cores[i % len(cores)])
+        # Largest inputs first so the long O(n^2) runs don't end up as stragglers
+        tasks = sorted(tasks, key=lambda task: extract_n_and_type(os.path.basename(task.data_filepath))[0], reverse=True)
+        threaded = [task for task in tasks if task.threads is not None]
+        pool = multiprocessing.Pool(jobs, initializer=_init_worker, initargs=(core_queue,))
+        results = itertools.chain(pool.imap_unordered(_run_experiment, [task for task in tasks if task.threads is None]),
+                                  map(_run_experiment, threaded))
+
+    try:
+        for done, (experiment, runs) in enumerate(results, 1):
+            for repetition, time_taken, comparisons, status, metrics in runs:
+                measurements.setdefault((experiment.algorithm, experiment.data_filepath), []).append((time_taken, comparisons, status, metrics))
+                if on_result is not None:
+                    on_result(experiment.algorithm, experiment.data_filepath, repetition, time_taken, comparisons, status, metrics)
+            if done % 100 == 0 or done == len(tasks):
+                print(f"  Completed {done}/{len(tasks)} tasks")
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
+    return measurements
+
+def fit_power_law(ns, values):
+    """Least-squares fit of values = c * n^k on a log-log scale. Returns (c, k)."""
+    k, log_c = np.polyfit(np.log(ns), np.log(values), 1)
+    return float(np.exp(log_c)), float(k)
+
+def predict_cell(history, n, points=3):
+    """
+    Predicts (time, comparisons) at size n from [(n, time, comparisons), ...] measured at
+    smaller sizes, using a power law through the last `points` of them. Returns None
+    when fewer than two sizes with a positive time are available.
+    """
+    usable = [(hn, t, c) for hn, t, c in sorted(history) if t > 0][-points:]
+    if len(usable) < 2:
+        return None
+    ns = [hn for hn, t, c in usable]
+    c_time, k_time = fit_power_law(ns, [t for hn, t, c in usable])
+    predicted_comparisons = 0
+    if all(c > 0 for hn, t, c in usable):
+        c_comp, k_comp = fit_power_law(ns, [c for hn, t, c in usable])
+        predicted_comparisons = c_comp * n ** k_comp
+    return c_time * n ** k_time, predicted_comparisons
+
+def predict_over_budget(history, n, budget):
+    """
+    Decides from the smaller sizes of the same algorithm and input type whether a run at
+    size n would exceed the per-run budget. history is [(n, [(time, comparisons, status, metrics), ...]), ...].
+    Returns (over_budget, prediction), prediction being (time, comparisons) or None.
+    """
+    measured = []
+    too_slow_before = False
+    for smaller_n, runs in sorted(history):
+        statuses = {run[2] for run in runs}
+        if statuses & {"timeout", "skipped", "extrapolated"}:
+            too_slow_before = True  # Larger inputs will not be any faster
+        elif statuses == {"ok"}:
+            measured.append((smaller_n, float(np.median([run[0] for run in runs])),
+                             float(np.mean([run[1] for run in runs]))))
+    prediction = predict_cell(measured, n)
+    over_budget = too_slow_before or (prediction is not None and prediction[0] > budget)
+    return over_budget, prediction
+
+def cell_history(store, run_keys, test_data_files, algo_base_name, data_type, below_n, max_repetitions=None):
+    """
+    Stored runs of an algorithm on the smaller inputs of one type, as [(n, runs), ...]. Inputs the
+    algorithm does not support have no run key (see supports_input) and no history.
+    """
+    history = []
+    for data_file in test_data_files:
+        n, file_type = extract_n_and_type(data_file)
+        if file_type != data_type or n >= below_n:
+            continue
+        run_key = run_keys.get((algo_base_name, os.path.join(TEST_DATA_DIR, data_file)))
+        runs = store.load(run_key, max_repetitions) if run_key else []
+        if runs:
+            history.append((n, runs))
+    return history
 
 def extract_n_and_type(filename):
-    """Extracts N and data type (random, sorted, reverse_sorted) from a filename."""
-    match = re.match(r"n_(\d+)_(\w+)\.txt", filename) # Corrected regex: \.txt instead of \\.txt
+    """
+    Extracts N and data type (random, sorted, reverse_sorted, nearly_sorted, ...) from a filename.
+    Inputs of other element types than int32 have it appended: n_1000_random.int64.npy is "random.int64".
+    """
+    match = re.match(r"n_(\d+)_(\w+(?:\.\w+)?)\.(txt|npy)$", filename)
     if match:
         return int(match.group(1)), match.group(2)
     return None, None
 
-def plot_results(results, plot_type, output_dir, metric="time"):
-    """Generates and saves a plot for a specific case (best, worst, average)."""
+def list_test_data_files(test_data_dir):
+    """Lists the test data files sorted by (N, type), preferring .npy over .txt for the same input."""
+    files_by_input = {}
+    for filename in os.listdir(test_data_dir):
+        n, data_type = extract_n_and_type(filename)
+        if n is None:
+            continue
+        if (n, data_type) not in files_by_input or filename.endswith(".npy"):
+            files_by_input[(n, data_type)] = filename
+    return [files_by_input[key] for key in sorted(files_by_input)]
+
+def _pyplot():
+    """Imports pyplot on first use, with the non-interactive backend: the plots are only saved."""
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+    return plt
+
+def _plot_series(data_points, label, log_scale=False):
+    """
+    Plots one algorithm's (n, value) points, or (n, value, low, high) points with error bars.
+    On a log scale, non-positive values are left out.
+    """
+    plt = _pyplot()
+    points = [dp for dp in data_points if dp[0] <= MAX_PLOT_N and (dp[1] > 0 or not log_scale)]
+    if not points:
+        return
+    ns = [dp[0] for dp in points]
+    values = [dp[1] for dp in points]
+    style = dict(marker='o', linestyle='-', label=label, linewidth=2, markersize=6)
+    if all(len(dp) == 4 and np.isfinite(dp[2]) and np.isfinite(dp[3]) for dp in points):
+        yerr = [[v - dp[2] for v, dp in zip(values, points)], [dp[3] - v for v, dp in zip(values, points)]]
+        plt.errorbar(ns, values, yerr=yerr, capsize=3, **style)
+    else:
+        plt.plot(ns, values, **style)
+
+# Axis label, title word and file name suffix of the non-time metrics that can be plotted
+METRIC_PLOT_LABELS = {
+    "comparisons": ("Number of Comparisons", "Comparisons", "_comparisons"),
+    "peak_rss_kb": ("Peak RSS (KB)", "Peak RSS", "_peak_rss"),
+    "peak_heap_bytes": ("Peak Heap Usage (bytes)", "Peak Heap", "_peak_heap"),
+    "allocations": ("Number of Allocations", "Allocations", "_allocations"),
+}
+
+def plot_results(results, plot_type, output_dir, metric="time", statistic="Average"):
+    """
+    Generates and saves a plot for a specific case (best, worst, average).
+    Time points may carry a (low, high) interval, which is drawn as error bars.
+    metric is "time" or one of METRIC_PLOT_LABELS. Returns the paths of the saved plots.
+    """
+    plt = _pyplot()
+    if metric != "time":
+        metric_label, metric_title, metric_suffix = METRIC_PLOT_LABELS[metric]
+    else:
+        metric_suffix = "_time"
     # ===== Linear Scale Plot =====
     plt.figure(figsize=(12, 7))
     
     for algo_name, data_points in results.items():
         # Sort data points by N for correct plotting
         data_points.sort(key=lambda x: x[0])
-        ns = [dp[0] for dp in data_points if dp[0] <= MAX_PLOT_N]
-        values = [dp[1] for dp in data_points if dp[0] <= MAX_PLOT_N]
-        plt.plot(ns, values, marker='o', linestyle='-', label=algo_name, linewidth=2, markersize=6)
+        _plot_series(data_points, algo_name)
 
     plt.xlabel("Input Size (n)", fontsize=11)
     if metric == "time":
-        plt.ylabel("Average Execution Time (s)", fontsize=11)
+        plt.ylabel(f"{statistic} Execution Time (s)", fontsize=11)
         plt.title(f"Sorting Algorithm Performance (Time): {plot_type} Case", fontsize=12, fontweight='bold')
     else:
-        plt.ylabel("Number of Comparisons", fontsize=11)
-        plt.title(f"Sorting Algorithm Performance (Comparisons): {plot_type} Case", fontsize=12, fontweight='bold')
+        plt.ylabel(metric_label, fontsize=11)
+        plt.title(f"Sorting Algorithm Performance ({metric_title}): {plot_type} Case", fontsize=12, fontweight='bold')
     
     plt.legend(fontsize=10, loc='best')
     plt.grid(True, alpha=0.3)
     plt.xscale('log')  # Use log scale for x-axis if N values span a wide range
     plt.tight_layout()
     
-    metric_suffix = "_time" if metric == "time" else "_comparisons"
     output_path = os.path.join(output_dir, f"sorting_algorithms_{plot_type.lower().replace(' ', '_')}_case{metric_suffix}.png")
     plt.savefig(output_path, dpi=150)
     print(f"Generated plot: {output_path}")
@@ -141,23 +902,19 @@ def plot_results(results, plot_type, output_dir, metric="time"):
     for algo_name, data_points in results.items():
         # Sort data points by N for correct plotting
         data_points.sort(key=lambda x: x[0])
-        ns = [dp[0] for dp in data_points if dp[0] <= MAX_PLOT_N]
-        values = [dp[1] for dp in data_points if dp[0] <= MAX_PLOT_N]
         # Filter out zero or negative values for log scale
-        filtered_ns = [n for n, v in zip(ns, values) if v > 0]
-        filtered_values = [v for v in values if v > 0]
-        if filtered_values:
-            plt.plot(filtered_ns, filtered_values, marker='o', linestyle='-', label=algo_name, linewidth=2, markersize=6)
+        _plot_series(data_points, algo_name, log_scale=True)
 
     plt.xlabel("Input Size (n)", fontsize=11)
     if metric == "time":
-        plt.ylabel("Average Execution Time (s) - Log Scale", fontsize=11)
+        plt.ylabel(f"{statistic} Execution Time (s) - Log Scale", fontsize=11)
         plt.title(f"Sorting Algorithm Performance (Time) - Log Scale: {plot_type} Case", fontsize=12, fontweight='bold')
     else:
-        plt.ylabel("Number of Comparisons - Log Scale", fontsize=11)
-        plt.title(f"Sorting Algorithm Performance (Comparisons) - Log Scale: {plot_type} Case", fontsize=12, fontweight='bold')
+        plt.ylabel(f"{metric_label} - Log Scale", fontsize=11)
+        plt.title(f"Sorting Algorithm Performance ({metric_title}) - Log Scale: {plot_type} Case", fontsize=12, fontweight='bold')
     
-    plt.legend(fontsize=10, loc='best')
+    if plt.gca().get_legend_handles_labels()[0]:  # Nothing is left when every value is zero
+        plt.legend(fontsize=10, loc='best')
     plt.grid(True, alpha=0.3, which='both')
     plt.xscale('log')
     plt.yscale('log')  # Logarithmic scale on Y-axis for better visibility
@@ -168,14 +925,365 @@ def plot_results(results, plot_type, output_dir, metric="time"):
     plt.savefig(output_path_log, dpi=150)
     print(f"Generated plot: {output_path_log}")
     plt.close()
+    return [output_path, output_path_log]
+
+def display_name_for(algo):
+    """
+    The algorithm's label from the registry, for plot legends and tables, with the build and
+    the thread count of a variant: "Parallel Merge Sort [gcc-O3] (4 threads)".
+    """
+    name, threads = split_thread_variant(algo)
+    name, build = split_build_variant(name)
+    label = ALGORITHMS[name].label if name in ALGORITHMS else label_from_name(name)
+    if build is not None:
+        label += f" [{build}]"
+    if threads is not None:
+        label += f" ({threads} thread{'s' if threads > 1 else ''})"
+    return label
+
+def supports_element_type(algorithm, element_type):
+    """Whether a registry algorithm can be built for an element type; float64 keys need float_keys."""
+    return element_type != "float64" or "float_keys" in algorithm.capabilities
+
+_data_index = {}  # {path: {"stat": [mtime_ns, size], fact: value, ...}}, loaded from index_path
+_data_index_state = {"index_path": None, "changed": False}
+
+def data_file_fact(data_filepath, fact, compute, index_path=None):
+    """
+    A fact about a test data file (its hash, whether it has negative keys), computed with
+    compute(data_filepath) only when the index at index_path (default: DATA_INDEX_PATH) has none
+    for the file's current mtime and size. save_data_index() writes the new facts back.
+    """
+    index_path = index_path or DATA_INDEX_PATH
+    if _data_index_state["index_path"] != index_path:
+        _data_index.clear()
+        if os.path.exists(index_path):
+            with open(index_path) as f:
+                _data_index.update(json.load(f))
+        _data_index_state.update(index_path=index_path, changed=False)
+    stat = os.stat(data_filepath)
+    entry = _data_index.get(data_filepath)
+    if entry is None or entry["stat"] != [stat.st_mtime_ns, stat.st_size]:
+        entry = _data_index[data_filepath] = {"stat": [stat.st_mtime_ns, stat.st_size]}
+    if fact not in entry:
+        entry[fact] = compute(data_filepath)
+        _data_index_state["changed"] = True
+    return entry[fact]
+
+def save_data_index():
+    """Writes the facts computed since the index was loaded, leaving out the files that are gone."""
+    index_path = _data_index_state["index_path"]
+    if index_path is None or not _data_index_state["changed"]:
+        return
+    os.makedirs(os.path.dirname(index_path) or ".", exist_ok=True)
+    tmp_path = f"{index_path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump({path: entry for path, entry in _data_index.items() if os.path.exists(path)}, f, indent=1)
+    os.replace(tmp_path, index_path)
+    _data_index_state["changed"] = False
+
+def data_hash(data_filepath):
+    """The SHA-256 of a test data file, through the data index (which notices changed files, unlike file_sha256's cache)."""
+    return data_file_fact(data_filepath, "sha256", file_sha256.__wrapped__)
+
+def _scan_negative_keys(data_filepath):
+    keys = np.asarray(element_keys(read_test_data(data_filepath)))
+    return bool(len(keys)) and bool(keys.min() < 0)
+
+def has_negative_keys(data_filepath):
+    """Whether an input holds a negative key; the generated ones never do, hand-written ones can."""
+    return data_file_fact(data_filepath, "negative_keys", _scan_negative_keys)
+
+def supports_input(algorithm, data_filepath):
+    """Whether a registry algorithm can sort an input: its element type, and negative keys need negative_keys."""
+    element_type = split_case(extract_n_and_type(os.path.basename(data_filepath))[1])[1]
+    if not supports_element_type(algorithm, element_type):
+        return False
+    return "negative_keys" in algorithm.capabilities or not has_negative_keys(data_filepath)
+
+_negative_key_warnings = set()  # (algorithm, data file) pairs already noted
+
+def warn_negative_keys(algorithm, data_filepath):
+    """Notes an input skipped for an algorithm because of its negative keys, once per pair."""
+    if (algorithm.name, data_filepath) not in _negative_key_warnings:
+        _negative_key_warnings.add((algorithm.name, data_filepath))
+        print(f"Note: {algorithm.name} does not support negative keys; skipping {os.path.basename(data_filepath)}.")
+
+def counts_comparisons(algo):
+    """Whether an algorithm reports comparisons; the Python baselines do not."""
+    name = split_build_variant(split_thread_variant(algo)[0])[0]
+    return name not in ALGORITHMS or "comparisons" in ALGORITHMS[name].capabilities
+
+def case_label_for(data_type):
+    """
+    Plot title of an input case, e.g. "Worst Case (Reverse Sorted Input)" or "Zipf Distributed Input",
+    followed by the element type if it is not int32: "Zipf Distributed Input - float64".
+    """
+    distribution, element_type = split_case(data_type)
+    if distribution in STANDARD_CASE_LABELS:
+        label = STANDARD_CASE_LABELS[distribution]
+    else:
+        label = EXTRA_CASE_LABELS.get(distribution, distribution.replace('_', ' ').title() + " Input")
+    return label if element_type == DEFAULT_ELEMENT_TYPE else f"{label} - {element_type}"
+
+def input_type_label(data_type):
+    """The Input Type column of the tables: "Reverse Sorted", or "Reverse Sorted (int64)" for other element types."""
+    distribution, element_type = split_case(data_type)
+    label = distribution.replace('_', ' ').title()
+    return label if element_type == DEFAULT_ELEMENT_TYPE else f"{label} ({element_type})"
+
+def case_plot_jobs(results, data_type, output_dir, time_points, statistic="Average"):
+    """The time and comparisons plots of one input case (random, sorted, zipf, ...)."""
+    case_label = case_label_for(data_type)
+    case_time = {}
+    case_comp = {}
+    for algo, types in results.items():
+        case_time[display_name_for(algo)] = time_points(algo, types[data_type], data_type)
+        if counts_comparisons(algo):
+            case_comp[display_name_for(algo)] = [(n, c) for n, t, c in types[data_type]]
+    jobs = [PlotJob(plot_results, (case_time, case_label, output_dir, "time", statistic))]
+    if case_comp:
+        jobs.append(PlotJob(plot_results, (case_comp, case_label, output_dir, "comparisons")))
+    return jobs
+
+def memory_plot_jobs(results, data_type, output_dir, memory_points):
+    """The memory vs N plots (MEMORY_PLOT_METRICS) of one input case."""
+    jobs = []
+    for metric in MEMORY_PLOT_METRICS:
+        case_memory = {display_name_for(algo): memory_points(algo, types[data_type], data_type, metric)
+                       for algo, types in results.items()}
+        if any(case_memory.values()):
+            jobs.append(PlotJob(plot_results, (case_memory, case_label_for(data_type), output_dir, metric)))
+    return jobs
+
+def scaling_series(results, data_type):
+    """
+    Speedup of each thread count over the same parallel program on one thread, for one input
+    type: {algorithm: {threads: [(n, speedup), ...]}}. results holds the thread variants
+    (parallel_merge_sort@4, ...); cells that failed with either thread count are left out, and
+    so are the thread counts and algorithms left without any cell.
+    """
+    times = {}
+    for algo, types in results.items():
+        name, threads = split_thread_variant(algo)
+        if threads is not None:
+            times.setdefault(name, {})[threads] = {n: t for n, t, c in types[data_type] if np.isfinite(t) and t > 0}
+    series = {}
+    for name, by_threads in times.items():
+        if 1 not in by_threads or len(by_threads) < 2:
+            continue  # Nothing to compare with
+        single = by_threads[1]
+        by_threads = {threads: [(n, single[n] / t) for n, t in sorted(cells.items()) if n in single]
+                      for threads, cells in sorted(by_threads.items()) if threads > 1}
+        by_threads = {threads: points for threads, points in by_threads.items() if points}
+        if by_threads:
+            series[name] = by_threads
+    return series
+
+def plot_scaling(results, plot_type, output_dir, metric="speedup"):
+    """
+    Speedup (or parallel efficiency, the speedup divided by the thread count) vs N of each
+    parallel algorithm, one subplot per algorithm and one line per thread count.
+    results is {algorithm label: {threads: [(n, speedup), ...]}}. Returns the saved plot's path.
+    """
+    plt = _pyplot()
+    fig, axes = plt.subplots(1, len(results), figsize=(6 * len(results), 5), squeeze=False)
+    for ax, (algo_name, by_threads) in zip(axes[0], results.items()):
+        for threads, points in by_threads.items():
+            ns = [n for n, speedup in points if n <= MAX_PLOT_N]
+            values = [speedup / threads if metric == "efficiency" else speedup
+                      for n, speedup in points if n <= MAX_PLOT_N]
+            if ns:
+                ax.plot(ns, values, marker='o', linestyle='-', linewidth=2, markersize=5, label=f"{threads} threads")
+        # Speedup 1: no gain over one thread; efficiency 1: perfect scaling
+        ax.axhline(1.0, color='gray', linestyle='--', linewidth=1)
+        if ax.get_legend_handles_labels()[0]:
+            ax.set_xscale('log')  # A log axis without any positive x breaks the layout
+        else:
+            ax.text(0.5, 0.5, f"No sizes up to {MAX_PLOT_N}", ha='center', va='center', transform=ax.transAxes)
+        ax.set_xlabel("Input Size (n)", fontsize=10)
+        ax.set_ylabel("Parallel Efficiency" if metric == "efficiency" else "Speedup over 1 Thread", fontsize=10)
+        ax.set_title(algo_name, fontsize=10, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(fontsize=9, loc='best')
+    title = "Parallel Efficiency" if metric == "efficiency" else "Parallel Speedup"
+    fig.suptitle(f"{title}: {plot_type} Case", fontsize=12, fontweight='bold')
+    fig.tight_layout()
+    output_path = os.path.join(output_dir, f"parallel_{plot_type.lower().replace(' ', '_')}_case_{metric}.png")
+    fig.savefig(output_path, dpi=150)
+    print(f"Generated plot: {output_path}")
+    plt.close(fig)
+    return [output_path]
+
+def scaling_plot_jobs(results, data_type, output_dir):
+    """The speedup and parallel efficiency plots of one input case, if the group has parallel algorithms."""
+    series = {display_name_for(name): by_threads for name, by_threads in scaling_series(results, data_type).items()}
+    if not series:
+        return []
+    case_label = case_label_for(data_type)
+    return [PlotJob(plot_scaling, (series, case_label, output_dir, metric)) for metric in ("speedup", "efficiency")]
+
+def scaling_table(results, data_types):
+    """
+    Rows of the parallel scaling summary: for every parallel algorithm, input type and thread
+    count, the speedup and efficiency at the largest N and the break-even N, the smallest N
+    from which every measured size ran faster than on one thread.
+    """
+    rows = []
+    for data_type in data_types:
+        for name, by_threads in scaling_series(results, data_type).items():
+            for threads, points in by_threads.items():
+                if not points:
+                    continue
+                largest_n, speedup = points[-1]
+                slower = [n for n, point_speedup in points if point_speedup <= 1]
+                paying = [n for n, point_speedup in points if not slower or n > max(slower)]
+                rows.append({
+                    "Algorithm": display_name_for(name),
+                    "Input Type": input_type_label(data_type),
+                    "Threads": threads,
+                    "Largest N": largest_n,
+                    "Speedup": f"{speedup:.2f}",
+                    "Efficiency": f"{speedup / threads:.2f}",
+                    "Break-even N": paying[0] if paying else "never",
+                })
+    return rows
+
+def build_speedups(results, data_type, builds, reference):
+    """
+    Speedup of each build variant over the reference build, at the largest N both measured,
+    for one input type: {algorithm: {build: (n, time, speedup)}}, algorithm being the variant
+    name without its build (merge_sort, parallel_merge_sort@4, ...). builds maps the names in
+    results to their build variant (None for the baselines, which are left out).
+    """
+    times = {}
+    for algo, types in results.items():
+        if builds.get(algo) is None:
+            continue
+        name, threads = split_thread_variant(algo)
+        name = split_build_variant(name)[0]
+        key = thread_variant(name, threads) if threads is not None else name
+        times.setdefault(key, {})[builds[algo]] = {n: t for n, t, c in types[data_type] if np.isfinite(t) and t > 0}
+    speedups = {}
+    for name, by_build in times.items():
+        if reference not in by_build or len(by_build) < 2:
+            continue  # Nothing to compare with
+        reference_times = by_build[reference]
+        for build, cells in by_build.items():
+            common = sorted(set(cells) & set(reference_times))
+            if common:
+                n = common[-1]
+                speedups.setdefault(name, {})[build] = (n, cells[n], reference_times[n] / cells[n])
+    return speedups
+
+def plot_build_speedups(results, plot_type, output_dir, reference):
+    """
+    Bar chart of the speedup of every build variant over the reference build, one group of
+    bars per algorithm. results is {algorithm label: {build: speedup}}. Returns the saved plot's path.
+    """
+    plt = _pyplot()
+    builds = list(dict.fromkeys(build for by_build in results.values() for build in by_build))
+    positions = np.arange(len(results))
+    width = 0.8 / len(builds)
+    plt.figure(figsize=(max(12, 1.2 * len(results)), 7))
+    for i, build in enumerate(builds):
+        values = [by_build.get(build, 0) for by_build in results.values()]
+        plt.bar(positions + i * width, values, width, label=build)
+    plt.axhline(1.0, color='gray', linestyle='--', linewidth=1)  # As fast as the reference build
+    plt.xticks(positions + width * (len(builds) - 1) / 2, list(results), rotation=45, ha='right', fontsize=9)
+    plt.ylabel(f"Speedup over {reference}", fontsize=11)
+    plt.title(f"Speedup of Each Build at the Largest N: {plot_type} Case", fontsize=12, fontweight='bold')
+    plt.legend(fontsize=10, loc='best')
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+    output_path = os.path.join(output_dir, f"builds_{plot_type.lower().replace(' ', '_')}_case_speedup.png")
+    plt.savefig(output_path, dpi=150)
+    print(f"Generated plot: {output_path}")
+    plt.close()
+    return [output_path]
+
+def build_plot_jobs(results, data_types, builds, reference, output_dir):
+    """The build speedup plot of each input case."""
+    jobs = []
+    for data_type in data_types:
+        speedups = build_speedups(results, data_type, builds, reference)
+        if speedups:
+            labels = {display_name_for(name): {build: speedup for build, (n, t, speedup) in by_build.items()}
+                      for name, by_build in speedups.items()}
+            jobs.append(PlotJob(plot_build_speedups, (labels, case_label_for(data_type), output_dir, reference)))
+    return jobs
+
+def build_table(results, data_types, builds, reference):
+    """Rows of the build variant summary: every algorithm's time and speedup per build at the largest N."""
+    rows = []
+    for data_type in data_types:
+        for name, by_build in build_speedups(results, data_type, builds, reference).items():
+            for build, (n, time_taken, speedup) in by_build.items():
+                rows.append({
+                    "Algorithm": display_name_for(name),
+                    "Input Type": input_type_label(data_type),
+                    "Largest N": n,
+                    "Build": build,
+                    "Time (s)": f"{time_taken:.6f}",
+                    f"Speedup vs {reference}": f"{speedup:.2f}",
+                })
+    return rows
+
+def plot_external_sort(results, plot_type, output_dir, metric="phases"):
+    """
+    The external sort of one input case, one subplot per algorithm. results is
+    {algorithm label: [(n, chunk size, run phase, merge phase, I/O throughput), ...]}.
+    metric "phases" plots the run-phase (solid) and merge-phase (dashed) time vs N, one color
+    per chunk size; "throughput" plots the I/O throughput of both phases vs the chunk size,
+    one line per N. Large N is the point of this track, so MAX_PLOT_N does not apply.
+    Returns the saved plot's path.
+    """
+    plt = _pyplot()
+    fig, axes = plt.subplots(1, len(results), figsize=(6 * len(results), 5), squeeze=False)
+    for ax, (algo_name, points) in zip(axes[0], results.items()):
+        if metric == "phases":
+            for i, chunk_size in enumerate(sorted({point[1] for point in points})):
+                series = sorted(point for point in points if point[1] == chunk_size)
+                ns = [point[0] for point in series]
+                color = f"C{i}"
+                ax.plot(ns, [point[2] for point in series], marker='o', linestyle='-', color=color, linewidth=2,
+                        markersize=5, label=f"run phase, chunk {chunk_size:,}")
+                ax.plot(ns, [point[3] for point in series], marker='s', linestyle='--', color=color, linewidth=2,
+                        markersize=5, label=f"merge phase, chunk {chunk_size:,}")
+            ax.set_xlabel("Input Size (n)", fontsize=10)
+            ax.set_ylabel("Time (seconds)", fontsize=10)
+            ax.set_yscale('log')
+        else:
+            for n in sorted({point[0] for point in points}):
+                series = sorted((point[1], point[4]) for point in points if point[0] == n)
+                ax.plot([chunk_size for chunk_size, _ in series], [throughput for _, throughput in series],
+                        marker='o', linestyle='-', linewidth=2, markersize=5, label=f"n = {n:,}")
+            ax.set_xlabel("Chunk Size (elements)", fontsize=10)
+            ax.set_ylabel("I/O Throughput (MB/s)", fontsize=10)
+        ax.set_xscale('log')
+        ax.set_title(algo_name, fontsize=10, fontweight='bold')
+        ax.grid(True, alpha=0.3)
+        if ax.get_legend_handles_labels()[0]:
+            ax.legend(fontsize=8, loc='best')
+    title = "External Sort Phases" if metric == "phases" else "External Sort I/O Throughput"
+    fig.suptitle(f"{title}: {plot_type}", fontsize=12, fontweight='bold')
+    fig.tight_layout()
+    output_path = os.path.join(output_dir, f"external_{re.sub(r'[^a-z0-9]+', '_', plot_type.lower()).strip('_')}_{metric}.png")
+    fig.savefig(output_path, dpi=150)
+    print(f"Generated plot: {output_path}")
+    plt.close(fig)
+    return [output_path]
 
 def plot_correlation(results, output_dir):
     """Generate correlation plots between time and comparisons for each algorithm."""
-    plt.figure(figsize=(14, 10))
-    
+    from scipy.stats import pearsonr
+    plt = _pyplot()
     num_algos = len(results)
     rows = (num_algos + 1) // 2
     cols = 2
+    # Build and thread variants add subplots; keep each row readable
+    plt.figure(figsize=(14, max(10, 3 * rows)))
     
     for idx, (algo_name, data_points) in enumerate(results.items(), 1):
         plt.subplot(rows, cols, idx)
@@ -210,215 +1318,922 @@ def plot_correlation(results, output_dir):
     plt.savefig(output_path, dpi=150)
     print(f"Generated correlation plot: {output_path}")
     plt.close()
+    return [output_path]
+
+def group_plot_jobs(results, output_dir, data_types, time_points, memory_points, statistic="Average", counter_data=None):
+    """
+    Every plot of one algorithm group: time and comparisons vs N, memory vs N and, for the
+    parallel algorithms, speedup and efficiency vs N for each input case, the
+    time/comparisons correlation and, given counter_data, the time/hardware counter correlation.
+    """
+    jobs = []
+    for data_type in data_types:
+        jobs += case_plot_jobs(results, data_type, output_dir, time_points, statistic)
+    for data_type in data_types:
+        jobs += memory_plot_jobs(results, data_type, output_dir, memory_points)
+    for data_type in data_types:
+        jobs += scaling_plot_jobs(results, data_type, output_dir)
+
+    # Correlation data - combine all cases, as (n, time, comparisons)
+    correlation_data = {display_name_for(algo): [point for data_type in data_types for point in types[data_type]]
+                        for algo, types in results.items() if counts_comparisons(algo)}
+    if correlation_data:
+        jobs.append(PlotJob(plot_correlation, (correlation_data, output_dir)))
+    if counter_data is not None:
+        jobs.append(PlotJob(plot_counter_correlation, (counter_data, output_dir)))
+    return jobs
+
+def counter_correlations(cells):
+    """
+    Pearson correlation between time and each of COUNTER_PREDICTORS over one algorithm's
+    cells, given as [(time, comparisons, metrics), ...]. Returns {predictor: r}, leaving out
+    predictors that some cell did not report or that never change.
+    """
+    from scipy.stats import pearsonr
+    cells = [cell for cell in cells if np.isfinite(cell[0])]
+    times = [t for t, c, metrics in cells]
+    correlations = {}
+    for predictor in COUNTER_PREDICTORS:
+        values = [c if predictor == "comparisons" else metrics.get(predictor) for t, c, metrics in cells]
+        if len(cells) > 2 and None not in values and np.ptp(values) > 0:
+            correlations[predictor] = float(pearsonr(values, times)[0])
+    return correlations
+
+def plot_counter_correlation(results, output_dir):
+    """Bar chart of how well comparisons and each hardware counter correlate with time, per algorithm."""
+    plt = _pyplot()
+    correlations = {algo_name: counter_correlations(cells) for algo_name, cells in results.items()}
+    predictors = [p for p in COUNTER_PREDICTORS if any(p in corr for corr in correlations.values())]
+    if not predictors:
+        return []
+    plt.figure(figsize=(14, 7))
+    width = 0.8 / len(predictors)
+    positions = np.arange(len(correlations))
+    for i, predictor in enumerate(predictors):
+        values = [corr.get(predictor, np.nan) for corr in correlations.values()]
+        plt.bar(positions + i * width, values, width, label=predictor.replace('_', ' ').title())
+    plt.xticks(positions + width * (len(predictors) - 1) / 2, list(correlations), rotation=20, ha='right', fontsize=9)
+    plt.ylabel("Correlation with Execution Time (r)", fontsize=11)
+    plt.title("Which Counter Predicts Execution Time?", fontsize=12, fontweight='bold')
+    plt.ylim(min(0, np.nanmin([r for corr in correlations.values() for r in corr.values()])), 1.05)
+    plt.legend(fontsize=9, loc='lower right')
+    plt.grid(True, alpha=0.3, axis='y')
+    plt.tight_layout()
+    output_path = os.path.join(output_dir, "time_vs_counters_correlation.png")
+    plt.savefig(output_path, dpi=150)
+    print(f"Generated correlation plot: {output_path}")
+    plt.close()
+    return [output_path]
+
+# One plot to render: function(*args) saves it and returns the paths of the files it wrote
+PlotJob = namedtuple("PlotJob", ["function", "args"])
+
+def plot_job_id(job):
+    """Identifies a plot independently of its data: the function and every argument but the data."""
+    return repr((job.function.__name__, job.args[1:]))
+
+def plot_job_hash(job, script_hash):
+    """Hashes a plot's input data together with this script's hash, so changes to the plotting code re-render too."""
+    digest = hashlib.sha256(script_hash.encode())
+    digest.update(repr((job.function.__name__, job.args)).encode())
+    return digest.hexdigest()
+
+def _render_plot(job):
+    return job.function(*job.args)
+
+def render_plots(jobs, workers=1, manifest_path=PLOT_MANIFEST_PATH):
+    """
+    Renders the plots on a pool of `workers` processes. A plot whose input hash is the one
+    recorded in the manifest at its last rendering, and whose files still exist, is skipped.
+    Returns (rendered, unchanged) counts.
+    """
+    manifest = {}
+    if os.path.exists(manifest_path):
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+
+    script_hash = file_sha256(os.path.abspath(__file__))
+    pending = []
+    for job in jobs:
+        previous = manifest.get(plot_job_id(job))
+        job_hash = plot_job_hash(job, script_hash)
+        if previous and previous["hash"] == job_hash and all(os.path.exists(path) for path in previous["outputs"]):
+            continue
+        pending.append((job, job_hash))
+
+    if workers > 1 and len(pending) > 1:
+        with concurrent.futures.ProcessPoolExecutor(max_workers=workers) as executor:
+            outputs = list(executor.map(_render_plot, [job for job, job_hash in pending]))
+    else:
+        outputs = [_render_plot(job) for job, job_hash in pending]
+
+    for (job, job_hash), job_outputs in zip(pending, outputs):
+        manifest[plot_job_id(job)] = {"hash": job_hash, "outputs": job_outputs}
+    tmp_path = f"{manifest_path}.tmp{os.getpid()}"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp_path, manifest_path)
+    return len(pending), len(jobs) - len(pending)
+
+def load_comparison_cells(path):
+    """
+    Reads a results file for `compare`. Returns {(algorithm, input type, n): cell}, where a cell
+    holds "samples" (the individual times, or None) and "mean", "median", "stddev" and
+    "repetitions". Result stores (.sqlite) provide the individual repetitions; the CSV table
+    only the per-cell statistics. Failed cells are left out.
+    """
+    import pandas as pd
+    cells = {}
+    if path.endswith(".csv"):
+        table = pd.read_csv(path)
+        required = {"Median Time (s)", "Stddev Time (s)", "Repetitions"}
+        if not required <= set(table.columns):
+            raise ValueError(f"{path} has no {', '.join(sorted(required))} columns; rerun the benchmark to regenerate it")
+        for _, row in table.iterrows():
+            mean = pd.to_numeric(row["Average Time (s)"], errors="coerce")
+            if not np.isfinite(mean):
+                continue  # Crashed/Timeout
+            cells[(row["Algorithm"], row["Input Type"], int(row["Input Size (N)"]))] = {
+                "samples": None,
+                "mean": float(mean),
+                "median": float(row["Median Time (s)"]),
+                "stddev": float(row["Stddev Time (s)"]),
+                "repetitions": int(row["Repetitions"]),
+            }
+        return cells
+
+    store = ResultStore(path)
+    try:
+        stored_cells = store.load_cells()
+    finally:
+        store.close()
+    for (algo, data_type, n), runs in stored_cells.items():
+        if any(status != "ok" for t, status in runs):
+            continue
+        times = np.array([t for t, status in runs])
+        # Named like the CSV so a store can be compared with a table
+        cells[(display_name_for(algo), input_type_label(data_type), n)] = {
+            "samples": times,
+            "mean": float(times.mean()),
+            "median": float(np.median(times)),
+            "stddev": float(times.std(ddof=1)) if len(times) > 1 else 0.0,
+            "repetitions": len(times),
+        }
+    return cells
+
+def compare_cell(baseline, candidate):
+    """
+    Tests whether the candidate's times differ from the baseline's. With individual repetitions
+    on both sides this is a two-sided Mann-Whitney U test, with Cliff's delta as the effect size
+    (from -1: always faster to +1: always slower). With per-cell statistics only, it is Welch's
+    t-test with Cohen's d. Returns (relative change of the center, p-value, effect size label).
+    """
+    from scipy.stats import mannwhitneyu, ttest_ind_from_stats
+    if baseline["samples"] is not None and candidate["samples"] is not None:
+        u_statistic, p_value = mannwhitneyu(candidate["samples"], baseline["samples"], alternative="two-sided")
+        delta = 2 * u_statistic / (len(candidate["samples"]) * len(baseline["samples"])) - 1
+        change = candidate["median"] / baseline["median"] - 1 if baseline["median"] > 0 else 0.0
+        return change, float(p_value), f"delta={delta:+.2f}"
+
+    if baseline["repetitions"] < 2 or candidate["repetitions"] < 2:
+        return candidate["mean"] / baseline["mean"] - 1, float('nan'), "n/a"
+    _, p_value = ttest_ind_from_stats(candidate["mean"], candidate["stddev"], candidate["repetitions"],
+                                      baseline["mean"], baseline["stddev"], baseline["repetitions"], equal_var=False)
+    pooled = np.sqrt((candidate["stddev"] ** 2 + baseline["stddev"] ** 2) / 2)
+    cohens_d = (candidate["mean"] - baseline["mean"]) / pooled if pooled > 0 else 0.0
+    change = candidate["mean"] / baseline["mean"] - 1 if baseline["mean"] > 0 else 0.0
+    return change, float(p_value) if np.isfinite(p_value) else float('nan'), f"d={cohens_d:+.2f}"
+
+def adjust_p_values(p_values):
+    """
+    Benjamini-Hochberg adjusted p-values of the cells tested by one comparison, which keep the
+    expected share of false discoveries among the significant cells below the significance level.
+    Untestable cells (nan) stay nan and do not count as tests.
+    """
+    from scipy.stats import false_discovery_control
+    p_values = np.asarray(p_values, dtype=float)
+    adjusted = np.full(len(p_values), float('nan'))
+    tested = np.isfinite(p_values)
+    if tested.any():
+        adjusted[tested] = false_discovery_control(p_values[tested], method="bh")
+    return adjusted
+
+def compare_main(argv):
+    """`benchmark.py compare <baseline> <candidate>`. Returns the exit status: 1 if a cell regressed."""
+    import pandas as pd
+    parser = argparse.ArgumentParser(prog="benchmark.py compare",
+                                     description="Compare two benchmark result sets cell by cell and report significant changes.")
+    parser.add_argument("baseline", help="Results CSV (all_sorting_benchmark_results.csv) or result store (.sqlite)")
+    parser.add_argument("candidate", help="Results CSV or result store to compare against the baseline")
+    parser.add_argument("--alpha", type=float, default=COMPARE_ALPHA,
+                        help=f"Significance level of the per-cell test (default: {COMPARE_ALPHA})")
+    parser.add_argument("--threshold", type=float, default=COMPARE_THRESHOLD,
+                        help=f"Relative slowdown beyond which a significant change is a regression (default: {COMPARE_THRESHOLD})")
+    parser.add_argument("--min-time", type=float, default=COMPARE_MIN_TIME_S,
+                        help=f"Baseline time in seconds below which a cell cannot be a regression (default: {COMPARE_MIN_TIME_S:g})")
+    parser.add_argument("--all", action="store_true", help="List every common cell, not only the significant ones")
+    args = parser.parse_args(argv)
+
+    baseline_cells = load_comparison_cells(args.baseline)
+    candidate_cells = load_comparison_cells(args.candidate)
+    common = sorted(set(baseline_cells) & set(candidate_cells), key=lambda cell: (cell[2], cell[1], cell[0]))
+    if not common:
+        print("The two result sets have no successfully measured cell in common.")
+        return 2
+
+    table_data = []
+    regressions = 0
+    tests = [compare_cell(baseline_cells[cell], candidate_cells[cell]) for cell in common]
+    # Several hundred cells are tested at once: without the correction, a few percent of
+    # unchanged cells would come out significant by chance
+    adjusted = adjust_p_values([p_value for change, p_value, effect in tests])
+    for cell, (change, _, effect), p_value in zip(common, tests, adjusted):
+        baseline, candidate = baseline_cells[cell], candidate_cells[cell]
+        center = "median" if baseline["samples"] is not None and candidate["samples"] is not None else "mean"
+        significant = p_value < args.alpha  # False for nan
+        if significant and change > args.threshold and baseline[center] >= args.min_time:
+            verdict = "REGRESSION"
+            regressions += 1
+        elif significant:
+            verdict = "slower" if change > 0 else "faster"
+        else:
+            verdict = "unchanged"
+        if verdict == "unchanged" and not args.all:
+            continue
+        table_data.append({
+            "Algorithm": cell[0],
+            "Input Type": cell[1],
+            "Input Size (N)": cell[2],
+            "Baseline (s)": f"{baseline[center]:.6f}",
+            "Candidate (s)": f"{candidate[center]:.6f}",
+            "Change": f"{change:+.1%}",
+            "Effect Size": effect,
+            "P-value (BH)": f"{p_value:.2e}" if np.isfinite(p_value) else "N/A",
+            "Verdict": verdict,
+        })
+
+    print(f"Compared {len(common)} cells ({len(set(baseline_cells) ^ set(candidate_cells))} only in one of the sets).")
+    if table_data:
+        print(pd.DataFrame(table_data).to_string(index=False))
+    else:
+        print("No significant changes.")
+    print(f"\n{regressions} regression(s): significantly slower (adjusted p < {args.alpha}) by more than "
+          f"{args.threshold:.0%}, at a baseline time of at least {args.min_time:g} s.")
+    return 1 if regressions else 0
+
+def tune_main(argv):
+    """
+    `benchmark.py tune`: searches the parameters of the tunable algorithms (see autotune.py)
+    on the int32 test inputs and reports the best configuration per input distribution and size band.
+    """
+    import pandas as pd
+    parser = argparse.ArgumentParser(prog="benchmark.py tune",
+                                     description="Search the insertion-sort cutoff, pivot strategy and radix base "
+                                                 "of the tunable algorithms with successive halving.")
+    parser.add_argument("--algorithms", nargs="+", choices=list(TUNABLE_ALGORITHMS), default=list(TUNABLE_ALGORITHMS),
+                        help="Algorithms to tune (default: all tunable ones)")
+    parser.add_argument("--budget", type=float, default=TUNE_BUDGET_S,
+                        help=f"Total time budget in seconds, shared equally by the searches (default: {TUNE_BUDGET_S:g})")
+    parser.add_argument("--build", choices=list(BUILD_VARIANTS), default=DEFAULT_BUILDS[0],
+                        help=f"Build variant the configurations are built as (default: {DEFAULT_BUILDS[0]})")
+    parser.add_argument("--mode", choices=EXECUTION_MODES, default="server",
+                        help="How each run is executed, as for the benchmark (default: server)")
+    parser.add_argument("--output", default=TUNE_RESULTS_PATH, help=f"Results CSV (default: {TUNE_RESULTS_PATH})")
+    args = parser.parse_args(argv)
+    if not available_builds([args.build]):
+        return 2
+
+    os.makedirs(EXECUTABLES_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    raise_stack_limit()
+
+    # The int32 inputs of each (distribution, size band)
+    inputs = {}
+    for data_file in list_test_data_files(TEST_DATA_DIR):
+        n, data_type = extract_n_and_type(data_file)
+        distribution, element_type = split_case(data_type)
+        if element_type == DEFAULT_ELEMENT_TYPE:
+            inputs.setdefault((distribution, size_band(n)), []).append(os.path.join(TEST_DATA_DIR, data_file))
+    searches = [(algo, distribution, band) for algo in args.algorithms for distribution, band in sorted(inputs)]
+    if not searches:
+        print(f"No int32 test data in '{TEST_DATA_DIR}'; run generate_test_data.py first.")
+        return 2
+    search_budget = args.budget / len(searches)
+
+    rows = []
+    for algo in args.algorithms:
+        algorithm = ALGORITHMS[algo]
+        c_file = os.path.basename(algorithm.source)
+        # Every configuration is its own build; unchanged ones come from the build cache
+        executables = {}
+        for config in configurations(algo):
+            executables[config_label(config)] = build_executables(
+                [c_file], flags=build_flags(args.build) + config_flags(config), shared=args.mode == "in-process",
+                extra_flags={c_file: algorithm.compile_flags}, compiler=BUILD_VARIANTS[args.build].compiler)[algo]
+
+        for search_algo, distribution, band in searches:
+            if search_algo != algo:
+                continue
+            data_files = [path for path in inputs[(distribution, band)] if supports_input(algorithm, path)]
+            for path in inputs[(distribution, band)]:
+                if path not in data_files:
+                    warn_negative_keys(algorithm, path)
+            if not data_files:
+                continue
+
+            def measure_config(config, repetitions):
+                """Total time over the band's inputs of each repetition; inf if any run failed."""
+                totals = []
+                for _ in range(repetitions):
+                    total = 0.0
+                    for data_filepath in data_files:
+                        time_taken, comparisons, status, metrics = measure_run(
+                            executables[config_label(config)], _load_test_data(data_filepath), args.mode)
+                        total = total + time_taken if status == "ok" else float('inf')
+                    totals.append(total)
+                return totals
+
+            print(f"\nTuning {algo} on {distribution} inputs, {band_label(band)} ({len(data_files)} files)...")
+            ranking = successive_halving(configurations(algo), measure_config, time.monotonic() + search_budget)
+            best = ranking[0]
+            default = next(candidate for candidate in ranking if candidate.config == default_configuration(algo))
+            print(f"  Best: {config_label(best.config)} ({score(best):.6f} s, default {score(default):.6f} s)")
+            rows.append({
+                "Algorithm": display_name_for(algo),
+                "Input Type": input_type_label(distribution),
+                "Size Band": band_label(band),
+                "Inputs": len(data_files),
+                "Best Configuration": config_label(best.config),
+                "Compile Flags": " ".join(config_flags(best.config)),
+                "Best Time (s)": f"{score(best):.6f}",
+                "Default Time (s)": f"{score(default):.6f}",
+                "Speedup vs Default": f"{score(default) / score(best):.2f}" if np.isfinite(score(best)) else "N/A",
+                "Best Repetitions": len(best.times),
+                "Configurations": len(ranking),
+            })
+        close_sort_servers()
+
+    df = pd.DataFrame(rows)
+    print("\n--- Best Configurations ---")
+    print(df.to_string(index=False))
+    df.to_csv(args.output, index=False)
+    print(f"\nTuning results saved to {args.output}")
+    print("  Times are the median over the repetitions of the total time over the band's inputs")
+    return 0
+
+def external_main(argv):
+    """
+    `benchmark.py external`: sorts the .npy test inputs out of core (see external_sort.py) with
+    every chunk size, the in-memory algorithms sorting the runs, and reports the time of the run
+    and merge phases and their I/O throughput.
+    """
+    import pandas as pd
+    shared_algorithms = [name for name, algorithm in ALGORITHMS.items()
+                         if algorithm.kind == "c" and "shared_library" in algorithm.capabilities]
+    parser = argparse.ArgumentParser(prog="benchmark.py external",
+                                     description="Benchmark an external sort (sorted runs and a k-way merge) over "
+                                                 "the memory-mapped .npy inputs in test_data/.")
+    parser.add_argument("--algorithms", nargs="+", choices=shared_algorithms,
+                        default=[algo for algo in EXTERNAL_ALGORITHMS if algo in shared_algorithms],
+                        help=f"In-memory algorithms sorting the runs (default: {' '.join(EXTERNAL_ALGORITHMS)})")
+    parser.add_argument("--chunk-sizes", nargs="+", type=lambda value: int(float(value)), default=DEFAULT_CHUNK_SIZES,
+                        help="Elements per run; inputs with at most this many elements are skipped "
+                             f"(default: {' '.join(f'{size:.0e}' for size in DEFAULT_CHUNK_SIZES)})")
+    parser.add_argument("--data-types", nargs="+", default=["random"],
+                        help="Input cases to sort, such as random or random.int64 (default: random)")
+    parser.add_argument("--sizes", nargs="+", type=lambda value: int(float(value)), default=None,
+                        help="Only sort the inputs of these sizes (default: every .npy input of the --data-types)")
+    parser.add_argument("--repetitions", type=int, default=EXTERNAL_REPETITIONS,
+                        help=f"External sorts per cell; the tables report the medians (default: {EXTERNAL_REPETITIONS})")
+    parser.add_argument("--build", choices=list(BUILD_VARIANTS), default=DEFAULT_BUILDS[0],
+                        help=f"Build variant of the algorithms and the merge (default: {DEFAULT_BUILDS[0]})")
+    parser.add_argument("--work-dir", default=TEST_DATA_DIR,
+                        help="Directory the runs and the sorted output are written to, on the disk being measured "
+                             f"(default: {TEST_DATA_DIR})")
+    parser.add_argument("--keep-page-cache", action="store_true",
+                        help="Do not evict the input and the runs from the page cache before the phase reading them")
+    parser.add_argument("--output", default=EXTERNAL_RESULTS_PATH, help=f"Results CSV (default: {EXTERNAL_RESULTS_PATH})")
+    args = parser.parse_args(argv)
+    if not available_builds([args.build]):
+        return 2
+
+    datasets = []
+    for data_file in list_test_data_files(TEST_DATA_DIR):
+        n, data_type = extract_n_and_type(data_file)
+        if data_file.endswith(".npy") and data_type in args.data_types and (args.sizes is None or n in args.sizes):
+            datasets.append((data_type, n, os.path.join(TEST_DATA_DIR, data_file)))
+    datasets.sort(key=lambda dataset: (case_order(dataset[0]), dataset[1]))
+    if not datasets:
+        print(f"No .npy test data of {', '.join(args.data_types)} in '{TEST_DATA_DIR}'; run "
+              "generate_test_data.py --format npy first (e.g. --sizes 1000000 10000000).")
+        return 2
+
+    os.makedirs(EXECUTABLES_DIR, exist_ok=True)
+    os.makedirs(OUTPUT_EXTERNAL_DIR, exist_ok=True)
+    os.makedirs(os.path.dirname(args.output) or ".", exist_ok=True)
+    raise_stack_limit()
+
+    # The algorithms and the merge, as shared libraries of each element type
+    compiler = BUILD_VARIANTS[args.build].compiler
+    libraries = {}
+    for element_type in dict.fromkeys(split_case(data_type)[1] for data_type, n, path in datasets):
+        c_files = [os.path.basename(ALGORITHMS[algo].source) for algo in args.algorithms
+                   if supports_element_type(ALGORITHMS[algo], element_type)]
+        extra_flags = {os.path.basename(ALGORITHMS[algo].source): ALGORITHMS[algo].compile_flags for algo in args.algorithms}
+        libraries[element_type] = build_executables(c_files + [EXTERNAL_MERGE_SOURCE], flags=build_flags(args.build, element_type),
+                                                    shared=True, extra_flags=extra_flags, compiler=compiler)
+
+    rows = []
+    plot_points = {}  # {data_type: {algorithm label: [(n, chunk size, run phase, merge phase, I/O throughput)]}}
+    with tempfile.TemporaryDirectory(prefix="external_sort-", dir=args.work_dir) as work_dir:
+        for data_type, n, data_filepath in datasets:
+            element_type = split_case(data_type)[1]
+            merger = RunMerger(libraries[element_type][os.path.splitext(EXTERNAL_MERGE_SOURCE)[0]])
+            for chunk_size in args.chunk_sizes:
+                if chunk_size >= n:
+                    continue  # A single run: nothing to merge
+                for algo in args.algorithms:
+                    if algo not in libraries[element_type]:
+                        continue
+                    if not supports_input(ALGORITHMS[algo], data_filepath):
+                        warn_negative_keys(ALGORITHMS[algo], data_filepath)
+                        continue
+                    sorter = get_shared_library_sorter(libraries[element_type][algo])
+
+                    def sort_chunk(chunk):
+                        elapsed, comparisons, metrics = sorter.sort(chunk)
+                        return sorter.buffer, elapsed
+
+                    print(f"External sort of {input_type_label(data_type)}, n={n}, {chunk_size}-element runs, "
+                          f"with {display_name_for(algo)}...")
+                    try:
+                        results = [external_sort(data_filepath, work_dir, chunk_size, sort_chunk, merger,
+                                                  drop_cache=not args.keep_page_cache)
+                                   for _ in range(args.repetitions)]
+                    except (ValueError, RuntimeError) as e:
+                        print(f"  Error: {e}")
+                        continue
+                    run_phase = float(np.median([result.run_phase for result in results]))
+                    run_sort = float(np.median([result.run_sort for result in results]))
+                    merge_phase = float(np.median([result.merge_phase for result in results]))
+                    total = float(np.median([result.run_phase + result.merge_phase for result in results]))
+                    dataset_bytes = results[0].dataset_bytes
+                    io_throughput = throughput_mb_s(dataset_bytes, total, phases=2)
+                    print(f"  run phase {run_phase:.4f} s (sorting {run_sort:.4f} s), merge phase {merge_phase:.4f} s, "
+                          f"{io_throughput:.1f} MB/s")
+                    rows.append({
+                        "Algorithm": display_name_for(algo),
+                        "Input Type": input_type_label(data_type),
+                        "Element Type": element_type,
+                        "Input Size (N)": n,
+                        "Dataset (MB)": f"{dataset_bytes / BYTES_PER_MB:.1f}",
+                        "Chunk Size": chunk_size,
+                        "Runs": results[0].runs,
+                        "Run Phase (s)": f"{run_phase:.6f}",
+                        "Run Sorting (s)": f"{run_sort:.6f}",
+                        "Merge Phase (s)": f"{merge_phase:.6f}",
+                        "Total (s)": f"{total:.6f}",
+                        "Run Phase I/O (MB/s)": f"{throughput_mb_s(dataset_bytes, run_phase):.1f}",
+                        "Merge Phase I/O (MB/s)": f"{throughput_mb_s(dataset_bytes, merge_phase):.1f}",
+                        "I/O Throughput (MB/s)": f"{io_throughput:.1f}",
+                        "Repetitions": len(results),
+                    })
+                    plot_points.setdefault(data_type, {}).setdefault(display_name_for(algo), []).append(
+                        (n, chunk_size, run_phase, merge_phase, io_throughput))
+    if not rows:
+        print(f"No input is larger than the chunk sizes {', '.join(map(str, args.chunk_sizes))}.")
+        return 2
+
+    df = pd.DataFrame(rows)
+    print("\n--- External Sort ---")
+    print(df.to_string(index=False))
+    df.to_csv(args.output, index=False)
+    print(f"\nExternal sort results saved to {args.output}")
+    print("  Each phase reads and writes the dataset once; its I/O throughput is twice the dataset size over its time")
+    if args.keep_page_cache:
+        print("  The page cache was kept: inputs smaller than the memory were read from memory, not from disk")
+
+    jobs = [PlotJob(plot_external_sort, (series, input_type_label(data_type), OUTPUT_EXTERNAL_DIR, metric))
+            for data_type, series in plot_points.items() for metric in ("phases", "throughput")]
+    rendered, unchanged = render_plots(jobs)
+    print(f"Plots: {rendered} rendered, {unchanged} unchanged")
+    return 0
+
+def complexity_table(series, predict_n=PREDICT_N, time_budget=TIME_BUDGET_S):
+    """
+    Fits n, n log n and n^2 (plus a constant) to the time and the comparisons of each
+    (algorithm, input type) series of successfully measured (n, time, comparisons) points.
+    Returns one table row per fitted series and metric.
+    """
+    rows = []
+    for (algo, data_type), points in series.items():
+        ns = [n for n, t, c in points]
+        metrics = [("Time (s)", [t for n, t, c in points])]
+        if counts_comparisons(algo):
+            metrics.append(("Comparisons", [c for n, t, c in points]))
+        for metric, values in metrics:
+            fits = fit_models(ns, values)
+            if not fits:
+                continue
+            best = fits[0]
+            is_time = metric == "Time (s)"
+            max_n = max_n_within(best, time_budget) if is_time else None
+            rows.append({
+                "Algorithm": display_name_for(algo),
+                "Input Type": input_type_label(data_type),
+                "Metric": metric,
+                "Best Model": best.model,
+                "Constant": f"{best.constant:.4g}",
+                "Coefficient": f"{best.coefficient:.4g}",
+                "Residual": f"{best.residual:.2%}",
+                "Runner-up": f"{fits[1].model} ({fits[1].residual:.2%})" if len(fits) > 1 else "N/A",
+                f"Predicted at N={predict_n:.0e}": f"{predict(best, predict_n):.4g}",
+                f"Max N within {time_budget:g} s": ("N/A" if max_n is None else
+                                                    "> 1e15" if max_n == float('inf') else str(max_n)),
+            })
+    return rows
 
 # --- Main Execution ---
-if __name__ == "__main__":
+# What one invocation benchmarks and reports: algorithms is {name: Algorithm} of the algorithms
+# in a reported group; builds maps each of those names to its build variant (None for the
+# baselines); run_keys maps (algorithm, data file path) to its RunKey in the result store
+BenchmarkPlan = namedtuple("BenchmarkPlan", ["algorithms", "builds", "test_data_files", "data_types", "run_keys"])
+
+def element_type_order(element_type):
+    """Sorts element types as in ELEMENT_TYPES (int32 first), followed by the other record sizes."""
+    return ELEMENT_TYPES.index(element_type) if element_type in ELEMENT_TYPES else len(ELEMENT_TYPES), element_type
+
+def case_order(data_type):
+    """Sorts the input cases by element type, then by distribution."""
+    distribution, element_type = split_case(data_type)
+    return element_type_order(element_type), distribution
+
+def pgo_training_files(test_data_files, element_type):
+    """The inputs profile-guided builds of an element type are trained on: its random ones up to PGO_TRAINING_MAX_N."""
+    return [os.path.join(TEST_DATA_DIR, data_file) for data_file in test_data_files
+            if extract_n_and_type(data_file)[1] == case_name("random", element_type)
+            and extract_n_and_type(data_file)[0] <= PGO_TRAINING_MAX_N]
+
+def training_hash(training_files):
+    """Hashes the training inputs of a profile-guided build, for its result store key."""
+    digest = hashlib.sha256()
+    for path in training_files:
+        digest.update(data_hash(path).encode())
+    return digest.hexdigest()[:16]
+
+def memory_run_key(run_key):
+    """The RunKey of a cell's memory pass: the same cell, built with ALLOCATION_COUNTING_FLAGS."""
+    return run_key._replace(compile_flags=" ".join([run_key.compile_flags, *ALLOCATION_COUNTING_FLAGS]))
+
+def benchmark_plan(args):
+    """The algorithms, inputs and result store keys of a run, without building anything."""
+    # Algorithms in several groups are built and measured once, and reported in each group.
+    # With several builds, a C algorithm is measured as one variant per build (merge_sort+gcc-O3, ...).
+    # A parallel algorithm is measured as one variant per thread count (parallel_merge_sort@4, ...).
+    benchmarked = {}
+    builds = {}
+    for name, algorithm in ALGORITHMS.items():
+        if not set(algorithm.groups) & set(GROUPS):
+            continue
+        if algorithm.kind != "c":
+            variants = {name: None}
+        elif len(args.builds) > 1:
+            variants = {build_variant(name, build): build for build in args.builds}
+        else:
+            variants = {name: args.builds[0]}
+        for variant, build in variants.items():
+            if "threads" in algorithm.capabilities:
+                names = [thread_variant(variant, threads) for threads in thread_counts(args.max_threads)]
+            else:
+                names = [variant]
+            benchmarked.update((variant_name, algorithm) for variant_name in names)
+            builds.update((variant_name, build) for variant_name in names)
+
+    # Get all test data files
+    test_data_files = list_test_data_files(TEST_DATA_DIR)
+    # The standard cases come first, but only those with input files; the others follow
+    present_types = {extract_n_and_type(f)[1] for f in test_data_files}
+    data_types = [data_type for data_type in ("random", "sorted", "reverse_sorted") if data_type in present_types]
+    data_types += sorted(present_types - set(data_types), key=case_order)
+
+    # Each (algorithm, data file) cell is identified in the result store by what was built and measured.
+    # Cells an algorithm does not support (see supports_input) have no key and are neither measured nor reported.
+    run_keys = {}
+    for data_file in test_data_files:
+        data_filepath = os.path.join(TEST_DATA_DIR, data_file)
+        element_type = split_case(extract_n_and_type(data_file)[1])[1]
+        for algo_base_name in benchmarked:
+            algorithm = benchmarked[algo_base_name]
+            if not supports_input(algorithm, data_filepath):
+                if supports_element_type(algorithm, element_type):
+                    warn_negative_keys(algorithm, data_filepath)
+                continue
+            if algorithm.kind == "c":
+                build = builds[algo_base_name]
+                key_source = source_hash(algorithm.source)
+                compiler = compiler_version(BUILD_VARIANTS[build].compiler)
+                compile_flags = " ".join(algorithm_flags(algorithm, shared=args.mode == "in-process",
+                                                         flags=build_flags(build, element_type)))
+                training_files = pgo_training_files(test_data_files, element_type) if BUILD_VARIANTS[build].pgo else []
+                if training_files:
+                    # Retraining on other inputs gives another build, measured under another key
+                    compile_flags += f" -fprofile-use training={training_hash(training_files)}"
+            else:
+                # A baseline is identified by the interpreter and NumPy versions it ran on
+                compiler = baseline_version()
+                key_source = hashlib.sha256(f"{algo_base_name} {compiler}".encode()).hexdigest()[:16]
+                compile_flags = ""
+            run_keys[(algo_base_name, data_filepath)] = RunKey(
+                algorithm=algo_base_name,
+                source_hash=key_source,
+                compiler=compiler,
+                compile_flags=compile_flags,
+                host=current_host(),
+                data_hash=data_hash(data_filepath),
+            )
+    save_data_index()
+    return BenchmarkPlan(benchmarked, builds, test_data_files, data_types, run_keys)
+
+def measure(args, plan):
+    """Builds the algorithms and runs the benchmarks, appending every repetition to the result store."""
+    benchmarked, test_data_files, run_keys = plan.algorithms, plan.test_data_files, plan.run_keys
+
     # Create necessary directories
     os.makedirs(EXECUTABLES_DIR, exist_ok=True)
-    os.makedirs(OUTPUT_GRAPHS_DIR, exist_ok=True)
-    os.makedirs(OUTPUT_7_ALGOS_DIR, exist_ok=True)
-    os.makedirs(OUTPUT_QUICK_SORT_DIR, exist_ok=True)
     os.makedirs(OUTPUT_CSV_DIR, exist_ok=True)
 
-    executables = {}
-    for c_file in C_FILES:
-        base_name = os.path.splitext(c_file)[0]
-        executable_path = os.path.join(EXECUTABLES_DIR, base_name)
-        compile_c_code(os.path.join("sorting_algorithms", c_file), executable_path)
-        executables[base_name] = executable_path
-    
-    # Compile quick sort variants
-    quick_sort_executables = {}
-    for c_file in QUICK_SORT_VARIANTS:
-        base_name = os.path.splitext(c_file)[0]
-        executable_path = os.path.join(EXECUTABLES_DIR, base_name)
-        compile_c_code(os.path.join("sorting_algorithms", c_file), executable_path)
-        quick_sort_executables[base_name] = executable_path
-
-    # Data structure: {algo: {data_type: [(n, time, comparisons), ...]}}
-    all_results = {
-        "bubble_sort": {"random": [], "sorted": [], "reverse_sorted": []},
-        "heap_sort": {"random": [], "sorted": [], "reverse_sorted": []},
-        "insertion_sort": {"random": [], "sorted": [], "reverse_sorted": []},
-        "merge_sort": {"random": [], "sorted": [], "reverse_sorted": []},
-        "quick_sort_median_of_three_pivot": {"random": [], "sorted": [], "reverse_sorted": []},
-        "radix_sort": {"random": [], "sorted": [], "reverse_sorted": []},
-        "selection_sort": {"random": [], "sorted": [], "reverse_sorted": []},
-    }
-    
-    # Results for quick sort variants analysis
-    quick_sort_results = {
-        "quick_sort_first_pivot": {"random": [], "sorted": [], "reverse_sorted": []},
-        "quick_sort_median_of_three_pivot": {"random": [], "sorted": [], "reverse_sorted": []},
-        "quick_sort_random_pivot": {"random": [], "sorted": [], "reverse_sorted": []},
-    }
+    raise_stack_limit()
+    if args.counters:
+        os.environ["SORT_COUNTERS"] = "1"  # Read by sort_harness.h in every program, server and library
 
-    # Get all test data files
-    test_data_files = [f for f in os.listdir(TEST_DATA_DIR) if f.endswith(".txt")]
-    test_data_files.sort(key=lambda x: (extract_n_and_type(x)[0], extract_n_and_type(x)[1]))
+    # The C programs are built once per build variant and element type of the inputs, each with its element_t
+    element_types = sorted({split_case(data_type)[1] for data_type in plan.data_types}, key=element_type_order)
+    unique_executables = {name: {} for name in benchmarked}
+    # The allocation-counting builds of the memory pass
+    counting_executables = {name: {} for name, algorithm in benchmarked.items()
+                            if algorithm.kind == "c" and "memory_metrics" in algorithm.capabilities}
+    for name, algorithm in benchmarked.items():
+        if algorithm.kind != "c":
+            unique_executables[name] = {element_type: baseline_path(name) for element_type in element_types}
+    for build, element_type in itertools.product(args.builds, element_types):
+        c_algorithms = [algorithm for algorithm in benchmarked.values()
+                        if algorithm.kind == "c" and supports_element_type(algorithm, element_type)]
+        training_files = None
+        if BUILD_VARIANTS[build].pgo:
+            training_files = pgo_training_files(test_data_files, element_type)
+            if not training_files:
+                print(f"Warning: no random {element_type} inputs of up to {PGO_TRAINING_MAX_N} elements to train "
+                      f"the {build} build on; it is built without a profile.")
+        built_executables = build_executables([os.path.basename(algorithm.source) for algorithm in c_algorithms],
+                                              flags=build_flags(build, element_type),
+                                              shared=args.mode == "in-process",
+                                              extra_flags={os.path.basename(algorithm.source): algorithm.compile_flags
+                                                           for algorithm in c_algorithms},
+                                              compiler=BUILD_VARIANTS[build].compiler,
+                                              training_files=training_files)
+        counting_algorithms = [algorithm for algorithm in c_algorithms if "memory_metrics" in algorithm.capabilities]
+        counting_built = build_executables([os.path.basename(algorithm.source) for algorithm in counting_algorithms],
+                                           flags=build_flags(build, element_type) + ALLOCATION_COUNTING_FLAGS,
+                                           shared=args.mode == "in-process",
+                                           extra_flags={os.path.basename(algorithm.source): algorithm.compile_flags
+                                                        for algorithm in counting_algorithms},
+                                           compiler=BUILD_VARIANTS[build].compiler) if counting_algorithms else {}
+        # Thread variants share their algorithm's executable
+        for name, algorithm in benchmarked.items():
+            if plan.builds[name] == build and supports_element_type(algorithm, element_type):
+                unique_executables[name][element_type] = built_executables[algorithm.name]
+                if name in counting_executables:
+                    counting_executables[name][element_type] = counting_built[algorithm.name]
 
-    print("\nStarting benchmarking...")
+    adaptive = None
+    if args.adaptive:
+        adaptive = AdaptivePolicy(args.warmup, ADAPTIVE_MIN_REPETITIONS, ADAPTIVE_MAX_REPETITIONS,
+                                  args.ci_target, args.cell_budget)
+    # Only the cells of the plan: an algorithm is left out on the inputs it does not support
+    tasks = [task for task in build_experiment_matrix(unique_executables, test_data_files, args.mode, adaptive, args.timeout)
+             if (task.algorithm, task.data_filepath) in run_keys]
+
+    cores = None  # Fingerprinted as the cores this process may use
+    if args.low_noise:
+        # Interleave the repetitions of all algorithms in a random order, so drift over time
+        # (thermal throttling, frequency changes) is spread over every cell instead of hitting a few
+        random.Random(args.seed).shuffle(tasks)
+        cores = low_noise_cores()
+        if hasattr(os, "sched_setaffinity"):
+            os.sched_setaffinity(0, cores)  # Inherited by the C programs
+            print(f"\nLow-noise mode: pinned to core(s) {', '.join(map(str, cores))}"
+                  f"{'' if isolated_cores() else ' (no isolated cores; boot with isolcpus= to reserve some)'}")
+        else:
+            print("\nWarning: this platform cannot pin the benchmark to a core; only the run order is randomized.")
+    environment = environment_fingerprint(cores, args.jobs)
+    load = "unknown" if environment["load_1m"] is None else f"{environment['load_1m']:.2f}"
+    print(f"\nEnvironment: {environment['cpu_model']}, {environment['kernel']}, governor "
+          f"{environment['governor'] or 'unknown'}, load {load}")
+    if environment["governor"] not in (None, "performance"):
+        print(f"Warning: the CPU frequency governor is '{environment['governor']}'; set it to 'performance' for stable times.")
+    if environment["high_load"]:
+        print("Warning: the system is already busy; the results may not be reliable.")
+
+    store = ResultStore(args.results_db)
+    measured = store.measured_repetitions() if args.resume else set()
+    if args.resume:
+        remaining = unmeasured_tasks(tasks, run_keys, measured)
+        print(f"\nResuming: {len(tasks) - len(remaining)} of {len(tasks)} tasks are already in {args.results_db}")
+        tasks = remaining
+
+    def record_run(algo_base_name, data_filepath, repetition, time_taken, comparisons, status="ok", metrics=None):
+        n, data_type = extract_n_and_type(os.path.basename(data_filepath))
+        # Cells that were predicted instead of run have no environment to speak of
+        environment = environment_fingerprint(cores, args.jobs) if status not in ("skipped", "extrapolated") else None
+        store.record(run_keys[(algo_base_name, data_filepath)], os.path.basename(data_filepath),
+                     n, data_type, repetition, time_taken, comparisons, status, metrics, environment)
+        if environment is not None and environment["high_load"]:
+            print(f"  High load: {algo_base_name} on N={n}, Type={data_type} ran at a load of {environment['load_1m']:.2f}")
+        if status == "timeout":
+            print(f"  Timeout: {algo_base_name} on N={n}, Type={data_type} exceeded {args.timeout} s")
+
+    print(f"\nStarting benchmarking ({len(tasks)} tasks on {args.jobs} worker(s))...")
+    if args.prune:
+        # Sizes are measured in ascending waves so each one can be predicted from the smaller ones
+        task_size = lambda task: extract_n_and_type(os.path.basename(task.data_filepath))[0]
+        for size in sorted({task_size(task) for task in tasks}):
+            wave = []
+            for task in (task for task in tasks if task_size(task) == size):
+                data_type = extract_n_and_type(os.path.basename(task.data_filepath))[1]
+                history = cell_history(store, run_keys, test_data_files, task.algorithm, data_type, size,
+                                       None if args.adaptive else NUM_REPETITIONS)
+                over_budget, prediction = predict_over_budget(history, size, args.timeout)
+                if not over_budget:
+                    wave.append(task)
+                elif args.prune == "extrapolate" and prediction is not None:
+                    record_run(task.algorithm, task.data_filepath, task.repetition or 0, *prediction, "extrapolated")
+                else:
+                    record_run(task.algorithm, task.data_filepath, task.repetition or 0, float('inf'), 0, "skipped")
+            pruned = sum(task_size(task) == size for task in tasks) - len(wave)
+            print(f"N={size}: running {len(wave)} tasks; {pruned} predicted to exceed {args.timeout} s "
+                  f"({'extrapolated' if args.prune == 'extrapolate' else 'skipped'})")
+            run_experiments(wave, args.jobs, on_result=record_run)
+    else:
+        run_experiments(tasks, args.jobs, on_result=record_run)
+
+    # Memory pass: one untimed run per cell with the allocation-counting builds, for the heap
+    # metrics. Cells without a successful timed run (timeouts, pruned sizes) are left out.
+    def record_memory_run(algo_base_name, data_filepath, repetition, time_taken, comparisons, status="ok", metrics=None):
+        n, data_type = extract_n_and_type(os.path.basename(data_filepath))
+        store.record(memory_run_key(run_keys[(algo_base_name, data_filepath)]), os.path.basename(data_filepath),
+                     n, data_type, repetition, time_taken, comparisons, MEMORY_PASS_STATUS,
+                     metrics if status == "ok" else None)
+
+    def needs_memory_run(task):
+        if (task.algorithm, task.data_filepath) not in run_keys:
+            return False
+        run_key = run_keys[(task.algorithm, task.data_filepath)]
+        if (memory_run_key(run_key), 0) in measured:
+            return False
+        return any(status == "ok" for t, c, status, metrics in store.load(run_key, None if args.adaptive else NUM_REPETITIONS))
+
+    memory_tasks = [task for task in build_experiment_matrix(counting_executables, test_data_files, args.mode,
+                                                             timeout=args.timeout, repetitions=1)
+                    if needs_memory_run(task)]
+    if memory_tasks:
+        print(f"\nMemory pass ({len(memory_tasks)} tasks with the allocation-counting builds)...")
+        run_experiments(memory_tasks, args.jobs, on_result=record_memory_run)
+    store.close()
+
+def report(args, plan):
+    """Builds the tables, plots, correlations and complexity fits of a plan from the result store."""
+    import pandas as pd
+    from scipy.stats import pearsonr
+    benchmarked, builds, test_data_files, data_types, run_keys = plan
+    os.makedirs(OUTPUT_GRAPHS_DIR, exist_ok=True)
+    for group_description, group_output_dir in GROUPS.values():
+        os.makedirs(group_output_dir, exist_ok=True)
+    os.makedirs(OUTPUT_CSV_DIR, exist_ok=True)
+
+    # Data structure: {algo: {data_type: [(n, time, comparisons), ...]}}, and the same
+    # per-algorithm entries by group: {group: {algo: ...}}
+    algo_results = {algo: {data_type: [] for data_type in data_types} for algo in benchmarked}
+    group_results = {group: {algo: algo_results[algo] for algo in group_members(benchmarked, group)} for group in GROUPS}
+
+    store = ResultStore(args.results_db)
+    # The tables and plots are built from the store, so resumed and fresh runs are reported alike.
+    # Fixed repetition counts report the mean; adaptive mode reports the median.
+    statistic = "Median" if args.adaptive else "Average"
+    cell_stats = {}  # {(algo, data_type, n): summarize_runs(...)}
+    fingerprints = {}  # {(CPU model, kernel, governor): number of runs}
+    missing = 0
     for data_file in test_data_files:
         n, data_type = extract_n_and_type(data_file)
-        if n is None:
-            continue
-        
         data_filepath = os.path.join(TEST_DATA_DIR, data_file)
-        original_data = read_test_data(data_filepath)
-        
-        print(f"Benchmarking N={n}, Type={data_type}...")
-
-        for algo_base_name, executable_path in executables.items():
-            total_time = 0
-            total_comparisons = 0
-            for _ in range(NUM_REPETITIONS):
-                # Pass a copy of the data because C program might modify it
-                time_taken, comparisons = run_benchmark(executable_path, list(original_data))
-                total_time += time_taken
-                total_comparisons += comparisons
-            
-            avg_time = total_time / NUM_REPETITIONS
-            avg_comparisons = total_comparisons / NUM_REPETITIONS
-            print(f"  {algo_base_name}: Time = {avg_time:.6f} s, Comparisons = {avg_comparisons:.0f}")
-            
+        print(f"Results for N={n}, Type={data_type}:")
+
+        for algo_base_name in benchmarked:
+            if (algo_base_name, data_filepath) not in run_keys:
+                continue  # Not built for this element type
+            runs = store.load(run_keys[(algo_base_name, data_filepath)], None if args.adaptive else NUM_REPETITIONS)
+            if not runs:
+                missing += 1
+                continue
+            stats = summarize_runs([t for t, c, status, metrics in runs])
+            statuses = {status for t, c, status, metrics in runs}
+            stats["status"] = next((status for status in ("skipped", "extrapolated", "timeout", "crashed")
+                                    if status in statuses), "ok")
+            # Mean of each memory metric and counter over the runs that reported it
+            stats["metrics"] = {name: float(np.mean([metrics[name] for t, c, status, metrics in runs if name in metrics]))
+                                for name in [*MEMORY_METRICS, *HARDWARE_COUNTERS]
+                                if any(name in metrics for t, c, status, metrics in runs)}
+            # The heap metrics come from the memory pass (see measure)
+            for t, c, status, metrics in store.load(memory_run_key(run_keys[(algo_base_name, data_filepath)]), 1):
+                stats["metrics"].update((name, metrics[name]) for name in HEAP_METRICS if name in metrics)
+            environments = store.load_environments(run_keys[(algo_base_name, data_filepath)],
+                                                   None if args.adaptive else NUM_REPETITIONS)
+            stats["high_load_runs"] = sum(bool(environment.get("high_load")) for environment in environments)
+            for environment in environments:
+                if environment:
+                    fingerprint = (environment["cpu_model"], environment["kernel"], environment["governor"])
+                    fingerprints[fingerprint] = fingerprints.get(fingerprint, 0) + 1
+            cell_stats[(algo_base_name, data_type, n)] = stats
+            avg_time = stats["median"] if args.adaptive else stats["mean"]
+            avg_comparisons = sum(c for t, c, status, metrics in runs) / len(runs)
+            marker = "" if stats["status"] == "ok" else f" [{stats['status'].upper()}]"
+            print(f"  {algo_base_name}: Time = {avg_time:.6f} s ({stats['repetitions']} runs, "
+                  f"median CI [{stats['ci_low']:.6f}, {stats['ci_high']:.6f}]), Comparisons = {avg_comparisons:.0f}{marker}")
+
             # Store results as (n, time, comparisons)
-            all_results[algo_base_name][data_type].append((n, avg_time, avg_comparisons))
-        
-        # Also benchmark quick sort variants separately
-        for qs_variant, qs_executable_path in quick_sort_executables.items():
-            total_time = 0
-            total_comparisons = 0
-            for _ in range(NUM_REPETITIONS):
-                time_taken, comparisons = run_benchmark(qs_executable_path, list(original_data))
-                total_time += time_taken
-                total_comparisons += comparisons
-            
-            avg_time = total_time / NUM_REPETITIONS
-            avg_comparisons = total_comparisons / NUM_REPETITIONS
-            print(f"  {qs_variant}: Time = {avg_time:.6f} s, Comparisons = {avg_comparisons:.0f}")
-            
-            quick_sort_results[qs_variant][data_type].append((n, avg_time, avg_comparisons))
+            algo_results[algo_base_name][data_type].append((n, avg_time, avg_comparisons))
+
+    def time_points(algo, results_list, data_type):
+        """(n, time, CI low, CI high) points for a time plot, using the CI of the reported statistic."""
+        low_key, high_key = ("ci_low", "ci_high") if args.adaptive else ("mean_ci_low", "mean_ci_high")
+        return [(n, t, cell_stats[(algo, data_type, n)][low_key], cell_stats[(algo, data_type, n)][high_key])
+                for n, t, c in results_list]
+
+    def memory_points(algo, results_list, data_type, metric):
+        """(n, value) points of one memory metric, leaving out cells that did not report it."""
+        return [(n, cell_stats[(algo, data_type, n)]["metrics"][metric]) for n, t, c in results_list
+                if metric in cell_stats[(algo, data_type, n)]["metrics"]]
+
+    def counter_cells(algo, types):
+        """(time, comparisons, metrics) of every cell of one algorithm, for the counter correlation analysis."""
+        return [(t, c, cell_stats[(algo, data_type, n)]["metrics"]) for data_type in data_types for n, t, c in types[data_type]]
 
-    print("\nBenchmarking complete. Generating plots...")
+    store.close()
+
+    high_load_cells = [cell for cell, stats in cell_stats.items() if stats["high_load_runs"]]
+    if high_load_cells:
+        print(f"\nWarning: {sum(cell_stats[cell]['high_load_runs'] for cell in high_load_cells)} runs in "
+              f"{len(high_load_cells)} cells were measured under high system load (see the High Load Runs column); "
+              "measure them again on a quiet machine.")
+    if missing:
+        print(f"\nWarning: {missing} cells have no results in {args.results_db}; run `measure` with the same options first.")
+    # Counters are reported whenever the stored runs have them, so `report` needs no --counters
+    measured_counters = any(name in stats["metrics"] for stats in cell_stats.values() for name in HARDWARE_COUNTERS)
+    counters = args.counters or measured_counters
+    if args.counters and not measured_counters:
+        print("\nWarning: no hardware counters could be read. They need Linux with a PMU exposed to this machine "
+              "and /proc/sys/kernel/perf_event_paranoid <= 2.")
+
+    print("\nGenerating plots...")
 
     # --- Plotting ---
-    # Prepare plot data for time
-    avg_case_time = {}
-    worst_case_time = {}
-    best_case_time = {}
-    
-    # Prepare plot data for comparisons
-    avg_case_comp = {}
-    worst_case_comp = {}
-    best_case_comp = {}
-    
-    # Prepare data for correlation analysis
-    correlation_data = {}
-    
-    for algo, types in all_results.items():
-        # Format algorithm name for display
-        display_name = algo.replace('_', ' ').title()
-        if "Quick Sort Median Of Three Pivot" in display_name:
-            display_name = "Quick Sort (Median of Three)"
-        
-        # Time plots - extract (n, time)
-        avg_case_time[display_name] = [(n, t) for n, t, c in types["random"]]
-        worst_case_time[display_name] = [(n, t) for n, t, c in types["reverse_sorted"]]
-        best_case_time[display_name] = [(n, t) for n, t, c in types["sorted"]]
-        
-        # Comparison plots - extract (n, comparisons)
-        avg_case_comp[display_name] = [(n, c) for n, t, c in types["random"]]
-        worst_case_comp[display_name] = [(n, c) for n, t, c in types["reverse_sorted"]]
-        best_case_comp[display_name] = [(n, c) for n, t, c in types["sorted"]]
-        
-        # Correlation data - combine all cases, extract (n, time, comparisons)
-        all_cases = types["random"] + types["sorted"] + types["reverse_sorted"]
-        correlation_data[display_name] = all_cases
-    
-    # Generate Time vs N plots in 7_sorting_algo_comparisons folder
-    plot_results(avg_case_time, "Average Case (Random Input)", OUTPUT_7_ALGOS_DIR, metric="time")
-    plot_results(worst_case_time, "Worst Case (Reverse Sorted Input)", OUTPUT_7_ALGOS_DIR, metric="time")
-    plot_results(best_case_time, "Best Case (Sorted Input)", OUTPUT_7_ALGOS_DIR, metric="time")
-    
-    # Generate Comparisons vs N plots in 7_sorting_algo_comparisons folder
-    plot_results(avg_case_comp, "Average Case (Random Input)", OUTPUT_7_ALGOS_DIR, metric="comparisons")
-    plot_results(worst_case_comp, "Worst Case (Reverse Sorted Input)", OUTPUT_7_ALGOS_DIR, metric="comparisons")
-    plot_results(best_case_comp, "Best Case (Sorted Input)", OUTPUT_7_ALGOS_DIR, metric="comparisons")
-    
-    # Generate correlation plot for 7 algorithms in 7_sorting_algo_comparisons folder
-    plot_correlation(correlation_data, OUTPUT_7_ALGOS_DIR)
-    
-    # --- Quick Sort Variants Analysis ---
-    print("\nGenerating QuickSort variant plots...")
-    
-    # Prepare quick sort variant plot data
-    qs_avg_case_time = {}
-    qs_worst_case_time = {}
-    qs_best_case_time = {}
-    
-    qs_avg_case_comp = {}
-    qs_worst_case_comp = {}
-    qs_best_case_comp = {}
-    
-    for qs_algo, qs_types in quick_sort_results.items():
-        # Format algorithm name for display
-        display_name = qs_algo.replace('_', ' ').title()
-        if "Median Of Three" in display_name:
-            display_name = "Quick Sort (Median of Three)"
-        elif qs_algo == "quick_sort_first_pivot":
-            display_name = "Quick Sort (First Element Pivot)"
-        elif "Random" in display_name:
-            display_name = "Quick Sort (Random Pivot)"
-        
-        # Time plots
-        qs_avg_case_time[display_name] = [(n, t) for n, t, c in qs_types["random"]]
-        qs_worst_case_time[display_name] = [(n, t) for n, t, c in qs_types["reverse_sorted"]]
-        qs_best_case_time[display_name] = [(n, t) for n, t, c in qs_types["sorted"]]
-        
-        # Comparison plots
-        qs_avg_case_comp[display_name] = [(n, c) for n, t, c in qs_types["random"]]
-        qs_worst_case_comp[display_name] = [(n, c) for n, t, c in qs_types["reverse_sorted"]]
-        qs_best_case_comp[display_name] = [(n, c) for n, t, c in qs_types["sorted"]]
-    
-    # Generate Quick Sort Time vs N plots
-    plot_results(qs_avg_case_time, "Average Case (Random Input)", OUTPUT_QUICK_SORT_DIR, metric="time")
-    plot_results(qs_worst_case_time, "Worst Case (Reverse Sorted Input)", OUTPUT_QUICK_SORT_DIR, metric="time")
-    plot_results(qs_best_case_time, "Best Case (Sorted Input)", OUTPUT_QUICK_SORT_DIR, metric="time")
-    
-    # Generate Quick Sort Comparisons vs N plots
-    plot_results(qs_avg_case_comp, "Average Case (Random Input)", OUTPUT_QUICK_SORT_DIR, metric="comparisons")
-    plot_results(qs_worst_case_comp, "Worst Case (Reverse Sorted Input)", OUTPUT_QUICK_SORT_DIR, metric="comparisons")
-    plot_results(qs_best_case_comp, "Best Case (Sorted Input)", OUTPUT_QUICK_SORT_DIR, metric="comparisons")
-    
-    # Prepare correlation data for quick sort variants
-    qs_correlation_data = {}
-    for qs_algo, qs_types in quick_sort_results.items():
-        display_name = qs_algo.replace('_', ' ').title()
-        if "Median Of Three" in display_name:
-            display_name = "Quick Sort (Median of Three)"
-        elif qs_algo == "quick_sort_first_pivot":
-            display_name = "Quick Sort (First Element Pivot)"
-        elif "Random" in display_name:
-            display_name = "Quick Sort (Random Pivot)"
-        
-        # Correlation data - combine all cases
-        all_cases = qs_types["random"] + qs_types["sorted"] + qs_types["reverse_sorted"]
-        qs_correlation_data[display_name] = all_cases
-    
-    # Generate correlation plot for quick sort variants
-    plot_correlation(qs_correlation_data, OUTPUT_QUICK_SORT_DIR)
+    # Correlation data of the main group - combine all cases, extract (n, time, comparisons)
+    correlation_data = {display_name_for(algo): [point for data_type in data_types for point in types[data_type]]
+                        for algo, types in group_results["main"].items() if counts_comparisons(algo)}
+    counter_data = {display_name_for(algo): counter_cells(algo, types) for algo, types in group_results["main"].items()}
+
+    plot_jobs = []
+    for group, (group_description, group_output_dir) in GROUPS.items():
+        if not group_results[group]:
+            continue
+        group_counter_data = None
+        if counters:
+            group_counter_data = {display_name_for(algo): counter_cells(algo, types) for algo, types in group_results[group].items()}
+        plot_jobs += group_plot_jobs(group_results[group], group_output_dir, data_types, time_points, memory_points,
+                                     statistic, group_counter_data)
+    if len(args.builds) > 1:
+        os.makedirs(OUTPUT_BUILDS_DIR, exist_ok=True)
+        plot_jobs += build_plot_jobs(algo_results, data_types, builds, args.builds[0], OUTPUT_BUILDS_DIR)
+    rendered, unchanged = render_plots(plot_jobs, args.plot_jobs)
 
-    print("\nAll plots generated successfully.")
+    print(f"\nAll plots generated successfully ({rendered} rendered, {unchanged} unchanged since the last report).")
     print(f"Results are in the '{OUTPUT_GRAPHS_DIR}' directory.")
-    print(f"  - 7 sorting algorithm comparisons: '{OUTPUT_7_ALGOS_DIR}'")
-    print(f"  - Quick sort analysis: '{OUTPUT_QUICK_SORT_DIR}'")
+    for group_description, group_output_dir in GROUPS.values():
+        print(f"  - {group_description}: '{group_output_dir}'")
+    if len(args.builds) > 1:
+        print(f"  - Build comparison: '{OUTPUT_BUILDS_DIR}'")
     print(f"  - CSV data: '{OUTPUT_CSV_DIR}'")
     
     print("\n--- Benchmarking Methodology ---")
-    print(f"Each experiment was repeated {NUM_REPETITIONS} times, and the average execution time is reported.")
+    if args.adaptive:
+        print(f"Each experiment was repeated (after {args.warmup} warm-up run(s)) until the 95% CI of the median was "
+              f"within {args.ci_target:.0%} of it or {args.cell_budget:.0f} s were spent; the median is reported.")
+    else:
+        print(f"Each experiment was repeated {NUM_REPETITIONS} times, and the average execution time is reported.")
     print("Timing mechanism: Python's `time.perf_counter()` for high-resolution timing.")
     print("Comparison counting: Instrumented C code tracks all element comparisons.")
     print("Input selection: Pre-generated test data from the 'test_data/' directory was used.")
+    for (model, kernel, governor), count in sorted(fingerprints.items(), key=lambda item: -item[1]):
+        print(f"Environment: {model}, {kernel}, governor {governor or 'unknown'} ({count} runs)")
     print("Same inputs were used for all sorting algorithms to ensure a fair comparison.")
     print("\nNote on Best/Worst Case Definitions:")
     print("  - Average Case: Represented by 'random' input data.")
@@ -432,21 +2247,34 @@ if __name__ == "__main__":
     # --- Generate Table ---
     print("\n--- Benchmarking Results Table ---")
     table_data = []
-    for algo_key, types_data in all_results.items():
-        # Format algorithm name
-        algo_name = algo_key.replace('_', ' ').title()
-        if "Quick Sort Median Of Three Pivot" in algo_name:
-            algo_name = "Quick Sort (Median of Three)"
-        
+    for algo_key, types_data in algo_results.items():
+        algo_name = display_name_for(algo_key)
         for data_type, results_list in types_data.items():
             for n, avg_time, avg_comparisons in results_list:
-                table_data.append({
+                stats = cell_stats[(algo_key, data_type, n)]
+                failed = avg_time == float('inf')
+                row = {
                     "Algorithm": algo_name,
-                    "Input Type": data_type.replace('_', ' ').title(),
+                    "Build": builds[algo_key] or "N/A",
+                    "Threads": split_thread_variant(algo_key)[1] or 1,
+                    "Input Type": input_type_label(data_type),
+                    "Element Type": split_case(data_type)[1],
                     "Input Size (N)": n,
-                    "Average Time (s)": f"{avg_time:.6f}" if avg_time != float('inf') else "Crashed/Timeout",
-                    "Average Comparisons": f"{avg_comparisons:.0f}" if avg_time != float('inf') else "N/A"
-                })
+                    "Average Time (s)": f"{stats['mean']:.6f}" if not failed else "Crashed/Timeout",
+                    "Average Comparisons": f"{avg_comparisons:.0f}" if not failed and counts_comparisons(algo_key) else "N/A",
+                    "Repetitions": stats["repetitions"],
+                    "Status": stats["status"],
+                    "High Load Runs": stats["high_load_runs"],
+                }
+                for column, key in (("Min Time (s)", "min"), ("Median Time (s)", "median"), ("P95 Time (s)", "p95"),
+                                    ("Stddev Time (s)", "stddev"), ("Median CI Low (s)", "ci_low"), ("Median CI High (s)", "ci_high")):
+                    row[column] = f"{stats[key]:.6f}" if not failed else "N/A"
+                for key, column in MEMORY_METRICS.items():
+                    row[column] = f"{stats['metrics'][key]:.0f}" if key in stats["metrics"] else "N/A"
+                if counters:
+                    for key, column in HARDWARE_COUNTERS.items():
+                        row[column] = f"{stats['metrics'][key]:.0f}" if key in stats["metrics"] else "N/A"
+                table_data.append(row)
     
     df = pd.DataFrame(table_data)
     df_sorted = df.sort_values(by=["Input Size (N)", "Input Type", "Algorithm"])
@@ -473,7 +2301,57 @@ if __name__ == "__main__":
     print("  r close to 1.0: Strong positive correlation (more comparisons → more time)")
     print("  r close to 0.0: Weak/no correlation")
     print("  p-value < 0.05: Statistically significant correlation")
+
+    if counters:
+        print("\n--- Hardware Counter Correlation Summary ---")
+        print(f"{'Algorithm':<35} | {'Best Predictor':<14} | " + " | ".join(f"{p:>13}" for p in COUNTER_PREDICTORS))
+        print("-" * (56 + 16 * len(COUNTER_PREDICTORS)))
+        for algo_name, cells in counter_data.items():
+            correlations = counter_correlations(cells)
+            if correlations:
+                best = max(correlations, key=lambda p: abs(correlations[p]))
+                print(f"{algo_name:<35} | {best:<14} | " + " | ".join(
+                    f"{correlations[p]:>13.4f}" if p in correlations else f"{'N/A':>13}" for p in COUNTER_PREDICTORS))
+        print("\n  Best Predictor: the metric whose correlation with time is the strongest for that algorithm")
     
+    # --- Parallel Scaling ---
+    scaling_rows = scaling_table(algo_results, data_types)
+    if scaling_rows:
+        print("\n--- Parallel Scaling Summary ---")
+        df_scaling = pd.DataFrame(scaling_rows).sort_values(by=["Algorithm", "Input Type", "Threads"])
+        print(df_scaling.to_string(index=False))
+        scaling_output_path = os.path.join(OUTPUT_CSV_DIR, "parallel_scaling.csv")
+        df_scaling.to_csv(scaling_output_path, index=False)
+        print(f"\nParallel scaling summary saved to {scaling_output_path}")
+        print("  Speedup: time on 1 thread / time on N threads at the largest N; Efficiency: Speedup / Threads")
+        print("  Break-even N: the smallest N from which every measured size is faster than on 1 thread")
+
+    # --- Build Variants ---
+    if len(args.builds) > 1:
+        build_rows = build_table(algo_results, data_types, builds, args.builds[0])
+        if build_rows:
+            print("\n--- Build Variant Summary ---")
+            df_builds = pd.DataFrame(build_rows).sort_values(by=["Input Type", "Algorithm", "Build"])
+            print(df_builds.to_string(index=False))
+            builds_output_path = os.path.join(OUTPUT_CSV_DIR, "build_variants.csv")
+            df_builds.to_csv(builds_output_path, index=False)
+            print(f"\nBuild variant summary saved to {builds_output_path}")
+            print(f"  Speedup: time of the {args.builds[0]} build / time of the build at the largest N")
+
+    # --- Complexity Fits ---
+    # Only successfully measured cells are fitted, not timeouts or extrapolations
+    fit_series = {(algo, data_type): [(n, t, c) for n, t, c in results_list if cell_stats[(algo, data_type, n)]["status"] == "ok"]
+                  for algo, types in algo_results.items() for data_type, results_list in types.items()}
+    complexity_rows = complexity_table(fit_series, args.predict_n, args.time_budget)
+    if complexity_rows:
+        print("\n--- Empirical Complexity Fits ---")
+        df_fits = pd.DataFrame(complexity_rows).sort_values(by=["Metric", "Input Type", "Algorithm"])
+        print(df_fits.to_string(index=False))
+        fits_output_path = os.path.join(OUTPUT_CSV_DIR, "complexity_fits.csv")
+        df_fits.to_csv(fits_output_path, index=False)
+        print(f"\nComplexity fits saved to {fits_output_path}")
+        print("  Best Model: value = Constant + Coefficient * f(n), with the lowest relative RMS error (Residual)")
+
     # --- Important Notes ---
     print("\n" + "="*80)
     print("IMPORTANT NOTES ON RESULTS")
@@ -496,4 +2374,90 @@ if __name__ == "__main__":
     print("  - O(n log n) algorithms: Heap, Merge, Quick Sort")
     print("  - O(n+k) algorithm: Radix Sort (where k is key range)")
     print("  - Best case optimized: Bubble & Insertion sort show O(n) for sorted input")
-    print("="*80)
\ No newline at end of file
+    print("  - The 'Empirical Complexity Fits' table shows which model the measurements actually follow")
+    print("="*80)
+
+if __name__ == "__main__":
+    if len(sys.argv) > 1 and sys.argv[1] == "compare":
+        sys.exit(compare_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "tune":
+        sys.exit(tune_main(sys.argv[2:]))
+    if len(sys.argv) > 1 and sys.argv[1] == "external":
+        sys.exit(external_main(sys.argv[2:]))
+    # `measure` only runs the benchmarks and `report` only builds the results from the store;
+    # without a command, both run
+    command = sys.argv.pop(1) if len(sys.argv) > 1 and sys.argv[1] in ("measure", "report") else None
+
+    parser = argparse.ArgumentParser(
+        description="Benchmark the C sorting algorithms and plot the results.",
+        epilog="Commands (optional, before the options): 'measure' only runs the benchmarks into the result store, "
+               "'report' only builds the tables and plots from it (pass it the same mode options as 'measure'), "
+               "'compare BASELINE CANDIDATE' tests two result sets for regressions, 'tune' searches the parameters "
+               "of the tunable algorithms, 'external' benchmarks an out-of-core external sort.")
+    parser.add_argument("--jobs", "-j", type=int, default=1,
+                        help="Number of worker processes, each pinned to its own CPU core (default: 1)")
+    mode_group = parser.add_mutually_exclusive_group()
+    mode_group.add_argument("--server", dest="mode", action="store_const", const="server",
+                            help="Keep one process per algorithm alive and send it binary arrays instead of "
+                                 "starting a new process with text input for every run")
+    mode_group.add_argument("--in-process", dest="mode", action="store_const", const="in-process",
+                            help="Build the algorithms as shared libraries and call them through ctypes on "
+                                 "NumPy buffers, without starting any process")
+    parser.add_argument("--results-db", default=RESULTS_DB_PATH,
+                        help=f"SQLite store every repetition is appended to (default: {RESULTS_DB_PATH})")
+    parser.add_argument("--resume", action="store_true",
+                        help="Skip repetitions that are already in the result store for the same "
+                             "source, compiler, flags, host and input data")
+    parser.add_argument("--adaptive", action="store_true",
+                        help="Instead of a fixed repetition count, repeat each cell until the confidence "
+                             "interval of its median is narrow enough or its time budget is spent")
+    parser.add_argument("--warmup", type=int, default=ADAPTIVE_WARMUP_RUNS,
+                        help=f"Discarded warm-up runs per cell in adaptive mode (default: {ADAPTIVE_WARMUP_RUNS})")
+    parser.add_argument("--ci-target", type=float, default=ADAPTIVE_CI_TARGET,
+                        help=f"Target width of the median's 95%% CI, relative to the median (default: {ADAPTIVE_CI_TARGET})")
+    parser.add_argument("--cell-budget", type=float, default=ADAPTIVE_CELL_BUDGET_S,
+                        help=f"Wall-clock seconds spent on one cell in adaptive mode (default: {ADAPTIVE_CELL_BUDGET_S})")
+    parser.add_argument("--timeout", type=float, default=None,
+                        help="Per-run time limit in seconds; slower runs are killed and recorded as timeouts")
+    parser.add_argument("--prune", choices=["skip", "extrapolate"], default=None,
+                        help="With --timeout: fit each algorithm's growth on the smaller inputs and skip (or "
+                             "extrapolate) the sizes predicted to exceed the timeout")
+    parser.add_argument("--predict-n", type=lambda value: int(float(value)), default=PREDICT_N,
+                        help=f"Size the fitted complexity models predict time and comparisons for (default: {PREDICT_N:.0e})")
+    parser.add_argument("--time-budget", type=float, default=TIME_BUDGET_S,
+                        help=f"Time budget in seconds for the largest n each fitted model can sort (default: {TIME_BUDGET_S})")
+    parser.add_argument("--counters", action="store_true",
+                        help="Read hardware performance counters (instructions, cycles, L1D/LLC misses, branch "
+                             "misses) around every sort with perf_event (Linux) and correlate them with time")
+    parser.add_argument("--plot-jobs", type=int, default=len(available_cores()),
+                        help="Processes rendering the plots in parallel; plots whose data did not change since "
+                             "the last report are not rendered again (default: one per available core)")
+    parser.add_argument("--max-threads", type=int, default=len(available_cores()),
+                        help="Parallel algorithms are measured with 1, 2, 4, ... up to this many threads "
+                             "(default: the number of available cores)")
+    parser.add_argument("--builds", nargs="+", choices=[*BUILD_VARIANTS, "all"], default=DEFAULT_BUILDS,
+                        help="Build variants (compiler and flags) to build and measure every C algorithm with; "
+                             "with several, each one is reported as a variant and compared with the first "
+                             f"(default: {' '.join(DEFAULT_BUILDS)})")
+    parser.add_argument("--low-noise", action="store_true",
+                        help="Run the repetitions of all algorithms in a random, interleaved order, pinned to the "
+                             "isolated cores (isolcpus=) or else to the last available core")
+    parser.add_argument("--seed", type=int, default=0,
+                        help="Seed of the --low-noise run order (default: 0)")
+    parser.set_defaults(mode="process")
+    args = parser.parse_args()
+    args.builds = available_builds(list(BUILD_VARIANTS) if "all" in args.builds else list(dict.fromkeys(args.builds)))
+    if not args.builds:
+        parser.error("none of the --builds compilers is installed")
+    if args.prune and args.timeout is None:
+        parser.error("--prune requires --timeout")
+    if args.low_noise and (args.jobs > 1 or args.adaptive):
+        parser.error("--low-noise runs one fixed repetition at a time; it cannot be combined with --jobs or --adaptive")
+    if args.low_noise:
+        args.max_threads = min(args.max_threads, len(low_noise_cores()))  # The parallel variants share the pinned cores
+
+    plan = benchmark_plan(args)
+    if command != "report":
+        measure(args, plan)
+    if command != "measure":
+        report(args, plan)
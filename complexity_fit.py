@@ -0,0 +1,82 @@
+"""
+Empirical complexity fitting for benchmark.py.
+
+Each (algorithm, input type) series of (n, value) points, value being a time or a
+comparison count, is fitted to every model in COMPLEXITY_MODELS as value = a + b * f(n).
+All models are solved at once with a batched least-squares solve. The fit minimizes the
+relative error, so the small sizes count as much as the large ones, although their
+values are orders of magnitude apart. The model with the smallest relative RMS residual
+is the best one. It is used to extrapolate, e.g. the time at n = 10^7 or the largest n
+sortable within a time budget.
+"""
+from collections import namedtuple
+
+import numpy as np
+
+COMPLEXITY_MODELS = {
+    "n": lambda n: n,
+    "n log n": lambda n: n * np.log2(n),
+    "n^2": lambda n: n ** 2,
+}
+MIN_FIT_POINTS = 3  # Two parameters plus at least one degree of freedom
+MAX_SEARCH_N = 1e15  # Upper bound of the max_n_within search
+
+# constant and coefficient are a and b of value = a + b * f(n); residual is the RMS of the
+# relative errors (0.05 = the model is off by 5% on average)
+ModelFit = namedtuple("ModelFit", ["model", "constant", "coefficient", "residual"])
+
+def fit_models(ns, values):
+    """
+    Fits every model to the (n, value) points. Returns [ModelFit, ...] sorted from the best
+    fit to the worst, or [] when there are too few usable points. A model whose growth term
+    comes out negative does not describe the data and is left out.
+    """
+    ns = np.asarray(ns, dtype=float)
+    values = np.asarray(values, dtype=float)
+    usable = np.isfinite(values) & (values > 0) & (ns > 1)
+    ns, values = ns[usable], values[usable]
+    if len(ns) < MIN_FIT_POINTS:
+        return []
+
+    # Design matrices of all models, shape (models, points, 2), divided by the values so
+    # that the least-squares solution minimizes the relative error
+    growth = np.stack([model(ns) for model in COMPLEXITY_MODELS.values()])
+    design = np.stack([np.ones_like(growth), growth], axis=-1) / values[:, None]
+    target = np.ones(len(ns))
+    # Normal equations of all models at once
+    gram = np.einsum("mpi,mpj->mij", design, design)
+    moments = np.einsum("mpi,p->mi", design, target)
+    try:
+        params = np.linalg.solve(gram, moments[..., None])[..., 0]
+    except np.linalg.LinAlgError:
+        params = np.stack([np.linalg.lstsq(d, target, rcond=None)[0] for d in design])
+    relative_errors = np.einsum("mpi,mi->mp", design, params) - 1
+    residuals = np.sqrt(np.mean(relative_errors ** 2, axis=1))
+
+    fits = [ModelFit(model, float(constant), float(coefficient), float(residual))
+            for model, (constant, coefficient), residual in zip(COMPLEXITY_MODELS, params, residuals)
+            if coefficient > 0]
+    return sorted(fits, key=lambda fit: fit.residual)
+
+def predict(fit, n):
+    """The fitted value at size n."""
+    return fit.constant + fit.coefficient * COMPLEXITY_MODELS[fit.model](float(n))
+
+def max_n_within(fit, budget):
+    """
+    The largest n whose predicted value stays within budget (e.g. the largest input sorted in
+    10 ms). Returns 0 if even n = 2 exceeds it and inf if MAX_SEARCH_N still fits.
+    """
+    if predict(fit, 2) > budget:
+        return 0
+    if predict(fit, MAX_SEARCH_N) <= budget:
+        return float('inf')
+    low, high = 2.0, MAX_SEARCH_N
+    # Bisection on a log scale; the models are increasing in n
+    while high / low > 1 + 1e-9:
+        middle = np.sqrt(low * high)
+        if predict(fit, middle) <= budget:
+            low = middle
+        else:
+            high = middle
+    return int(low)
@@ -0,0 +1,87 @@
+"""
+Element types of the benchmark inputs, shared by generate_test_data.py and benchmark.py.
+
+Every input is generated as non-negative integer values below 2^31 and then converted to
+its element type. The conversions keep the order and the duplicates of the values, so a
+sorted input stays sorted and a few_unique input keeps its few unique keys:
+  int32      - the values themselves (the original format, also the only one in .txt files)
+  int64      - the values times 2^31 + 1, so the keys really use 64 bits
+  float64    - the values plus a fraction derived from the value
+  record<N>  - an int64 key (as for int64) followed by N payload bytes, N a multiple of 8;
+               the sorting programs move the whole record but compare only the key
+
+The C programs are compiled once per element type with element_compile_flags (see the
+element_t typedef in sorting_algorithms/sort_element.h), whose layout element_dtype matches.
+"""
+import re
+
+import numpy as np
+
+DEFAULT_ELEMENT_TYPE = "int32"
+ELEMENT_TYPES = ["int32", "int64", "float64", "record8", "record56"]  # The usual choices; any record<N> works
+RECORD_PATTERN = re.compile(r"record(\d+)$")
+# An input case of another element type than int32 is named "<distribution>.<element type>",
+# as in the data file names: n_1000_random.int64.npy holds the "random.int64" case
+ELEMENT_TYPE_SEPARATOR = "."
+
+INT64_SCALE = 2 ** 31 + 1  # Largest value (2^31 - 1) * INT64_SCALE still fits in an int64
+FLOAT_FRACTION = (np.sqrt(5) - 1) / 2  # Fractional part of value * FLOAT_FRACTION is added to floats
+
+def record_payload_bytes(element_type):
+    """Payload size of a record<N> type, or None for the scalar types."""
+    match = RECORD_PATTERN.match(element_type)
+    return int(match.group(1)) if match else None
+
+def is_element_type(element_type):
+    """Whether a name is a supported element type."""
+    payload = record_payload_bytes(element_type)
+    if payload is not None:
+        return payload > 0 and payload % 8 == 0  # No padding, so C and NumPy agree on the layout
+    return element_type in ("int32", "int64", "float64")
+
+def element_dtype(element_type):
+    """The NumPy dtype of one element, laid out like the C element_t it is compiled with."""
+    payload = record_payload_bytes(element_type)
+    if payload is not None:
+        return np.dtype([("key", np.int64), ("payload", f"V{payload}")])
+    return np.dtype({"int32": np.int32, "int64": np.int64, "float64": np.float64}[element_type])
+
+def element_compile_flags(element_type):
+    """The preprocessor flags selecting element_t in sort_element.h."""
+    payload = record_payload_bytes(element_type)
+    if payload is not None:
+        return [f"-DSORT_RECORD_PAYLOAD={payload}"]
+    return {"int32": [], "int64": ["-DSORT_ELEMENT_INT64"], "float64": ["-DSORT_ELEMENT_FLOAT64"]}[element_type]
+
+def to_elements(values, element_type):
+    """Converts non-negative integer values below 2^31 to an array of the element type."""
+    values = np.asarray(values, dtype=np.int64)
+    if element_type == "int32":
+        return values.astype(np.int32)
+    if element_type == "int64":
+        return values * INT64_SCALE
+    if element_type == "float64":
+        return values + np.modf(values * FLOAT_FRACTION)[0]
+    elements = np.empty(len(values), dtype=element_dtype(element_type))
+    elements["key"] = values * INT64_SCALE
+    # Payload bytes all equal to the key's low byte, like the C programs fill them from text input
+    payload = np.repeat((values & 0xFF).astype(np.uint8)[:, None], record_payload_bytes(element_type), axis=1)
+    elements["payload"] = payload.view(elements.dtype["payload"]).ravel()
+    return elements
+
+def element_keys(data):
+    """The sort keys of an input: the keys of records, the values themselves otherwise."""
+    if isinstance(data, np.ndarray) and data.dtype.names:
+        return data["key"]
+    return data
+
+def case_name(distribution, element_type=DEFAULT_ELEMENT_TYPE):
+    """The input case of a distribution and element type: random, random.int64, ..."""
+    if element_type == DEFAULT_ELEMENT_TYPE:
+        return distribution
+    return f"{distribution}{ELEMENT_TYPE_SEPARATOR}{element_type}"
+
+def split_case(data_type):
+    """Returns (distribution, element type) of an input case."""
+    distribution, separator, element_type = data_type.partition(ELEMENT_TYPE_SEPARATOR)
+    return distribution, element_type if separator else DEFAULT_ELEMENT_TYPE
@@ -0,0 +1,89 @@
+"""
+Environment fingerprint of the machine the benchmarks run on, for benchmark.py.
+
+Every stored repetition carries the fingerprint taken right after it ran: the CPU model,
+the frequency governor, the kernel, the cores the benchmark may use and the system load.
+The load is what makes a run suspect: the 1-minute load average is a lagging measure,
+but if other processes kept the machine busy while a run was timed, the run competed
+with them for cores, caches and memory bandwidth and should not be trusted.
+"""
+import functools
+import os
+import platform
+
+# A run is flagged when the load beyond the benchmark's own process exceeds this many
+# runnable processes per core of the machine
+HIGH_LOAD_PER_CORE = 0.25
+ISOLATED_CORES_PATH = "/sys/devices/system/cpu/isolated"
+GOVERNOR_PATH = "/sys/devices/system/cpu/cpu{core}/cpufreq/scaling_governor"
+
+def _read_line(path):
+    """First line of a (sysfs or procfs) file, or None if it cannot be read."""
+    try:
+        with open(path) as f:
+            return f.readline().strip()
+    except OSError:
+        return None
+
+def parse_cpu_list(cpu_list):
+    """Parses a kernel CPU list such as "2-3,6" into [2, 3, 6]."""
+    cores = []
+    for part in filter(None, (cpu_list or "").split(",")):
+        first, _, last = part.partition("-")
+        cores.extend(range(int(first), int(last or first) + 1))
+    return cores
+
+def available_cores():
+    """Returns the CPU cores this process is allowed to run on."""
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+def isolated_cores():
+    """The cores isolated from the scheduler with the isolcpus= kernel parameter (Linux), [] if none."""
+    return parse_cpu_list(_read_line(ISOLATED_CORES_PATH))
+
+@functools.lru_cache(maxsize=None)
+def cpu_model():
+    """The CPU model name, from /proc/cpuinfo on Linux."""
+    try:
+        with open("/proc/cpuinfo") as f:
+            for line in f:
+                if line.startswith("model name"):
+                    return line.partition(":")[2].strip()
+    except OSError:
+        pass
+    return platform.processor() or platform.machine()
+
+def load_average():
+    """The 1-minute load average, or None where the platform does not provide it (Windows)."""
+    try:
+        return os.getloadavg()[0]
+    except (AttributeError, OSError):
+        return None
+
+def is_high_load(load, own_processes=1):
+    """Whether a load average leaves less than a quiet machine for the benchmark (see HIGH_LOAD_PER_CORE)."""
+    if load is None:
+        return False
+    # The load average counts the runnable processes of the whole machine (of the host, in a
+    # container), so it is divided by all its cores, not by the ones the benchmark is pinned to
+    return (load - own_processes) / (os.cpu_count() or 1) > HIGH_LOAD_PER_CORE
+
+def environment_fingerprint(cores=None, own_processes=1):
+    """
+    The fingerprint stored with each run, as a JSON-serializable dict. cores are the cores the
+    benchmark runs on (default: the ones this process may use); the governor is read from the first.
+    own_processes is the number of processes the benchmark itself keeps busy (its workers).
+    """
+    if cores is None:
+        cores = available_cores()
+    load = load_average()
+    return {
+        "cpu_model": cpu_model(),
+        "governor": _read_line(GOVERNOR_PATH.format(core=cores[0])) if cores else None,
+        "kernel": f"{platform.system()} {platform.release()}",
+        "cores": cores,
+        "load_1m": load,
+        "high_load": is_high_load(load, own_processes),
+    }
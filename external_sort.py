@@ -0,0 +1,124 @@
+"""
+Out-of-core external sort of `benchmark.py external`.
+
+The input is a binary .npy file of generate_test_data.py, memory-mapped, so the dataset
+never has to fit in memory. The sort has two phases:
+  run phase    - the input is cut into chunks of chunk_size elements; each chunk is copied
+                 into memory, sorted by one of the in-memory algorithms (its shared library)
+                 and written, as a sorted run, to a memory-mapped runs file
+  merge phase  - the runs are merged with a k-way heap merge (sorting_algorithms/kway_merge.c)
+                 straight from the memory-mapped runs file into the memory-mapped output file
+
+Each phase reads the whole dataset once and writes it once, so its I/O throughput is twice
+the dataset size over the phase's time. The phase times include flushing the written file to
+disk. Before each phase, the file it reads is dropped from the page cache where the platform
+allows it (posix_fadvise), so that a dataset smaller than the memory is still read from disk.
+"""
+import ctypes
+import os
+import time
+from collections import namedtuple
+
+import numpy as np
+
+from element_types import element_keys
+
+DEFAULT_CHUNK_SIZES = [10_000, 100_000, 1_000_000]
+VERIFY_BLOCK_ELEMENTS = 1 << 22  # The output is checked for order this many elements at a time
+BYTES_PER_MB = 1e6
+
+RUNS_FILE = "runs.npy"
+OUTPUT_FILE = "sorted.npy"
+
+# One external sort of a dataset: its size in elements and bytes, the number of runs, the
+# time of each phase, and the part of the run phase spent in the in-memory sorts
+ExternalSortResult = namedtuple("ExternalSortResult",
+                                ["n", "dataset_bytes", "chunk_size", "runs", "run_phase", "run_sort", "merge_phase"])
+
+def drop_page_cache(path):
+    """Asks the operating system to evict a file's cached pages; a no-op where posix_fadvise is missing."""
+    if not hasattr(os, "posix_fadvise"):
+        return
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+    finally:
+        os.close(fd)
+
+def throughput_mb_s(dataset_bytes, seconds, phases=1):
+    """I/O throughput, in MB/s, of phases that each read and write the whole dataset once."""
+    return 2 * phases * dataset_bytes / BYTES_PER_MB / seconds if seconds > 0 else float('inf')
+
+def is_sorted(data, block=VERIFY_BLOCK_ELEMENTS):
+    """Whether a (memory-mapped) array is in non-decreasing key order, read a block at a time."""
+    previous = None
+    for start in range(0, len(data), block):
+        keys = np.asarray(element_keys(data[start:start + block]))
+        if np.any(keys[1:] < keys[:-1]) or (previous is not None and len(keys) and keys[0] < previous):
+            return False
+        if len(keys):
+            previous = keys[-1]
+    return True
+
+class RunMerger:
+    """The k-way merge of kway_merge.c, built as a shared library for one element type."""
+
+    def __init__(self, library_path):
+        self.library = ctypes.CDLL(os.path.abspath(library_path))
+        self.library.mergeRuns.argtypes = [ctypes.c_void_p, ctypes.c_void_p, ctypes.c_int, ctypes.c_void_p]
+        self.library.mergeRuns.restype = ctypes.c_longlong
+        self.element_bytes = ctypes.c_int.in_dll(self.library, "sort_element_bytes").value
+
+    def merge(self, runs, run_starts, out):
+        """Merges the sorted runs of runs (run i is runs[run_starts[i]:run_starts[i + 1]]) into out."""
+        if runs.dtype.itemsize != self.element_bytes:
+            raise ValueError(f"{runs.dtype} elements do not match the {self.element_bytes}-byte elements the merge was built for")
+        starts = np.ascontiguousarray(run_starts, dtype=np.int64)
+        written = self.library.mergeRuns(runs.ctypes.data, starts.ctypes.data, len(starts) - 1, out.ctypes.data)
+        if written != len(out):
+            raise RuntimeError(f"the merge wrote {written} of {len(out)} elements")
+
+def external_sort(input_path, work_dir, chunk_size, sort_chunk, merger, drop_cache=True):
+    """
+    Sorts the .npy file input_path out of core, with the runs and the output in work_dir, and
+    returns an ExternalSortResult. sort_chunk(chunk) sorts an in-memory copy of a chunk and
+    returns (sorted array, sort time). The output is checked for order (outside the timed
+    phases) and raises ValueError if it is not sorted; both files are deleted afterwards.
+    """
+    data = np.load(input_path, mmap_mode='r')
+    n = len(data)
+    run_starts = list(range(0, n, chunk_size)) + [n]
+    runs_path = os.path.join(work_dir, RUNS_FILE)
+    output_path = os.path.join(work_dir, OUTPUT_FILE)
+    try:
+        if drop_cache:
+            drop_page_cache(input_path)
+        run_sort = 0.0
+        start = time.perf_counter()
+        runs = np.lib.format.open_memmap(runs_path, mode="w+", dtype=data.dtype, shape=(n,))
+        for run_start, run_end in zip(run_starts, run_starts[1:]):
+            sorted_chunk, elapsed = sort_chunk(data[run_start:run_end])
+            runs[run_start:run_end] = sorted_chunk
+            run_sort += elapsed
+        runs.flush()
+        run_phase = time.perf_counter() - start
+        del runs
+
+        if drop_cache:
+            drop_page_cache(runs_path)
+        start = time.perf_counter()
+        runs = np.load(runs_path, mmap_mode='r')
+        output = np.lib.format.open_memmap(output_path, mode="w+", dtype=data.dtype, shape=(n,))
+        merger.merge(runs, run_starts, output)
+        output.flush()
+        merge_phase = time.perf_counter() - start
+        del runs
+
+        if not is_sorted(output):
+            raise ValueError(f"the external sort of {input_path} with {chunk_size}-element chunks is not sorted")
+        del output
+    finally:
+        for path in (runs_path, output_path):
+            if os.path.exists(path):
+                os.remove(path)
+    return ExternalSortResult(n, data.nbytes, chunk_size, len(run_starts) - 1, run_phase, run_sort, merge_phase)
@@ -1,48 +1,160 @@
 import os
-import random
-
-def generate_data(n, data_type):
-    if data_type == "random":
-        return [random.randint(0, n * 2) for _ in range(n)]
-    elif data_type == "sorted":
-        return list(range(n))
-    elif data_type == "reverse_sorted":
-        return list(range(n - 1, -1, -1))
-    else:
-        raise ValueError("Invalid data_type. Choose from 'random', 'sorted', 'reverse_sorted'.")
-
-def save_data_to_file(data, filename):
+import argparse
+import numpy as np
+from element_types import DEFAULT_ELEMENT_TYPE, ELEMENT_TYPES, case_name, element_dtype, is_element_type, to_elements
+
+# Binary test data is stored as .npy: a small header (dtype, shape) followed by raw
+# native values of the element type (int32 by default, see element_types.py), so
+# benchmark.py can memory-map it instead of parsing text.
+BINARY_DTYPE = np.int32
+INT32_MAX = np.iinfo(np.int32).max
+
+DEFAULT_SEED = 42
+DEFAULT_INPUT_SIZES = [100, 500, 1000, 5000, 10000, 25000, 50000, 75000, 100000]
+DEFAULT_DATA_TYPES = ["random", "sorted", "reverse_sorted"]
+# Production-like distributions, generated on request with --types
+EXTRA_DATA_TYPES = ["nearly_sorted", "few_unique", "organ_pipe", "sawtooth", "zipf", "full_range"]
+DATA_TYPES = DEFAULT_DATA_TYPES + EXTRA_DATA_TYPES
+
+CHUNK_SIZE = 1 << 22  # Elements generated and written at a time
+NEARLY_SORTED_SWAP_FRACTION = 0.01  # nearly_sorted: k = 1% of n random swaps
+FEW_UNIQUE_VALUES = 10
+SAWTOOTH_TEETH = 10
+ZIPF_EXPONENT = 1.5
+
+def data_rng(seed, n, data_type):
+    """Independent random stream per (seed, n, type), so any single file can be regenerated on its own."""
+    return np.random.default_rng([seed, n, DATA_TYPES.index(data_type)])
+
+def generate_chunks(n, data_type, seed=DEFAULT_SEED, chunk_size=CHUNK_SIZE):
+    """
+    Yields the n elements of one input as int64 NumPy chunks of at most chunk_size elements.
+    All values are non-negative so that radix_sort can handle every distribution.
+    """
+    if data_type not in DATA_TYPES:
+        raise ValueError(f"Invalid data_type. Choose from {', '.join(repr(t) for t in DATA_TYPES)}.")
+    rng = data_rng(seed, n, data_type)
+
+    if data_type == "nearly_sorted":
+        # Sorted input with k disjoint swaps: position a holds b and b holds a
+        k = max(1, int(n * NEARLY_SORTED_SWAP_FRACTION)) if n > 1 else 0
+        positions = rng.choice(n, size=2 * k, replace=False)
+        swap_from, swap_to = np.concatenate([positions[:k], positions[k:]]), np.concatenate([positions[k:], positions[:k]])
+        order = np.argsort(swap_from)
+        swap_from, swap_to = swap_from[order], swap_to[order]
+    elif data_type == "few_unique":
+        unique_values = rng.integers(0, n * 2 + 1, size=FEW_UNIQUE_VALUES)
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        size = stop - start
+        index = np.arange(start, stop, dtype=np.int64)
+        if data_type == "random":
+            yield rng.integers(0, n * 2 + 1, size=size)
+        elif data_type == "sorted":
+            yield index
+        elif data_type == "reverse_sorted":
+            yield n - 1 - index
+        elif data_type == "nearly_sorted":
+            chunk = index.copy()
+            lo, hi = np.searchsorted(swap_from, [start, stop])
+            chunk[swap_from[lo:hi] - start] = swap_to[lo:hi]
+            yield chunk
+        elif data_type == "few_unique":
+            yield unique_values[rng.integers(0, FEW_UNIQUE_VALUES, size=size)]
+        elif data_type == "organ_pipe":
+            # Ascending to the middle, then descending
+            yield np.minimum(index, n - 1 - index)
+        elif data_type == "sawtooth":
+            # SAWTOOTH_TEETH ascending runs
+            yield index % max(1, -(-n // SAWTOOTH_TEETH))
+        elif data_type == "zipf":
+            yield np.minimum(rng.zipf(ZIPF_EXPONENT, size=size), INT32_MAX)
+        elif data_type == "full_range":
+            # Every non-negative 32-bit value, so radix sort needs the maximum number of digits
+            yield rng.integers(0, INT32_MAX, size=size, endpoint=True)
+
+def generate_data(n, data_type, seed=DEFAULT_SEED):
+    """Returns the whole input as a NumPy array."""
+    chunks = list(generate_chunks(n, data_type, seed))
+    return np.concatenate(chunks) if chunks else np.empty(0, dtype=np.int64)
+
+def save_data_to_file(chunks, filename):
+    """Writes the chunks as text, one integer per line."""
     with open(filename, "w") as f:
-        for item in data:
-            f.write(str(item) + "\n")
+        for chunk in chunks:
+            np.savetxt(f, chunk, fmt="%d")
+
+def save_data_to_binary_file(chunks, n, filename, element_type=DEFAULT_ELEMENT_TYPE):
+    """Writes the chunks to a memory-mapped .npy file of n elements of the element type."""
+    out = np.lib.format.open_memmap(filename, mode="w+", dtype=element_dtype(element_type), shape=(n,))
+    position = 0
+    for chunk in chunks:
+        out[position:position + len(chunk)] = to_elements(chunk, element_type)
+        position += len(chunk)
+    out.flush()
+    del out
+
+def convert_text_file_to_binary(txt_filename):
+    """Converts an existing one-integer-per-line file to .npy next to it. Returns the new path."""
+    data = np.loadtxt(txt_filename, dtype=BINARY_DTYPE, ndmin=1)
+    npy_filename = os.path.splitext(txt_filename)[0] + ".npy"
+    np.save(npy_filename, data)
+    return npy_filename
 
 def main():
-    input_sizes = [
-        100,
-        500,
-        1000,
-        5000,
-        10000,
-        25000,
-        50000,
-        75000,
-        100000
-    ]
-    data_types = ["random", "sorted", "reverse_sorted"]
+    parser = argparse.ArgumentParser(description="Generate the benchmark input files.")
+    parser.add_argument("--format", choices=["txt", "npy"], default="txt",
+                        help="txt: one integer per line; npy: binary int32 that benchmark.py memory-maps (default: txt)")
+    parser.add_argument("--convert", action="store_true",
+                        help="Convert the existing .txt files in the output directory to .npy instead of generating new data")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED,
+                        help=f"Seed for the random distributions (default: {DEFAULT_SEED})")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_INPUT_SIZES,
+                        help="Input sizes to generate (default: the standard benchmark sizes)")
+    parser.add_argument("--types", nargs="+", choices=DATA_TYPES + ["all"], default=DEFAULT_DATA_TYPES,
+                        help="Input distributions to generate, or 'all' (default: random sorted reverse_sorted)")
+    parser.add_argument("--element-types", nargs="+", default=[DEFAULT_ELEMENT_TYPE],
+                        help=f"Element types to generate each input in: {', '.join(ELEMENT_TYPES)} or any "
+                             f"record<N> (an int64 key and N payload bytes, N a multiple of 8); types other "
+                             f"than int32 need --format npy (default: {DEFAULT_ELEMENT_TYPE})")
+    args = parser.parse_args()
+    for element_type in args.element_types:
+        if not is_element_type(element_type):
+            parser.error(f"invalid element type '{element_type}'")
+    if args.format == "txt" and set(args.element_types) != {DEFAULT_ELEMENT_TYPE}:
+        parser.error("element types other than int32 are only written as --format npy")
+
+    input_sizes = args.sizes
+    data_types = DATA_TYPES if "all" in args.types else args.types
     output_dir = "test_data"
 
     if not os.path.exists(output_dir):
         os.makedirs(output_dir)
 
-    print(f"Generating test data in '{output_dir}' directory...")
+    if args.convert:
+        print(f"Converting text test data in '{output_dir}' to binary...")
+        for filename in sorted(os.listdir(output_dir)):
+            if filename.endswith(".txt"):
+                npy_filename = convert_text_file_to_binary(os.path.join(output_dir, filename))
+                print(f"  Converted {filename} to {npy_filename}")
+        print("Conversion complete.")
+        return
+
+    print(f"Generating test data in '{output_dir}' directory (seed={args.seed})...")
 
     for n in input_sizes:
         for dtype in data_types:
-            print(f"  Generating n={n}, type={dtype}...")
-            data = generate_data(n, dtype)
-            filename = os.path.join(output_dir, f"n_{n}_{dtype}.txt")
-            save_data_to_file(data, filename)
-            print(f"    Saved to {filename}")
+            for element_type in args.element_types:
+                print(f"  Generating n={n}, type={dtype}, elements={element_type}...")
+                chunks = generate_chunks(n, dtype, args.seed)
+                # n_1000_random.npy for int32, n_1000_random.int64.npy for the other element types
+                filename = os.path.join(output_dir, f"n_{n}_{case_name(dtype, element_type)}.{args.format}")
+                if args.format == "npy":
+                    save_data_to_binary_file(chunks, n, filename, element_type)
+                else:
+                    save_data_to_file(chunks, filename)
+                print(f"    Saved to {filename}")
 
     print("Data generation complete.")
 
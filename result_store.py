@@ -0,0 +1,134 @@
+"""
+Append-only SQLite store for individual benchmark repetitions.
+
+Every repetition is written as soon as it finishes, keyed by the algorithm's source
+hash, the compiler and flags it was built with, the host and the hash of the input
+file. Re-running a repetition appends a new record; readers use the most recent one.
+
+Each record has a status: "ok", "crashed" or "timeout" for runs that were executed,
+"skipped" or "extrapolated" for cells the harness predicted would exceed the budget,
+"memory" for the runs of the memory pass, whose allocation-counting builds are not timed
+like the others and are only read for their heap metrics.
+Additional per-run measurements (peak RSS, allocation counts, ...) are kept as a JSON
+object in the metrics column, and the environment fingerprint taken after the run (CPU,
+governor, kernel, load; see environment.py) as one in the environment column.
+"""
+import datetime
+import json
+import platform
+import sqlite3
+from collections import namedtuple
+
+MEMORY_PASS_STATUS = "memory"
+
+# Identifies what was measured; a repetition of a RunKey is one cell of the result store
+RunKey = namedtuple("RunKey", ["algorithm", "source_hash", "compiler", "compile_flags", "host", "data_hash"])
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    algorithm TEXT NOT NULL,
+    source_hash TEXT NOT NULL,
+    compiler TEXT NOT NULL,
+    compile_flags TEXT NOT NULL,
+    host TEXT NOT NULL,
+    data_hash TEXT NOT NULL,
+    data_file TEXT NOT NULL,
+    n INTEGER NOT NULL,
+    data_type TEXT NOT NULL,
+    repetition INTEGER NOT NULL,
+    time REAL NOT NULL,
+    comparisons INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'ok',
+    metrics TEXT NOT NULL DEFAULT '{}',
+    environment TEXT NOT NULL DEFAULT '{}',
+    recorded_at TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS runs_by_key
+    ON runs (algorithm, source_hash, compiler, compile_flags, host, data_hash, repetition);
+"""
+
+KEY_COLUMNS = ", ".join(RunKey._fields)
+
+def current_host():
+    """Name of the machine the measurements are taken on."""
+    return platform.node()
+
+class ResultStore:
+    """Thin wrapper around the SQLite database holding one row per repetition."""
+
+    def __init__(self, path):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.executescript(SCHEMA)
+        # Stores created before run statuses, metrics or environments were recorded
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(runs)")}
+        if "status" not in columns:
+            self.connection.execute("ALTER TABLE runs ADD COLUMN status TEXT NOT NULL DEFAULT 'ok'")
+        if "metrics" not in columns:
+            self.connection.execute("ALTER TABLE runs ADD COLUMN metrics TEXT NOT NULL DEFAULT '{}'")
+        if "environment" not in columns:
+            self.connection.execute("ALTER TABLE runs ADD COLUMN environment TEXT NOT NULL DEFAULT '{}'")
+
+    def record(self, run_key, data_file, n, data_type, repetition, time_taken, comparisons, status="ok", metrics=None,
+               environment=None):
+        """
+        Appends one finished repetition and commits it immediately. metrics is a {name: number} dict,
+        environment the fingerprint of the machine at the time of the run.
+        """
+        self.connection.execute(
+            f"INSERT INTO runs ({KEY_COLUMNS}, data_file, n, data_type, repetition, time, comparisons, status, metrics, "
+            "environment, recorded_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (*run_key, data_file, n, data_type, repetition, time_taken, comparisons, status, json.dumps(metrics or {}),
+             json.dumps(environment or {}), datetime.datetime.now().isoformat(timespec="seconds")),
+        )
+        self.connection.commit()
+
+    def measured_repetitions(self):
+        """Returns the set of (RunKey, repetition) pairs that already have a record."""
+        rows = self.connection.execute(f"SELECT DISTINCT {KEY_COLUMNS}, repetition FROM runs")
+        return {(RunKey(*row[:-1]), row[-1]) for row in rows}
+
+    def _latest(self, columns, run_key, max_repetitions):
+        """Rows of the given columns for the latest record of each repetition of a RunKey."""
+        where = " AND ".join(f"{column} = ?" for column in RunKey._fields)
+        limit = "" if max_repetitions is None else f" AND repetition < {int(max_repetitions)}"
+        return self.connection.execute(
+            f"SELECT {columns} FROM runs WHERE id IN "
+            f"(SELECT MAX(id) FROM runs WHERE {where}{limit} GROUP BY repetition) ORDER BY repetition",
+            tuple(run_key),
+        )
+
+    def load(self, run_key, max_repetitions=None):
+        """
+        Returns [(time, comparisons, status, metrics), ...] for a RunKey, using the latest record of each
+        repetition and, if given, only the first max_repetitions repetitions.
+        """
+        rows = self._latest("time, comparisons, status, metrics", run_key, max_repetitions)
+        return [(time_taken, comparisons, status, json.loads(metrics)) for time_taken, comparisons, status, metrics in rows]
+
+    def load_environments(self, run_key, max_repetitions=None):
+        """The environment fingerprints of the runs load() returns, in the same order ({} for older records)."""
+        return [json.loads(environment) for (environment,) in self._latest("environment", run_key, max_repetitions)]
+
+    def load_cells(self):
+        """
+        Returns {(algorithm, data_type, n): [(time, status), ...]} over the whole store. Each cell
+        holds the repetitions of the RunKey recorded most recently for it, so a store that was
+        measured again after a change reports the new measurements. Memory pass runs are left out.
+        """
+        latest_key = {}
+        latest_runs = {}  # {(cell, RunKey): {repetition: (time, status)}}
+        rows = self.connection.execute(f"SELECT {KEY_COLUMNS}, n, data_type, repetition, time, status FROM runs "
+                                       "WHERE status != ? ORDER BY id", (MEMORY_PASS_STATUS,))
+        for row in rows:
+            run_key = RunKey(*row[:len(RunKey._fields)])
+            n, data_type, repetition, time_taken, status = row[len(RunKey._fields):]
+            cell = (run_key.algorithm, data_type, n)
+            latest_key[cell] = run_key
+            latest_runs.setdefault((cell, run_key), {})[repetition] = (time_taken, status)
+        return {cell: [run for repetition, run in sorted(latest_runs[(cell, run_key)].items())]
+                for cell, run_key in latest_key.items()}
+
+    def close(self):
+        self.connection.close()
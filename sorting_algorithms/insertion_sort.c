@@ -1,7 +1,9 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <time.h>
+#include <string.h>
 #include <stdint.h>
+#include "sort_harness.h"
 
 long long comparison_count = 0;
 struct timespec start_time, end_time;
@@ -10,14 +12,15 @@ double get_elapsed_time(struct timespec start, struct timespec end) {
     return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
 }
 
-void insertionSort(int arr[], int n) {
-    int i, key, j;
+void insertionSort(element_t arr[], int n) {
+    int i, j;
+    element_t key;
     
     for (i = 1; i < n; i++) {
         key = arr[i];
         j = i - 1;
         
-        while (j >= 0 && (comparison_count++, arr[j] > key)) {
+        while (j >= 0 && (comparison_count++, KEY(arr[j]) > KEY(key))) {
             arr[j + 1] = arr[j];
             j = j - 1;
         }
@@ -25,33 +28,48 @@ void insertionSort(int arr[], int n) {
     }
 }
 
-void printArray(int arr[], int size) {
+void printArray(element_t arr[], int size) {
     int i;
     for (i = 0; i < size; i++)
-        printf("%d ", arr[i]);
+        print_element(arr[i]);
     printf("\n");
 }
 
-int main() {
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    insertionSort(arr, n);
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
     int n;
     scanf("%d", &n); // Read the number of elements
-    int *arr = (int *)malloc(n * sizeof(int));
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
     if (arr == NULL) {
         return 1; // Error handling for malloc
     }
 
     for (int i = 0; i < n; i++) {
-        scanf("%d", &arr[i]); // Read elements into the array
+        read_element(&arr[i]); // Read elements into the array
     }
     
+    reset_allocation_stats();
+    start_counters();
     clock_gettime(CLOCK_MONOTONIC, &start_time);
     insertionSort(arr, n);
     clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
     
     double elapsed = get_elapsed_time(start_time, end_time);
     
     fprintf(stderr, "TIME: %.9f\n", elapsed);
     fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
     
     // Optionally print the sorted array, but for benchmarking, we might skip this
     // for (int i = 0; i < n; i++) {
@@ -62,3 +80,4 @@ int main() {
     free(arr); // Free dynamically allocated memory
     return 0;
 }
+#endif
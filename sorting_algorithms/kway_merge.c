@@ -0,0 +1,67 @@
+#include <stdlib.h>
+#include "sort_element.h"
+
+// Merge phase of the external sort of `benchmark.py external`, built as a shared library with
+// the element type flags of the algorithms. It is not a sorting program: it only includes the
+// element type header, not the benchmark harness, so benchmark.py does not discover it as an algorithm.
+
+// Whether the head of run a goes before the head of run b; equal keys are taken from the
+// earlier run first, which keeps the merge stable
+static int headBefore(const element_t *runs, const long long *heads, int a, int b) {
+    if (KEY(runs[heads[a]]) != KEY(runs[heads[b]]))
+        return KEY(runs[heads[a]]) < KEY(runs[heads[b]]);
+    return a < b;
+}
+
+// Restores the min-heap of run indices below position i
+static void siftDown(int heap[], int size, int i, const element_t *runs, const long long *heads) {
+    while (1) {
+        int smallest = i;
+        int left = 2 * i + 1;
+        int right = 2 * i + 2;
+        if (left < size && headBefore(runs, heads, heap[left], heap[smallest]))
+            smallest = left;
+        if (right < size && headBefore(runs, heads, heap[right], heap[smallest]))
+            smallest = right;
+        if (smallest == i)
+            return;
+        int temp = heap[i];
+        heap[i] = heap[smallest];
+        heap[smallest] = temp;
+        i = smallest;
+    }
+}
+
+// Merges the k sorted runs stored one after another in runs into out. Run i is
+// runs[run_starts[i] .. run_starts[i + 1] - 1], so run_starts has k + 1 entries. runs and out
+// are usually memory-mapped files, which the operating system pages in and out as the merge
+// advances. Returns the number of elements written, or -1 if out of memory.
+long long mergeRuns(const element_t *runs, const long long *run_starts, int k, element_t *out) {
+    long long *heads = (long long *)malloc(k * sizeof(long long)); // Next element of each run
+    int *heap = (int *)malloc(k * sizeof(int)); // Runs with elements left, by their next element
+    if (heads == NULL || heap == NULL) {
+        free(heads);
+        free(heap);
+        return -1;
+    }
+    int size = 0;
+    for (int i = 0; i < k; i++) {
+        heads[i] = run_starts[i];
+        if (heads[i] < run_starts[i + 1])
+            heap[size++] = i;
+    }
+    for (int i = size / 2 - 1; i >= 0; i--)
+        siftDown(heap, size, i, runs, heads);
+
+    long long written = 0;
+    while (size > 0) {
+        int run = heap[0];
+        out[written++] = runs[heads[run]++];
+        if (heads[run] == run_starts[run + 1])
+            heap[0] = heap[--size]; // Run exhausted
+        siftDown(heap, size, 0, runs, heads);
+    }
+    free(heads);
+    free(heap);
+    return written;
+}
@@ -1,7 +1,15 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <time.h>
+#include <string.h>
 #include <stdint.h>
+#include "sort_harness.h"
+
+// Subarrays of at most this many elements are insertion-sorted instead of split further;
+// 1 recurses down to single elements. Tuned with `benchmark.py tune`
+#ifndef SORT_INSERTION_CUTOFF
+#define SORT_INSERTION_CUTOFF 1
+#endif
 
 long long comparison_count = 0;
 struct timespec start_time, end_time;
@@ -10,13 +18,13 @@ double get_elapsed_time(struct timespec start, struct timespec end) {
     return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
 }
 
-void merge(int arr[], int l, int m, int r) {
+void merge(element_t arr[], int l, int m, int r) {
     int i, j, k;
     int n1 = m - l + 1;
     int n2 = r - m;
     
-    int *L = (int*)malloc(n1 * sizeof(int));
-    int *R = (int*)malloc(n2 * sizeof(int));
+    element_t *L = (element_t*)malloc(n1 * sizeof(element_t));
+    element_t *R = (element_t*)malloc(n2 * sizeof(element_t));
     
     for (i = 0; i < n1; i++)
         L[i] = arr[l + i];
@@ -29,7 +37,7 @@ void merge(int arr[], int l, int m, int r) {
     
     while (i < n1 && j < n2) {
         comparison_count++;
-        if (L[i] <= R[j]) {
+        if (KEY(L[i]) <= KEY(R[j])) {
             arr[k] = L[i];
             i++;
         } else {
@@ -55,7 +63,27 @@ void merge(int arr[], int l, int m, int r) {
     free(R);
 }
 
-void mergeSort(int arr[], int l, int r) {
+// Insertion sort of arr[l..r], for the subarrays below SORT_INSERTION_CUTOFF
+void insertionSortRange(element_t arr[], int l, int r) {
+    for (int i = l + 1; i <= r; i++) {
+        element_t key = arr[i];
+        int j = i - 1;
+        while (j >= l) {
+            comparison_count++;
+            if (KEY(arr[j]) <= KEY(key))
+                break;
+            arr[j + 1] = arr[j];
+            j--;
+        }
+        arr[j + 1] = key;
+    }
+}
+
+void mergeSort(element_t arr[], int l, int r) {
+    if (r - l + 1 <= SORT_INSERTION_CUTOFF) {
+        insertionSortRange(arr, l, r);
+        return;
+    }
     if (l < r) {
         int m = l + (r - l) / 2;
         
@@ -66,34 +94,49 @@ void mergeSort(int arr[], int l, int r) {
     }
 }
 
-void printArray(int arr[], int size) {
+void printArray(element_t arr[], int size) {
     int i;
     for (i = 0; i < size; i++)
-        printf("%d ", arr[i]);
+        print_element(arr[i]);
     printf("\n");
 }
 
-int main() {
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    mergeSort(arr, 0, n - 1);
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
     int n;
     scanf("%d", &n); // Read the number of elements
-    int *arr = (int *)malloc(n * sizeof(int));
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
     if (arr == NULL) {
         return 1; // Error handling for malloc
     }
 
     for (int i = 0; i < n; i++) {
-        scanf("%d", &arr[i]); // Read elements into the array
+        read_element(&arr[i]); // Read elements into the array
     }
     
+    reset_allocation_stats();
+    start_counters();
     clock_gettime(CLOCK_MONOTONIC, &start_time);
     mergeSort(arr, 0, n - 1);
     clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
     
     double elapsed = get_elapsed_time(start_time, end_time);
     
     // Print timing and comparison count to stderr
     fprintf(stderr, "TIME: %.9f\n", elapsed);
     fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
     
     // Optionally print the sorted array, but for benchmarking, we might skip this
     // for (int i = 0; i < n; i++) {
@@ -104,3 +147,4 @@ int main() {
     free(arr); // Free dynamically allocated memory
     return 0;
 }
+#endif
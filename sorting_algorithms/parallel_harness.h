@@ -0,0 +1,38 @@
+#ifndef PARALLEL_HARNESS_H
+#define PARALLEL_HARNESS_H
+
+#include <pthread.h>
+#include <stdlib.h>
+#include <string.h>
+
+// Thread support of the parallel programs (build with -pthread). The number of threads
+// a sort may use is given as `--threads N` on the command line (also after `--server`),
+// or, for the shared library, by setting the exported sort_threads before benchmarkSort.
+int sort_threads = 1;
+
+// The sequential code recurses deeply on large inputs, so worker threads get the same
+// large stack the benchmark gives the main thread
+#define SORT_THREAD_STACK_BYTES (256L * 1024 * 1024)
+
+// Reads `--threads N` from the arguments, leaving sort_threads at 1 if absent or invalid
+static void parse_thread_option(int argc, char *argv[]) {
+    for (int i = 1; i + 1 < argc; i++) {
+        if (strcmp(argv[i], "--threads") == 0) {
+            int threads = atoi(argv[i + 1]);
+            sort_threads = threads > 0 ? threads : 1;
+        }
+    }
+}
+
+// Starts fn(arg) on a new thread. Returns 0 on success; on failure the caller runs fn itself.
+static int start_sort_thread(pthread_t *thread, void *(*fn)(void *), void *arg) {
+    pthread_attr_t attr;
+    if (pthread_attr_init(&attr) != 0)
+        return -1;
+    pthread_attr_setstacksize(&attr, SORT_THREAD_STACK_BYTES);
+    int result = pthread_create(thread, &attr, fn, arg);
+    pthread_attr_destroy(&attr);
+    return result;
+}
+
+#endif
@@ -0,0 +1,159 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+#include <string.h>
+#include <stdint.h>
+#include "parallel_harness.h"
+#include "sort_harness.h"
+
+long long comparison_count = 0;
+struct timespec start_time, end_time;
+
+// Subarrays smaller than this are sorted on the current thread
+#define PARALLEL_CUTOFF 8192
+
+double get_elapsed_time(struct timespec start, struct timespec end) {
+    return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+}
+
+// Each thread counts its comparisons in its own counter; they are added up after the joins
+void merge(element_t arr[], int l, int m, int r, long long *comparisons) {
+    int i, j, k;
+    int n1 = m - l + 1;
+    int n2 = r - m;
+    
+    element_t *L = (element_t*)malloc(n1 * sizeof(element_t));
+    element_t *R = (element_t*)malloc(n2 * sizeof(element_t));
+    
+    for (i = 0; i < n1; i++)
+        L[i] = arr[l + i];
+    for (j = 0; j < n2; j++)
+        R[j] = arr[m + 1 + j];
+    
+    i = 0;
+    j = 0;
+    k = l;
+    
+    while (i < n1 && j < n2) {
+        (*comparisons)++;
+        if (KEY(L[i]) <= KEY(R[j])) {
+            arr[k] = L[i];
+            i++;
+        } else {
+            arr[k] = R[j];
+            j++;
+        }
+        k++;
+    }
+    
+    while (i < n1) {
+        arr[k] = L[i];
+        i++;
+        k++;
+    }
+    
+    while (j < n2) {
+        arr[k] = R[j];
+        j++;
+        k++;
+    }
+    
+    free(L);
+    free(R);
+}
+
+void mergeSort(element_t arr[], int l, int r, long long *comparisons) {
+    if (l < r) {
+        int m = l + (r - l) / 2;
+        
+        mergeSort(arr, l, m, comparisons);
+        mergeSort(arr, m + 1, r, comparisons);
+        
+        merge(arr, l, m, r, comparisons);
+    }
+}
+
+// Sorts arr[l..r] with up to `threads` threads
+typedef struct {
+    element_t *arr;
+    int l, r;
+    int threads;
+    long long comparisons;
+} merge_sort_task;
+
+// Splits the threads between the two halves: the left half runs on a new thread while
+// the current one sorts the right half, then the halves are merged on the current thread
+void *parallelMergeSort(void *arg) {
+    merge_sort_task *task = (merge_sort_task *)arg;
+    if (task->threads <= 1 || task->r - task->l < PARALLEL_CUTOFF) {
+        mergeSort(task->arr, task->l, task->r, &task->comparisons);
+        return NULL;
+    }
+
+    int m = task->l + (task->r - task->l) / 2;
+    merge_sort_task left = {task->arr, task->l, m, task->threads / 2, 0};
+    merge_sort_task right = {task->arr, m + 1, task->r, task->threads - task->threads / 2, 0};
+    pthread_t thread;
+    int spawned = start_sort_thread(&thread, parallelMergeSort, &left) == 0;
+    if (!spawned)
+        parallelMergeSort(&left);
+    parallelMergeSort(&right);
+    if (spawned)
+        pthread_join(thread, NULL);
+
+    task->comparisons += left.comparisons + right.comparisons;
+    merge(task->arr, task->l, m, task->r, &task->comparisons);
+    return NULL;
+}
+
+void printArray(element_t arr[], int size) {
+    int i;
+    for (i = 0; i < size; i++)
+        print_element(arr[i]);
+    printf("\n");
+}
+
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    merge_sort_task task = {arr, 0, n - 1, sort_threads, 0};
+    parallelMergeSort(&task);
+    comparison_count += task.comparisons;
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    parse_thread_option(argc, argv);
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
+    int n;
+    scanf("%d", &n); // Read the number of elements
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
+    if (arr == NULL) {
+        return 1; // Error handling for malloc
+    }
+
+    for (int i = 0; i < n; i++) {
+        read_element(&arr[i]); // Read elements into the array
+    }
+    
+    reset_allocation_stats();
+    start_counters();
+    clock_gettime(CLOCK_MONOTONIC, &start_time);
+    sortArray(arr, n);
+    clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
+    
+    double elapsed = get_elapsed_time(start_time, end_time);
+    
+    // Print timing and comparison count to stderr
+    fprintf(stderr, "TIME: %.9f\n", elapsed);
+    fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
+    
+    free(arr); // Free dynamically allocated memory
+    return 0;
+}
+#endif
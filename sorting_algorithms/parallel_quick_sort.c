@@ -0,0 +1,154 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+#include <string.h>
+#include <stdint.h>
+#include "parallel_harness.h"
+#include "sort_harness.h"
+
+long long comparison_count = 0;
+struct timespec start_time, end_time;
+
+// Partitions smaller than this are sorted on the current thread
+#define PARALLEL_CUTOFF 8192
+
+double get_elapsed_time(struct timespec start, struct timespec end) {
+    return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+}
+
+void swap(element_t* a, element_t* b) {
+    element_t temp = *a;
+    *a = *b;
+    *b = temp;
+}
+
+// Each thread counts its comparisons in its own counter; they are added up after the joins
+int medianOfThree(element_t arr[], int low, int high, long long *comparisons) {
+    int mid = low + (high - low) / 2;
+    
+    // Sort arr[low], arr[mid], arr[high] to find the median
+    (*comparisons)++;
+    if (KEY(arr[low]) > KEY(arr[mid])) swap(&arr[low], &arr[mid]);
+    (*comparisons)++;
+    if (KEY(arr[low]) > KEY(arr[high])) swap(&arr[low], &arr[high]);
+    (*comparisons)++;
+    if (KEY(arr[mid]) > KEY(arr[high])) swap(&arr[mid], &arr[high]);
+    
+    return mid; // arr[mid] is now the median
+}
+
+// Partition function (pivot is the last element)
+int partition(element_t arr[], int low, int high, long long *comparisons) {
+    element_t pivot = arr[high];
+    int i = (low - 1);
+    int j;
+    
+    for (j = low; j <= high - 1; j++) {
+        (*comparisons)++;
+        if (KEY(arr[j]) < KEY(pivot)) {
+            i++;
+            swap(&arr[i], &arr[j]);
+        }
+    }
+    swap(&arr[i + 1], &arr[high]);
+    return (i + 1);
+}
+
+// Moves the median of three to the end and partitions around it
+int partitionMedianOfThree(element_t arr[], int low, int high, long long *comparisons) {
+    int median_index = medianOfThree(arr, low, high, comparisons);
+    swap(&arr[median_index], &arr[high]);
+    return partition(arr, low, high, comparisons);
+}
+
+void quickSortMedianOfThreePivot(element_t arr[], int low, int high, long long *comparisons) {
+    if (low < high) {
+        int pi = partitionMedianOfThree(arr, low, high, comparisons);
+        quickSortMedianOfThreePivot(arr, low, pi - 1, comparisons);
+        quickSortMedianOfThreePivot(arr, pi + 1, high, comparisons);
+    }
+}
+
+// Sorts arr[low..high] with up to `threads` threads
+typedef struct {
+    element_t *arr;
+    int low, high;
+    int threads;
+    long long comparisons;
+} quick_sort_task;
+
+// Partitions on the current thread, then sorts the left partition on a new thread while
+// the current one sorts the right partition, splitting the threads between them
+void *parallelQuickSort(void *arg) {
+    quick_sort_task *task = (quick_sort_task *)arg;
+    if (task->threads <= 1 || task->high - task->low < PARALLEL_CUTOFF) {
+        quickSortMedianOfThreePivot(task->arr, task->low, task->high, &task->comparisons);
+        return NULL;
+    }
+
+    int pi = partitionMedianOfThree(task->arr, task->low, task->high, &task->comparisons);
+    quick_sort_task left = {task->arr, task->low, pi - 1, task->threads / 2, 0};
+    quick_sort_task right = {task->arr, pi + 1, task->high, task->threads - task->threads / 2, 0};
+    pthread_t thread;
+    int spawned = start_sort_thread(&thread, parallelQuickSort, &left) == 0;
+    if (!spawned)
+        parallelQuickSort(&left);
+    parallelQuickSort(&right);
+    if (spawned)
+        pthread_join(thread, NULL);
+
+    task->comparisons += left.comparisons + right.comparisons;
+    return NULL;
+}
+
+void printArray(element_t arr[], int size) {
+    int i;
+    for (i = 0; i < size; i++)
+        print_element(arr[i]);
+    printf("\n");
+}
+
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    quick_sort_task task = {arr, 0, n - 1, sort_threads, 0};
+    parallelQuickSort(&task);
+    comparison_count += task.comparisons;
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    parse_thread_option(argc, argv);
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
+    int n;
+    scanf("%d", &n); // Read the number of elements
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
+    if (arr == NULL) {
+        return 1; // Error handling for malloc
+    }
+
+    for (int i = 0; i < n; i++) {
+        read_element(&arr[i]); // Read elements into the array
+    }
+    
+    reset_allocation_stats();
+    start_counters();
+    clock_gettime(CLOCK_MONOTONIC, &start_time);
+    sortArray(arr, n);
+    clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
+    
+    double elapsed = get_elapsed_time(start_time, end_time);
+    
+    // Print timing and comparison count to stderr
+    fprintf(stderr, "TIME: %.9f\n", elapsed);
+    fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
+    
+    free(arr); // Free dynamically allocated memory
+    return 0;
+}
+#endif
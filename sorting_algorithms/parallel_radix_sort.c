@@ -0,0 +1,190 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+#include <string.h>
+#include <stdint.h>
+#include "parallel_harness.h"
+#include "sort_harness.h"
+
+#ifdef SORT_ELEMENT_FLOAT64
+#error "radix sort needs integer keys"
+#endif
+
+long long comparison_count = 0;
+struct timespec start_time, end_time;
+
+// Below this many elements per thread the sort runs on a single thread
+#define PARALLEL_CUTOFF 8192
+
+double get_elapsed_time(struct timespec start, struct timespec end) {
+    return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+}
+
+// One thread's contiguous share of the array, arr[begin..end), and its part of each pass
+typedef struct {
+    element_t *arr;
+    element_t *output;
+    int begin, end;
+    sort_key_t exp;
+    sort_key_t max;
+    long long comparisons;
+    int count[10];   // Digit histogram of the chunk
+    int offset[10];  // Where the chunk's elements with each digit go in output
+} radix_chunk;
+
+// Runs fn on every chunk, chunk 0 on the current thread and the others on new threads
+void runChunks(void *(*fn)(void *), radix_chunk chunks[], int threads) {
+    pthread_t *workers = (pthread_t *)malloc(threads * sizeof(pthread_t));
+    int *spawned = (int *)calloc(threads, sizeof(int));
+    int t;
+    for (t = 1; t < threads; t++) {
+        spawned[t] = start_sort_thread(&workers[t], fn, &chunks[t]) == 0;
+        if (!spawned[t])
+            fn(&chunks[t]);
+    }
+    fn(&chunks[0]);
+    for (t = 1; t < threads; t++) {
+        if (spawned[t])
+            pthread_join(workers[t], NULL);
+    }
+    free(spawned);
+    free(workers);
+}
+
+void *chunkMax(void *arg) {
+    radix_chunk *chunk = (radix_chunk *)arg;
+    sort_key_t max = KEY(chunk->arr[chunk->begin]);
+    int i;
+    for (i = chunk->begin + 1; i < chunk->end; i++) {
+        chunk->comparisons++;
+        if (KEY(chunk->arr[i]) > max)
+            max = KEY(chunk->arr[i]);
+    }
+    chunk->max = max;
+    return NULL;
+}
+
+void *chunkCount(void *arg) {
+    radix_chunk *chunk = (radix_chunk *)arg;
+    int i;
+    memset(chunk->count, 0, sizeof(chunk->count));
+    for (i = chunk->begin; i < chunk->end; i++)
+        chunk->count[(KEY(chunk->arr[i]) / chunk->exp) % 10]++;
+    return NULL;
+}
+
+// Chunks scatter front to back into disjoint output ranges, which keeps every pass stable
+void *chunkScatter(void *arg) {
+    radix_chunk *chunk = (radix_chunk *)arg;
+    int i;
+    for (i = chunk->begin; i < chunk->end; i++)
+        chunk->output[chunk->offset[(KEY(chunk->arr[i]) / chunk->exp) % 10]++] = chunk->arr[i];
+    return NULL;
+}
+
+void *chunkCopyBack(void *arg) {
+    radix_chunk *chunk = (radix_chunk *)arg;
+    memcpy(chunk->arr + chunk->begin, chunk->output + chunk->begin, (chunk->end - chunk->begin) * sizeof(element_t));
+    return NULL;
+}
+
+// LSD radix sort in base 10, like radix_sort.c, with every pass split over the threads:
+// each chunk builds its digit histogram, the histograms give every (chunk, digit) its
+// output position, and the chunks scatter in parallel
+void parallelRadixSort(element_t arr[], int n, int threads) {
+    if (n <= 0)
+        return;
+    if (threads > n / PARALLEL_CUTOFF)
+        threads = n / PARALLEL_CUTOFF > 1 ? n / PARALLEL_CUTOFF : 1;
+
+    element_t *output = (element_t *)malloc(n * sizeof(element_t));
+    radix_chunk *chunks = (radix_chunk *)calloc(threads, sizeof(radix_chunk));
+    int t, d;
+    for (t = 0; t < threads; t++) {
+        chunks[t].arr = arr;
+        chunks[t].output = output;
+        chunks[t].begin = (int)((long long)n * t / threads);
+        chunks[t].end = (int)((long long)n * (t + 1) / threads);
+    }
+
+    runChunks(chunkMax, chunks, threads);
+    sort_key_t max = chunks[0].max;
+    comparison_count += chunks[0].comparisons;
+    for (t = 1; t < threads; t++) {
+        comparison_count += chunks[t].comparisons + 1;
+        if (chunks[t].max > max)
+            max = chunks[t].max;
+    }
+
+    sort_key_t exp;
+    for (exp = 1; max / exp > 0; exp *= 10) {
+        for (t = 0; t < threads; t++)
+            chunks[t].exp = exp;
+        runChunks(chunkCount, chunks, threads);
+
+        int position = 0;
+        for (d = 0; d < 10; d++) {
+            for (t = 0; t < threads; t++) {
+                chunks[t].offset[d] = position;
+                position += chunks[t].count[d];
+            }
+        }
+        runChunks(chunkScatter, chunks, threads);
+        runChunks(chunkCopyBack, chunks, threads);
+        if (exp > max / 10)
+            break; // The next exp would overflow for a max close to the key type's maximum
+    }
+
+    free(chunks);
+    free(output);
+}
+
+void printArray(element_t arr[], int size) {
+    int i;
+    for (i = 0; i < size; i++)
+        print_element(arr[i]);
+    printf("\n");
+}
+
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    parallelRadixSort(arr, n, sort_threads);
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    parse_thread_option(argc, argv);
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
+    int n;
+    scanf("%d", &n); // Read the number of elements
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
+    if (arr == NULL) {
+        return 1; // Error handling for malloc
+    }
+
+    for (int i = 0; i < n; i++) {
+        read_element(&arr[i]); // Read elements into the array
+    }
+    
+    reset_allocation_stats();
+    start_counters();
+    clock_gettime(CLOCK_MONOTONIC, &start_time);
+    sortArray(arr, n);
+    clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
+    
+    double elapsed = get_elapsed_time(start_time, end_time);
+    
+    // Print timing and comparison count to stderr
+    fprintf(stderr, "TIME: %.9f\n", elapsed);
+    fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
+    
+    free(arr); // Free dynamically allocated memory
+    return 0;
+}
+#endif
@@ -1,7 +1,9 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <time.h>
+#include <string.h>
 #include <stdint.h>
+#include "sort_harness.h"
 
 long long comparison_count = 0;
 struct timespec start_time, end_time;
@@ -10,36 +12,36 @@ double get_elapsed_time(struct timespec start, struct timespec end) {
     return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
 }
 
-void swap(int* a, int* b) {
-    int temp = *a;
+void swap(element_t* a, element_t* b) {
+    element_t temp = *a;
     *a = *b;
     *b = temp;
 }
 
 // Function to find the median of three elements
-int medianOfThree(int arr[], int low, int high) {
+int medianOfThree(element_t arr[], int low, int high) {
     int mid = low + (high - low) / 2;
     
     // Sort arr[low], arr[mid], arr[high] to find the median
     comparison_count++;
-    if (arr[low] > arr[mid]) swap(&arr[low], &arr[mid]);
+    if (KEY(arr[low]) > KEY(arr[mid])) swap(&arr[low], &arr[mid]);
     comparison_count++;
-    if (arr[low] > arr[high]) swap(&arr[low], &arr[high]);
+    if (KEY(arr[low]) > KEY(arr[high])) swap(&arr[low], &arr[high]);
     comparison_count++;
-    if (arr[mid] > arr[high]) swap(&arr[mid], &arr[high]);
+    if (KEY(arr[mid]) > KEY(arr[high])) swap(&arr[mid], &arr[high]);
     
     return mid; // arr[mid] is now the median
 }
 
 // Partition function (pivot is the last element)
-int partition(int arr[], int low, int high) {
-    int pivot = arr[high]; // Pivot is now the element that was moved to high
+int partition(element_t arr[], int low, int high) {
+    element_t pivot = arr[high]; // Pivot is now the element that was moved to high
     int i = (low - 1);
     int j;
     
     for (j = low; j <= high - 1; j++) {
         comparison_count++;
-        if (arr[j] < pivot) {
+        if (KEY(arr[j]) < KEY(pivot)) {
             i++;
             swap(&arr[i], &arr[j]);
         }
@@ -49,7 +51,7 @@ int partition(int arr[], int low, int high) {
 }
 
 // Quick Sort with median-of-three pivot
-void quickSortMedianOfThreePivot(int arr[], int low, int high) {
+void quickSortMedianOfThreePivot(element_t arr[], int low, int high) {
     if (low < high) {
         // Find the median of arr[low], arr[mid], arr[high]
         int median_index = medianOfThree(arr, low, high);
@@ -64,34 +66,49 @@ void quickSortMedianOfThreePivot(int arr[], int low, int high) {
     }
 }
 
-void printArray(int arr[], int size) {
+void printArray(element_t arr[], int size) {
     int i;
     for (i = 0; i < size; i++)
-        printf("%d ", arr[i]);
+        print_element(arr[i]);
     printf("\n");
 }
 
-int main() {
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    quickSortMedianOfThreePivot(arr, 0, n - 1);
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
     int n;
     scanf("%d", &n); // Read the number of elements
-    int *arr = (int *)malloc(n * sizeof(int));
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
     if (arr == NULL) {
         return 1; // Error handling for malloc
     }
 
     for (int i = 0; i < n; i++) {
-        scanf("%d", &arr[i]); // Read elements into the array
+        read_element(&arr[i]); // Read elements into the array
     }
     
+    reset_allocation_stats();
+    start_counters();
     clock_gettime(CLOCK_MONOTONIC, &start_time);
     quickSortMedianOfThreePivot(arr, 0, n - 1);
     clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
     
     double elapsed = get_elapsed_time(start_time, end_time);
     
     // Print timing and comparison count to stderr
     fprintf(stderr, "TIME: %.9f\n", elapsed);
     fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
     
     // Optionally print the sorted array, but for benchmarking, we might skip this
     // for (int i = 0; i < n; i++) {
@@ -101,4 +118,5 @@ int main() {
     
     free(arr); // Free dynamically allocated memory
     return 0;
-}
\ No newline at end of file
+}
+#endif
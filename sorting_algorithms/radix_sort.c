@@ -1,7 +1,18 @@
 #include <stdio.h>
 #include <stdlib.h>
 #include <time.h>
+#include <string.h>
 #include <stdint.h>
+#include "sort_harness.h"
+
+#ifdef SORT_ELEMENT_FLOAT64
+#error "radix sort needs integer keys"
+#endif
+
+// Digit base of each counting pass. Tuned with `benchmark.py tune`
+#ifndef SORT_RADIX_BASE
+#define SORT_RADIX_BASE 10
+#endif
 
 long long comparison_count = 0;
 struct timespec start_time, end_time;
@@ -10,30 +21,30 @@ double get_elapsed_time(struct timespec start, struct timespec end) {
     return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
 }
 
-int getMax(int arr[], int n) {
-    int max = arr[0];
+sort_key_t getMax(element_t arr[], int n) {
+    sort_key_t max = KEY(arr[0]);
     int i;
     for (i = 1; i < n; i++) {
         comparison_count++;
-        if (arr[i] > max)
-            max = arr[i];
+        if (KEY(arr[i]) > max)
+            max = KEY(arr[i]);
     }
     return max;
 }
 
-void countingSortForRadix(int arr[], int n, int exp) {
-    int *output = (int*)malloc(n * sizeof(int));
-    int i, count[10] = {0};
+void countingSortForRadix(element_t arr[], int n, sort_key_t exp) {
+    element_t *output = (element_t*)malloc(n * sizeof(element_t));
+    int i, count[SORT_RADIX_BASE] = {0};
     
     for (i = 0; i < n; i++)
-        count[(arr[i] / exp) % 10]++;
+        count[(KEY(arr[i]) / exp) % SORT_RADIX_BASE]++;
     
-    for (i = 1; i < 10; i++)
+    for (i = 1; i < SORT_RADIX_BASE; i++)
         count[i] += count[i - 1];
     
     for (i = n - 1; i >= 0; i--) {
-        output[count[(arr[i] / exp) % 10] - 1] = arr[i];
-        count[(arr[i] / exp) % 10]--;
+        output[count[(KEY(arr[i]) / exp) % SORT_RADIX_BASE] - 1] = arr[i];
+        count[(KEY(arr[i]) / exp) % SORT_RADIX_BASE]--;
     }
     
     for (i = 0; i < n; i++)
@@ -42,42 +53,60 @@ void countingSortForRadix(int arr[], int n, int exp) {
     free(output);
 }
 
-void radixSort(int arr[], int n) {
-    int max = getMax(arr, n);
-    int exp;
+void radixSort(element_t arr[], int n) {
+    sort_key_t max = getMax(arr, n);
+    sort_key_t exp;
     
-    for (exp = 1; max / exp > 0; exp *= 10)
+    for (exp = 1; max / exp > 0; exp *= SORT_RADIX_BASE) {
         countingSortForRadix(arr, n, exp);
+        if (exp > max / SORT_RADIX_BASE)
+            break; // The next exp would overflow for a max close to the key type's maximum
+    }
 }
 
-void printArray(int arr[], int size) {
+void printArray(element_t arr[], int size) {
     int i;
     for (i = 0; i < size; i++)
-        printf("%d ", arr[i]);
+        print_element(arr[i]);
     printf("\n");
 }
 
-int main() {
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    radixSort(arr, n);
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
     int n;
     scanf("%d", &n); // Read the number of elements
-    int *arr = (int *)malloc(n * sizeof(int));
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
     if (arr == NULL) {
         return 1; // Error handling for malloc
     }
 
     for (int i = 0; i < n; i++) {
-        scanf("%d", &arr[i]); // Read elements into the array
+        read_element(&arr[i]); // Read elements into the array
     }
     
+    reset_allocation_stats();
+    start_counters();
     clock_gettime(CLOCK_MONOTONIC, &start_time);
     radixSort(arr, n);
     clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
     
     double elapsed = get_elapsed_time(start_time, end_time);
     
     // Print timing and comparison count to stderr
     fprintf(stderr, "TIME: %.9f\n", elapsed);
     fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
     
     // Optionally print the sorted array, but for benchmarking, we might skip this
     // for (int i = 0; i < n; i++) {
@@ -88,3 +117,4 @@ int main() {
     free(arr); // Free dynamically allocated memory
     return 0;
 }
+#endif
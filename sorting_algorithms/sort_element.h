@@ -0,0 +1,35 @@
+#ifndef SORT_ELEMENT_H
+#define SORT_ELEMENT_H
+
+// Included by sort_harness.h and by kway_merge.c, the merge phase of `benchmark.py external`.
+// Element type of the arrays, chosen at compile time (benchmark.py builds one executable per
+// element type, see element_types.py). The algorithms compare KEY(element) and move whole elements.
+//   default                   int32
+//   -DSORT_ELEMENT_INT64      int64
+//   -DSORT_ELEMENT_FLOAT64    double
+//   -DSORT_RECORD_PAYLOAD=N   an int64 key followed by N payload bytes (N a multiple of 8)
+#if defined(SORT_RECORD_PAYLOAD)
+typedef long long sort_key_t;
+typedef struct {
+    sort_key_t key;
+    unsigned char payload[SORT_RECORD_PAYLOAD];
+} element_t;
+#define KEY(element) ((element).key)
+#elif defined(SORT_ELEMENT_INT64)
+typedef long long sort_key_t;
+typedef sort_key_t element_t;
+#define KEY(element) (element)
+#elif defined(SORT_ELEMENT_FLOAT64)
+typedef double sort_key_t;
+typedef sort_key_t element_t;
+#define KEY(element) (element)
+#else
+typedef int sort_key_t;
+typedef sort_key_t element_t;
+#define KEY(element) (element)
+#endif
+
+// Size of one element, so benchmark.py can check that its buffers have the same layout
+int sort_element_bytes = (int)sizeof(element_t);
+
+#endif
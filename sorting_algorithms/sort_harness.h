@@ -0,0 +1,362 @@
+#ifndef SORT_HARNESS_H
+#define SORT_HARNESS_H
+
+#include <stdio.h>
+#include <stdlib.h>
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+#include <time.h>
+
+#ifdef _WIN32
+#include <io.h>
+#include <fcntl.h>
+#else
+#include <sys/resource.h>
+#endif
+
+#ifdef __linux__
+#include <linux/perf_event.h>
+#include <sys/ioctl.h>
+#include <sys/syscall.h>
+#include <unistd.h>
+#endif
+
+#include "sort_element.h"
+
+// Reads one element of the text input. A record's payload is not part of the input:
+// every payload byte is set to the low byte of the key. Returns 1 on success.
+static int read_element(element_t *element) {
+#if defined(SORT_RECORD_PAYLOAD)
+    if (scanf("%lld", &element->key) != 1)
+        return 0;
+    memset(element->payload, (int)(element->key & 0xFF), sizeof(element->payload));
+    return 1;
+#elif defined(SORT_ELEMENT_INT64)
+    return scanf("%lld", element) == 1;
+#elif defined(SORT_ELEMENT_FLOAT64)
+    return scanf("%lf", element) == 1;
+#else
+    return scanf("%d", element) == 1;
+#endif
+}
+
+// Prints an element's key followed by a space
+static void print_element(element_t element) {
+#if defined(SORT_ELEMENT_FLOAT64)
+    printf("%.17g ", KEY(element));
+#elif defined(SORT_RECORD_PAYLOAD) || defined(SORT_ELEMENT_INT64)
+    printf("%lld ", (long long)KEY(element));
+#else
+    printf("%d ", KEY(element));
+#endif
+}
+
+// Shared by every sorting program; each one defines these itself
+extern long long comparison_count;
+double get_elapsed_time(struct timespec start, struct timespec end);
+void sortArray(element_t arr[], int n);
+
+// Heap usage of the sorting code, counted only in builds with -DSORT_COUNT_ALLOCATIONS
+// (benchmark.py builds them for a separate memory pass). Every malloc/calloc/realloc/free
+// after this header then goes through the counting wrappers below (see the macros at the end
+// of the file), whose bookkeeping would otherwise slow down the timed sorts. In the parallel
+// programs (built with -pthread, which defines _REENTRANT) the counters are updated atomically,
+// so they can allocate from several threads. Without counting they stay at -1, "not available".
+#ifdef SORT_COUNT_ALLOCATIONS
+long long allocation_count = 0;  // Number of successful allocations
+long long allocated_bytes = 0;   // Total bytes requested
+long long live_heap_bytes = 0;   // Bytes currently allocated
+long long peak_heap_bytes = 0;   // Highest live_heap_bytes since the last reset
+
+// Each counted block is prefixed with its size so free() can update live_heap_bytes
+typedef union {
+    size_t size;
+    max_align_t align;
+} allocation_header;
+
+#ifdef _REENTRANT
+static void record_allocation(size_t size) {
+    __atomic_add_fetch(&allocation_count, 1, __ATOMIC_RELAXED);
+    __atomic_add_fetch(&allocated_bytes, (long long)size, __ATOMIC_RELAXED);
+    long long live = __atomic_add_fetch(&live_heap_bytes, (long long)size, __ATOMIC_RELAXED);
+    long long peak = __atomic_load_n(&peak_heap_bytes, __ATOMIC_RELAXED);
+    while (live > peak && !__atomic_compare_exchange_n(&peak_heap_bytes, &peak, live, 1,
+                                                        __ATOMIC_RELAXED, __ATOMIC_RELAXED))
+        ; // peak now holds the current value; retry while ours is still higher
+}
+
+static void record_release(size_t size) {
+    __atomic_sub_fetch(&live_heap_bytes, (long long)size, __ATOMIC_RELAXED);
+}
+#else
+static void record_allocation(size_t size) {
+    allocation_count++;
+    allocated_bytes += (long long)size;
+    live_heap_bytes += (long long)size;
+    if (live_heap_bytes > peak_heap_bytes)
+        peak_heap_bytes = live_heap_bytes;
+}
+
+static void record_release(size_t size) {
+    live_heap_bytes -= (long long)size;
+}
+#endif
+
+static void *counted_malloc(size_t size) {
+    allocation_header *header = (allocation_header *)malloc(sizeof(allocation_header) + size);
+    if (header == NULL)
+        return NULL;
+    header->size = size;
+    record_allocation(size);
+    return header + 1;
+}
+
+static void *counted_calloc(size_t count, size_t size) {
+    void *ptr = counted_malloc(count * size);
+    if (ptr != NULL)
+        memset(ptr, 0, count * size);
+    return ptr;
+}
+
+static void counted_free(void *ptr) {
+    if (ptr == NULL)
+        return;
+    allocation_header *header = (allocation_header *)ptr - 1;
+    record_release(header->size);
+    free(header);
+}
+
+static void *counted_realloc(void *ptr, size_t size) {
+    if (ptr == NULL)
+        return counted_malloc(size);
+    allocation_header *header = (allocation_header *)ptr - 1;
+    size_t old_size = header->size;
+    allocation_header *grown = (allocation_header *)realloc(header, sizeof(allocation_header) + size);
+    if (grown == NULL)
+        return NULL;
+    grown->size = size;
+    record_release(old_size);
+    record_allocation(size);
+    return grown + 1;
+}
+
+static void reset_allocation_stats(void) {
+    allocation_count = 0;
+    allocated_bytes = 0;
+    live_heap_bytes = 0;
+    peak_heap_bytes = 0;
+}
+#else
+long long allocation_count = -1;
+long long allocated_bytes = -1;
+long long live_heap_bytes = -1;
+long long peak_heap_bytes = -1;
+
+static void reset_allocation_stats(void) {
+}
+#endif
+
+// Resets the process's peak RSS where the OS allows it (Linux), so a long-lived
+// server reports the peak of each request rather than of its whole lifetime
+static void reset_peak_rss(void) {
+#ifdef __linux__
+    FILE *f = fopen("/proc/self/clear_refs", "w");
+    if (f != NULL) {
+        fputs("5", f);
+        fclose(f);
+    }
+#endif
+}
+
+// Peak resident set size of this process in KB, or -1 where it is not available
+static long long peak_rss_kb(void) {
+#if defined(__linux__)
+    char line[256];
+    long long kb = -1;
+    FILE *f = fopen("/proc/self/status", "r");
+    if (f == NULL)
+        return -1;
+    while (fgets(line, sizeof(line), f) != NULL) {
+        if (sscanf(line, "VmHWM: %lld kB", &kb) == 1)
+            break;
+    }
+    fclose(f);
+    return kb;
+#elif defined(_WIN32)
+    return -1;
+#else
+    struct rusage usage;
+    getrusage(RUSAGE_SELF, &usage);
+#ifdef __APPLE__
+    return usage.ru_maxrss / 1024; // Bytes on macOS
+#else
+    return usage.ru_maxrss;
+#endif
+#endif
+}
+
+// Writes the memory metrics in the same "NAME: value" format as TIME/COMPARISONS
+static void print_allocation_stats(FILE *out) {
+    fprintf(out, "PEAK_RSS_KB: %lld\n", peak_rss_kb());
+    fprintf(out, "ALLOCATIONS: %lld\n", allocation_count);
+    fprintf(out, "ALLOCATED_BYTES: %lld\n", allocated_bytes);
+    fprintf(out, "PEAK_HEAP_BYTES: %lld\n", peak_heap_bytes);
+}
+
+// Hardware performance counters around the sort, read through perf_event_open (Linux only).
+// They are only opened when the SORT_COUNTERS environment variable is set (benchmark.py --counters).
+// After a run, hardware_counters holds the counts in this order, or -1 for a counter the
+// CPU, kernel or perf_event_paranoid setting does not provide.
+#define HARDWARE_COUNTER_COUNT 5
+static const char *hardware_counter_names[HARDWARE_COUNTER_COUNT] = {
+    "INSTRUCTIONS", "CYCLES", "L1D_MISSES", "LLC_MISSES", "BRANCH_MISSES"
+};
+long long hardware_counters[HARDWARE_COUNTER_COUNT] = {-1, -1, -1, -1, -1};
+static int counters_enabled = -1; // -1 until SORT_COUNTERS has been checked
+static int counter_fds[HARDWARE_COUNTER_COUNT] = {-1, -1, -1, -1, -1};
+
+#ifdef __linux__
+static int open_counter(uint32_t type, uint64_t config) {
+    struct perf_event_attr attr;
+    memset(&attr, 0, sizeof(attr));
+    attr.size = sizeof(attr);
+    attr.type = type;
+    attr.config = config;
+    attr.disabled = 1;
+    attr.exclude_kernel = 1; // Allowed without privileges, and the sort runs in user space anyway
+    attr.exclude_hv = 1;
+    attr.inherit = 1; // Also count the threads of the parallel programs
+    return (int)syscall(SYS_perf_event_open, &attr, 0, -1, -1, 0);
+}
+#endif
+
+static void open_counters(void) {
+    const char *setting = getenv("SORT_COUNTERS");
+    counters_enabled = setting != NULL && setting[0] != '\0' && strcmp(setting, "0") != 0;
+#ifdef __linux__
+    if (!counters_enabled)
+        return;
+    counter_fds[0] = open_counter(PERF_TYPE_HARDWARE, PERF_COUNT_HW_INSTRUCTIONS);
+    counter_fds[1] = open_counter(PERF_TYPE_HARDWARE, PERF_COUNT_HW_CPU_CYCLES);
+    counter_fds[2] = open_counter(PERF_TYPE_HW_CACHE, PERF_COUNT_HW_CACHE_L1D |
+                                  (PERF_COUNT_HW_CACHE_OP_READ << 8) | (PERF_COUNT_HW_CACHE_RESULT_MISS << 16));
+    counter_fds[3] = open_counter(PERF_TYPE_HARDWARE, PERF_COUNT_HW_CACHE_MISSES);
+    counter_fds[4] = open_counter(PERF_TYPE_HARDWARE, PERF_COUNT_HW_BRANCH_MISSES);
+#endif
+}
+
+// Called right before the timed region
+static void start_counters(void) {
+    if (counters_enabled < 0)
+        open_counters();
+    for (int i = 0; i < HARDWARE_COUNTER_COUNT; i++) {
+        hardware_counters[i] = -1;
+#ifdef __linux__
+        if (counter_fds[i] >= 0) {
+            ioctl(counter_fds[i], PERF_EVENT_IOC_RESET, 0);
+            ioctl(counter_fds[i], PERF_EVENT_IOC_ENABLE, 0);
+        }
+#endif
+    }
+}
+
+// Called right after the timed region
+static void stop_counters(void) {
+#ifdef __linux__
+    for (int i = 0; i < HARDWARE_COUNTER_COUNT; i++) {
+        if (counter_fds[i] >= 0) {
+            ioctl(counter_fds[i], PERF_EVENT_IOC_DISABLE, 0);
+            if (read(counter_fds[i], &hardware_counters[i], sizeof(hardware_counters[i])) != sizeof(hardware_counters[i]))
+                hardware_counters[i] = -1;
+        }
+    }
+#endif
+}
+
+// Writes the counters as "NAME: value" lines, only when they were requested
+static void print_counters(FILE *out) {
+    if (counters_enabled <= 0)
+        return;
+    for (int i = 0; i < HARDWARE_COUNTER_COUNT; i++)
+        fprintf(out, "%s: %lld\n", hardware_counter_names[i], hardware_counters[i]);
+}
+
+#ifdef SORT_SHARED_LIBRARY
+// Built as a shared library (-shared -fPIC -DSORT_SHARED_LIBRARY) for benchmark.py --in-process:
+// sorts arr in place and returns the elapsed time; comparison_count and the allocation
+// and hardware counters above hold the rest of the metrics.
+double benchmarkSort(element_t arr[], int n) {
+    struct timespec start, end;
+
+    comparison_count = 0;
+    reset_allocation_stats();
+    start_counters();
+    clock_gettime(CLOCK_MONOTONIC, &start);
+    sortArray(arr, n);
+    clock_gettime(CLOCK_MONOTONIC, &end);
+    stop_counters();
+    return get_elapsed_time(start, end);
+}
+#else
+
+// Long-lived benchmark mode used by benchmark.py (`./program --server`).
+// Each request on stdin is a native int32 length followed by that many elements
+// (element_t, in native byte order). The array is sorted and the usual TIME/COMPARISONS lines, followed by
+// the memory metrics, the hardware counters (if enabled) and an END line, are written to stdout. A negative length or
+// end of input stops the server.
+static int run_sort_server(void (*sort_fn)(element_t arr[], int n)) {
+    int32_t n;
+    int32_t capacity = 0;
+    element_t *arr = NULL;
+    struct timespec start, end;
+
+#ifdef _WIN32
+    _setmode(_fileno(stdin), _O_BINARY);
+#endif
+
+    while (fread(&n, sizeof(n), 1, stdin) == 1 && n >= 0) {
+        if (n > capacity) {
+            element_t *grown = (element_t *)realloc(arr, n * sizeof(element_t));
+            if (grown == NULL) {
+                free(arr);
+                return 1; // Error handling for realloc
+            }
+            arr = grown;
+            capacity = n;
+        }
+        if (fread(arr, sizeof(element_t), n, stdin) != (size_t)n) {
+            break; // Truncated request
+        }
+
+        comparison_count = 0;
+        reset_allocation_stats();
+        reset_peak_rss();
+        start_counters();
+        clock_gettime(CLOCK_MONOTONIC, &start);
+        sort_fn(arr, n);
+        clock_gettime(CLOCK_MONOTONIC, &end);
+        stop_counters();
+
+        printf("TIME: %.9f\n", get_elapsed_time(start, end));
+        printf("COMPARISONS: %lld\n", comparison_count);
+        print_allocation_stats(stdout);
+        print_counters(stdout);
+        printf("END\n");
+        fflush(stdout);
+    }
+
+    free(arr);
+    return 0;
+}
+#endif
+
+#ifdef SORT_COUNT_ALLOCATIONS
+// From here on, the sorting code allocates through the counting wrappers
+#define malloc(size) counted_malloc(size)
+#define calloc(count, size) counted_calloc(count, size)
+#define realloc(ptr, size) counted_realloc(ptr, size)
+#define free(ptr) counted_free(ptr)
+#endif
+
+#endif
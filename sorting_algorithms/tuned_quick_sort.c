@@ -0,0 +1,161 @@
+#include <stdio.h>
+#include <stdlib.h>
+#include <time.h>
+#include <string.h>
+#include <stdint.h>
+#include "sort_harness.h"
+
+// Quicksort with the pivot strategy of the three quicksort variants and an insertion-sort
+// cutoff as compile-time parameters, searched by `benchmark.py tune`
+#define PIVOT_FIRST 0
+#define PIVOT_RANDOM 1
+#define PIVOT_MEDIAN_OF_THREE 2
+
+#ifndef SORT_PIVOT
+#define SORT_PIVOT PIVOT_MEDIAN_OF_THREE
+#endif
+// Subarrays of at most this many elements are insertion-sorted instead of partitioned;
+// 1 recurses down to single elements
+#ifndef SORT_INSERTION_CUTOFF
+#define SORT_INSERTION_CUTOFF 1
+#endif
+
+long long comparison_count = 0;
+struct timespec start_time, end_time;
+
+double get_elapsed_time(struct timespec start, struct timespec end) {
+    return (end.tv_sec - start.tv_sec) + (end.tv_nsec - start.tv_nsec) / 1e9;
+}
+
+void swap(element_t* a, element_t* b) {
+    element_t temp = *a;
+    *a = *b;
+    *b = temp;
+}
+
+// Function to find the median of three elements
+int medianOfThree(element_t arr[], int low, int high) {
+    int mid = low + (high - low) / 2;
+
+    // Sort arr[low], arr[mid], arr[high] to find the median
+    comparison_count++;
+    if (KEY(arr[low]) > KEY(arr[mid])) swap(&arr[low], &arr[mid]);
+    comparison_count++;
+    if (KEY(arr[low]) > KEY(arr[high])) swap(&arr[low], &arr[high]);
+    comparison_count++;
+    if (KEY(arr[mid]) > KEY(arr[high])) swap(&arr[mid], &arr[high]);
+
+    return mid; // arr[mid] is now the median
+}
+
+// Index of the pivot of arr[low..high] under SORT_PIVOT
+int choosePivot(element_t arr[], int low, int high) {
+#if SORT_PIVOT == PIVOT_FIRST
+    return low;
+#elif SORT_PIVOT == PIVOT_RANDOM
+    return low + rand() % (high - low + 1);
+#else
+    return medianOfThree(arr, low, high);
+#endif
+}
+
+// Partition function (pivot is the last element)
+int partition(element_t arr[], int low, int high) {
+    element_t pivot = arr[high]; // Pivot is now the element that was moved to high
+    int i = (low - 1);
+    int j;
+
+    for (j = low; j <= high - 1; j++) {
+        comparison_count++;
+        if (KEY(arr[j]) < KEY(pivot)) {
+            i++;
+            swap(&arr[i], &arr[j]);
+        }
+    }
+    swap(&arr[i + 1], &arr[high]);
+    return (i + 1);
+}
+
+// Insertion sort of arr[low..high], for the subarrays below SORT_INSERTION_CUTOFF
+void insertionSortRange(element_t arr[], int low, int high) {
+    for (int i = low + 1; i <= high; i++) {
+        element_t key = arr[i];
+        int j = i - 1;
+        while (j >= low) {
+            comparison_count++;
+            if (KEY(arr[j]) <= KEY(key))
+                break;
+            arr[j + 1] = arr[j];
+            j--;
+        }
+        arr[j + 1] = key;
+    }
+}
+
+void tunedQuickSort(element_t arr[], int low, int high) {
+    if (high - low + 1 <= SORT_INSERTION_CUTOFF) {
+        insertionSortRange(arr, low, high);
+        return;
+    }
+    if (low < high) {
+        // Swap the pivot with the last element to use the existing partition logic
+        swap(&arr[choosePivot(arr, low, high)], &arr[high]);
+
+        int pi = partition(arr, low, high);
+
+        tunedQuickSort(arr, low, pi - 1);
+        tunedQuickSort(arr, pi + 1, high);
+    }
+}
+
+void printArray(element_t arr[], int size) {
+    int i;
+    for (i = 0; i < size; i++)
+        print_element(arr[i]);
+    printf("\n");
+}
+
+// Entry point shared by the text and --server modes
+void sortArray(element_t arr[], int n) {
+    tunedQuickSort(arr, 0, n - 1);
+}
+
+#ifndef SORT_SHARED_LIBRARY
+int main(int argc, char *argv[]) {
+    // Seed the random pivots once for the entire program execution
+    srand(time(NULL));
+
+    if (argc > 1 && strcmp(argv[1], "--server") == 0) {
+        return run_sort_server(sortArray);
+    }
+
+    int n;
+    scanf("%d", &n); // Read the number of elements
+    element_t *arr = (element_t *)malloc(n * sizeof(element_t));
+    if (arr == NULL) {
+        return 1; // Error handling for malloc
+    }
+
+    for (int i = 0; i < n; i++) {
+        read_element(&arr[i]); // Read elements into the array
+    }
+
+    reset_allocation_stats();
+    start_counters();
+    clock_gettime(CLOCK_MONOTONIC, &start_time);
+    tunedQuickSort(arr, 0, n - 1);
+    clock_gettime(CLOCK_MONOTONIC, &end_time);
+    stop_counters();
+
+    double elapsed = get_elapsed_time(start_time, end_time);
+
+    // Print timing and comparison count to stderr
+    fprintf(stderr, "TIME: %.9f\n", elapsed);
+    fprintf(stderr, "COMPARISONS: %lld\n", comparison_count);
+    print_allocation_stats(stderr);
+    print_counters(stderr);
+
+    free(arr); // Free dynamically allocated memory
+    return 0;
+}
+#endif
@@ -0,0 +1,15 @@
+import importlib
+import os
+import sys
+
+import pytest
+
+# The tests import the repository's top-level modules (autotune, benchmark, ...)
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, REPO_ROOT)
+
+@pytest.fixture
+def benchmark(monkeypatch):
+    # benchmark.py discovers the algorithms relative to the working directory on import
+    monkeypatch.chdir(REPO_ROOT)
+    return importlib.import_module("benchmark")
@@ -0,0 +1,29 @@
+import time
+
+from autotune import MIN_REPETITIONS, successive_halving
+
+# Fake per-repetition times of each configuration: "c" is the fastest, "d" the slowest
+COSTS = {"a": 3.0, "b": 2.0, "c": 1.0, "d": 4.0}
+
+def fake_measure(calls):
+    def measure(config, repetitions):
+        calls.append((config, repetitions))
+        return [COSTS[config]] * repetitions
+    return measure
+
+def test_expired_deadline_still_ranks_every_candidate():
+    calls = []
+    ranked = successive_halving(list(COSTS), fake_measure(calls), deadline=time.monotonic() - 1)
+    assert [candidate.config for candidate in ranked] == ["c", "b", "a", "d"]
+    # Every candidate gets its first round, and nothing more once out of budget
+    assert sorted(calls) == [(config, MIN_REPETITIONS) for config in sorted(COSTS)]
+    assert all(len(candidate.times) == MIN_REPETITIONS for candidate in ranked)
+
+def test_halving_measures_the_survivors_further():
+    calls = []
+    ranked = successive_halving(list(COSTS), fake_measure(calls), deadline=time.monotonic() + 3600, rate=2)
+    assert [candidate.config for candidate in ranked] == ["c", "b", "a", "d"]
+    # 4 candidates, then the best 2 at twice the repetitions, then the best one alone
+    assert len(ranked[0].times) == 4 * MIN_REPETITIONS
+    assert len(ranked[1].times) == 2 * MIN_REPETITIONS
+    assert len(ranked[2].times) == len(ranked[3].times) == MIN_REPETITIONS
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+pd = pytest.importorskip("pandas")
+pytest.importorskip("scipy")
+
+def write_results(path, slowdown=0.0, slowed=()):
+    """A results CSV of a few cells with 10 repetitions each; the slowed cells take 1 + slowdown as long."""
+    rows = []
+    for algorithm in ("Merge Sort", "Heap Sort"):
+        for n in (1000, 10000):
+            mean = n * 1e-7 * (1 + slowdown if (algorithm, n) in slowed else 1)
+            rows.append({"Algorithm": algorithm, "Input Type": "Random", "Input Size (N)": n,
+                         "Average Time (s)": mean, "Median Time (s)": mean, "Stddev Time (s)": mean * 0.01,
+                         "Repetitions": 10})
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+def test_identical_results_pass(benchmark, tmp_path):
+    baseline = write_results(tmp_path / "baseline.csv")
+    candidate = write_results(tmp_path / "candidate.csv")
+    assert benchmark.compare_main([baseline, candidate]) == 0
+
+def test_slowdown_beyond_threshold_fails(benchmark, tmp_path, capsys):
+    baseline = write_results(tmp_path / "baseline.csv")
+    candidate = write_results(tmp_path / "candidate.csv", slowdown=2 * benchmark.COMPARE_THRESHOLD,
+                              slowed=[("Heap Sort", 10000)])
+    assert benchmark.compare_main([baseline, candidate]) == 1
+    assert "1 regression(s)" in capsys.readouterr().out
+
+def test_slowdown_within_threshold_passes(benchmark, tmp_path):
+    baseline = write_results(tmp_path / "baseline.csv")
+    candidate = write_results(tmp_path / "candidate.csv", slowdown=benchmark.COMPARE_THRESHOLD / 2,
+                              slowed=[("Heap Sort", 10000)])
+    assert benchmark.compare_main([baseline, candidate]) == 0
+
+def test_compare_cell_with_repetitions(benchmark):
+    def cell(samples):
+        samples = np.array(samples)
+        return {"samples": samples, "mean": samples.mean(), "median": float(np.median(samples)),
+                "stddev": samples.std(ddof=1), "repetitions": len(samples)}
+    baseline = cell([1.00, 1.01, 0.99, 1.02, 0.98, 1.00, 1.01, 0.99])
+    change, p_value, effect = benchmark.compare_cell(baseline, cell([1.20, 1.21, 1.19, 1.22, 1.18, 1.20, 1.21, 1.19]))
+    assert change == pytest.approx(0.2)
+    assert p_value < benchmark.COMPARE_ALPHA
+    assert effect == "delta=+1.00"
+    _, p_value, _ = benchmark.compare_cell(baseline, baseline)
+    assert p_value > benchmark.COMPARE_ALPHA
+
+def write_noisy_results(path, rng, cells=300, repetitions=7, noise=0.2):
+    """A results CSV whose cell statistics are drawn from the same distribution on every call."""
+    rows = []
+    for i in range(cells):
+        samples = rng.normal(1e-3, 1e-3 * noise, repetitions)
+        rows.append({"Algorithm": f"Sort {i}", "Input Type": "Random", "Input Size (N)": 1000,
+                     "Average Time (s)": samples.mean(), "Median Time (s)": np.median(samples),
+                     "Stddev Time (s)": samples.std(ddof=1), "Repetitions": repetitions})
+    pd.DataFrame(rows).to_csv(path, index=False)
+    return str(path)
+
+def test_many_noisy_identical_cells_pass(benchmark, tmp_path):
+    rng = np.random.default_rng(12345)
+    baseline = write_noisy_results(tmp_path / "baseline.csv", rng)
+    candidate = write_noisy_results(tmp_path / "candidate.csv", rng)
+    # Uncorrected, some of the 300 cells come out significantly slower by more than the threshold
+    baseline_cells = benchmark.load_comparison_cells(baseline)
+    candidate_cells = benchmark.load_comparison_cells(candidate)
+    tests = [benchmark.compare_cell(baseline_cells[cell], candidate_cells[cell]) for cell in baseline_cells]
+    assert any(p_value < benchmark.COMPARE_ALPHA and change > benchmark.COMPARE_THRESHOLD
+               for change, p_value, effect in tests)
+    assert benchmark.compare_main([baseline, candidate]) == 0
+
+def test_cells_below_the_time_floor_cannot_regress(benchmark, tmp_path, capsys):
+    baseline = write_results(tmp_path / "baseline.csv")
+    # The 1000-element cells take 100 µs: 30% slower fails below that floor, not above it
+    candidate = write_results(tmp_path / "candidate.csv", slowdown=0.3, slowed=[("Merge Sort", 1000)])
+    assert benchmark.compare_main([baseline, candidate, "--min-time", "5e-5"]) == 1
+    assert benchmark.compare_main([baseline, candidate, "--min-time", "5e-4"]) == 0
+    assert "slower" in capsys.readouterr().out
+
+def test_adjust_p_values(benchmark):
+    adjusted = benchmark.adjust_p_values([0.01, float('nan'), 0.04, 0.03])
+    assert np.isnan(adjusted[1])
+    # Benjamini-Hochberg over the 3 tested cells: 0.01 * 3 / 1, then min(0.03 * 3 / 2, 0.04 * 3 / 3)
+    assert adjusted[[0, 2, 3]] == pytest.approx([0.03, 0.04, 0.04])
@@ -0,0 +1,36 @@
+import numpy as np
+import pytest
+
+from complexity_fit import MAX_SEARCH_N, fit_models, max_n_within, predict
+
+NS = np.array([100, 300, 1000, 3000, 10000, 30000, 100000])
+
+def test_fit_recovers_n_log_n():
+    values = 1e-6 + 2e-8 * NS * np.log2(NS)
+    best = fit_models(NS, values)[0]
+    assert best.model == "n log n"
+    assert best.coefficient == pytest.approx(2e-8, rel=1e-6)
+    assert best.constant == pytest.approx(1e-6, rel=1e-4)
+    assert best.residual < 1e-9
+
+def test_fit_recovers_n_squared():
+    values = 0.5 * NS.astype(float) ** 2
+    fits = fit_models(NS, values)
+    assert fits[0].model == "n^2"
+    assert fits[0].coefficient == pytest.approx(0.5, rel=1e-6)
+    assert [fit.residual for fit in fits] == sorted(fit.residual for fit in fits)
+
+def test_too_few_points():
+    assert fit_models([100, 1000], [1.0, 10.0]) == []
+
+def test_max_n_within_inverts_the_fit():
+    values = 1e-6 + 2e-8 * NS * np.log2(NS)
+    best = fit_models(NS, values)[0]
+    n = max_n_within(best, 0.01)
+    assert predict(best, n) <= 0.01 < predict(best, n + 1)
+
+def test_max_n_within_bounds():
+    values = 0.5 * NS.astype(float) ** 2
+    best = fit_models(NS, values)[0]
+    assert max_n_within(best, predict(best, 2) / 2) == 0
+    assert max_n_within(best, predict(best, MAX_SEARCH_N)) == float('inf')
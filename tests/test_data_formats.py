@@ -0,0 +1,45 @@
+import numpy as np
+import pytest
+
+import generate_test_data as generator
+from element_types import ELEMENT_TYPES, element_dtype, element_keys, to_elements
+
+N = 1000
+
+@pytest.mark.parametrize("element_type", ELEMENT_TYPES)
+@pytest.mark.parametrize("data_type", ["random", "sorted", "few_unique"])
+def test_npy_round_trip(benchmark, tmp_path, element_type, data_type):
+    path = str(tmp_path / f"n_{N}_{data_type}.npy")
+    generator.save_data_to_binary_file(generator.generate_chunks(N, data_type, chunk_size=300), N, path, element_type)
+    data = benchmark.read_test_data(path)
+    assert isinstance(data, np.memmap) and data.dtype == element_dtype(element_type)
+    assert np.array_equal(data, to_elements(generator.generate_data(N, data_type), element_type))
+
+@pytest.mark.parametrize("element_type", ELEMENT_TYPES)
+def test_conversion_keeps_order_and_duplicates(element_type):
+    values = generator.generate_data(N, "few_unique")
+    keys = np.asarray(element_keys(to_elements(values, element_type)))
+    order = np.argsort(values, kind="stable")
+    assert np.array_equal(np.argsort(keys, kind="stable"), order)
+    assert len(np.unique(keys)) == len(np.unique(values))
+
+def test_record_payload_is_the_key_low_byte():
+    elements = to_elements(np.array([1, 258, 1000]), "record8")
+    payload = np.frombuffer(elements["payload"].tobytes(), dtype=np.uint8).reshape(3, 8)
+    assert np.array_equal(payload, np.repeat(np.array([[1], [2], [232]], dtype=np.uint8), 8, axis=1))
+
+def test_text_round_trip(benchmark, tmp_path):
+    path = str(tmp_path / f"n_{N}_random.txt")
+    generator.save_data_to_file(generator.generate_chunks(N, "random", chunk_size=300), path)
+    values = generator.generate_data(N, "random")
+    assert benchmark.read_test_data(path) == values.tolist()
+    assert np.array_equal(np.load(generator.convert_text_file_to_binary(path)), values.astype(np.int32))
+
+@pytest.mark.parametrize("element_type", ELEMENT_TYPES)
+def test_text_input_keeps_every_key(benchmark, element_type):
+    # The text the C programs scanf must hold the keys exactly, floats included
+    data = to_elements(generator.generate_data(N, "full_range"), element_type)
+    count, keys = benchmark.text_input(data).split("\n")
+    parse = float if element_type == "float64" else int
+    assert int(count) == N
+    assert np.array_equal(np.array([parse(key) for key in keys.split()]), element_keys(data))
@@ -0,0 +1,20 @@
+def test_data_facts_are_cached_until_the_file_changes(benchmark, tmp_path):
+    data_file = tmp_path / "n_3_random.txt"
+    data_file.write_text("3\n1\n2\n")
+    index_path = str(tmp_path / "index.json")
+    calls = []
+    def compute(path):
+        calls.append(path)
+        return len(calls)
+
+    assert benchmark.data_file_fact(str(data_file), "fact", compute, index_path) == 1
+    assert benchmark.data_file_fact(str(data_file), "fact", compute, index_path) == 1
+    benchmark.save_data_index()
+    # A new process reads the saved index instead of the file
+    benchmark._data_index_state["index_path"] = None
+    assert benchmark.data_file_fact(str(data_file), "fact", compute, index_path) == 1
+    assert len(calls) == 1
+
+    data_file.write_text("3\n1\n-2\n4\n")
+    assert benchmark.data_file_fact(str(data_file), "fact", compute, index_path) == 2
+    assert benchmark.data_file_fact(str(data_file), "negative_keys", benchmark._scan_negative_keys, index_path)
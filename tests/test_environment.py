@@ -0,0 +1,9 @@
+import environment
+
+def test_high_load_is_per_machine_core(monkeypatch):
+    # Pinned to one core of 8 (--low-noise): the machine-wide load is still spread over all 8
+    monkeypatch.setattr(environment, "available_cores", lambda: [7])
+    monkeypatch.setattr(environment.os, "cpu_count", lambda: 8)
+    assert not environment.is_high_load(2.5)
+    assert environment.is_high_load(4.0)
+    assert not environment.is_high_load(None)
@@ -0,0 +1,51 @@
+import numpy as np
+import pytest
+
+import generate_test_data as generator
+
+N = 1000
+
+def test_same_seed_same_data():
+    for data_type in generator.DATA_TYPES:
+        assert np.array_equal(generator.generate_data(N, data_type, seed=7), generator.generate_data(N, data_type, seed=7))
+
+@pytest.mark.parametrize("data_type", ["random", "nearly_sorted", "few_unique", "zipf", "full_range"])
+def test_other_seed_other_data(data_type):
+    assert not np.array_equal(generator.generate_data(N, data_type, seed=7), generator.generate_data(N, data_type, seed=8))
+
+@pytest.mark.parametrize("data_type", generator.DATA_TYPES)
+def test_chunking_does_not_change_the_data(data_type):
+    whole = generator.generate_data(N, data_type)
+    chunked = np.concatenate(list(generator.generate_chunks(N, data_type, chunk_size=64)))
+    assert np.array_equal(whole, chunked)
+
+@pytest.mark.parametrize("data_type", generator.DATA_TYPES)
+def test_keys_are_non_negative_32_bit(data_type):
+    data = generator.generate_data(N, data_type)
+    assert len(data) == N
+    assert data.min() >= 0 and data.max() <= generator.INT32_MAX
+
+def test_ordered_distributions():
+    index = np.arange(N)
+    assert np.array_equal(generator.generate_data(N, "sorted"), index)
+    assert np.array_equal(generator.generate_data(N, "reverse_sorted"), index[::-1])
+    organ_pipe = generator.generate_data(N, "organ_pipe")
+    assert np.all(np.diff(organ_pipe[:N // 2]) > 0) and np.all(np.diff(organ_pipe[N // 2:]) < 0)
+    sawtooth = generator.generate_data(N, "sawtooth")
+    assert np.sum(np.diff(sawtooth) < 0) == generator.SAWTOOTH_TEETH - 1
+
+def test_nearly_sorted_has_exactly_k_swaps():
+    data = generator.generate_data(N, "nearly_sorted")
+    k = int(N * generator.NEARLY_SORTED_SWAP_FRACTION)
+    moved = np.flatnonzero(data != np.arange(N))
+    assert len(moved) == 2 * k
+    # Disjoint swaps: a permutation that is its own inverse
+    assert np.array_equal(np.sort(data), np.arange(N))
+    assert np.array_equal(data[data], np.arange(N))
+
+def test_few_unique_values():
+    assert len(np.unique(generator.generate_data(N, "few_unique"))) <= generator.FEW_UNIQUE_VALUES
+
+def test_unknown_distribution():
+    with pytest.raises(ValueError):
+        generator.generate_data(N, "shuffled")
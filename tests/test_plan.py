@@ -0,0 +1,30 @@
+import argparse
+
+import numpy as np
+
+def plan(benchmark, builds):
+    return benchmark.benchmark_plan(argparse.Namespace(builds=builds, max_threads=1, mode="server"))
+
+def test_pgo_run_keys_follow_the_training_inputs(benchmark, tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "TEST_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(benchmark, "DATA_INDEX_PATH", str(tmp_path / "index.json"))
+    np.save(tmp_path / "n_100_random.npy", np.arange(100, dtype=np.int32))
+    np.save(tmp_path / "n_100000_random.npy", np.arange(100000, dtype=np.int32))
+    key = lambda run_keys: run_keys[("merge_sort", str(tmp_path / "n_100000_random.npy"))]
+
+    before = key(plan(benchmark, ["gcc-O3-pgo"]).run_keys)
+    assert "-fprofile-use training=" in before.compile_flags
+    # Only the training input (n <= PGO_TRAINING_MAX_N) changes, not the measured one
+    np.save(tmp_path / "n_100_random.npy", np.arange(100, dtype=np.int32)[::-1])
+    after = key(plan(benchmark, ["gcc-O3-pgo"]).run_keys)
+    assert after.data_hash == before.data_hash
+    assert after.compile_flags != before.compile_flags
+
+    assert "-fprofile-use" not in key(plan(benchmark, ["gcc-O3"]).run_keys).compile_flags
+
+def test_only_standard_types_with_files_are_planned(benchmark, tmp_path, monkeypatch):
+    monkeypatch.setattr(benchmark, "TEST_DATA_DIR", str(tmp_path))
+    monkeypatch.setattr(benchmark, "DATA_INDEX_PATH", str(tmp_path / "index.json"))
+    for data_type in ("random", "sorted", "nearly_sorted"):
+        np.save(tmp_path / f"n_100_{data_type}.npy", np.arange(100, dtype=np.int32))
+    assert plan(benchmark, ["gcc-O0"]).data_types == ["random", "sorted", "nearly_sorted"]
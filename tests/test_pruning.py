@@ -0,0 +1,19 @@
+import os
+
+from result_store import ResultStore, RunKey
+
+def run_key(algorithm, data_hash):
+    return RunKey(algorithm, "source", "gcc", "-O2", "host", data_hash)
+
+def test_cell_history_skips_unsupported_inputs(benchmark, tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    test_data_files = ["n_100_random.txt", "n_1000_random.txt", "n_10000_random.txt", "n_100_sorted.txt"]
+    path = lambda data_file: os.path.join(benchmark.TEST_DATA_DIR, data_file)
+    # n_1000_random.txt has negative keys: radix_sort has no run key for it
+    run_keys = {("radix_sort", path("n_100_random.txt")): run_key("radix_sort", "a"),
+                ("radix_sort", path("n_100_sorted.txt")): run_key("radix_sort", "b")}
+    store.record(run_keys[("radix_sort", path("n_100_random.txt"))], "n_100_random.txt", 100, "random", 0, 0.5, 10)
+    store.record(run_keys[("radix_sort", path("n_100_sorted.txt"))], "n_100_sorted.txt", 100, "sorted", 0, 0.1, 10)
+    history = benchmark.cell_history(store, run_keys, test_data_files, "radix_sort", "random", 10000)
+    assert history == [(100, [(0.5, 10, "ok", {})])]
+    store.close()
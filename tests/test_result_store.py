@@ -0,0 +1,56 @@
+import os
+
+from result_store import MEMORY_PASS_STATUS, ResultStore, RunKey
+
+KEY = RunKey("merge_sort", "source", "gcc", "-O0", "host", "data")
+OTHER_KEY = KEY._replace(compile_flags="-O3")
+
+def test_latest_record_of_each_repetition(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    store.record(KEY, "n_100_random.npy", 100, "random", 0, 1.0, 10, metrics={"peak_rss_kb": 5})
+    store.record(KEY, "n_100_random.npy", 100, "random", 1, float('inf'), 0, "crashed")
+    store.record(KEY, "n_100_random.npy", 100, "random", 1, 2.0, 20)  # Measured again
+    store.record(KEY, "n_100_random.npy", 100, "random", 2, 3.0, 30)
+    assert store.load(KEY) == [(1.0, 10, "ok", {"peak_rss_kb": 5}), (2.0, 20, "ok", {}), (3.0, 30, "ok", {})]
+    assert store.load(KEY, 2) == [(1.0, 10, "ok", {"peak_rss_kb": 5}), (2.0, 20, "ok", {})]
+    assert store.load(OTHER_KEY) == []
+    store.close()
+
+def test_records_survive_reopening(tmp_path):
+    path = str(tmp_path / "results.sqlite")
+    store = ResultStore(path)
+    store.record(KEY, "n_100_random.npy", 100, "random", 0, 1.0, 10)
+    store.close()
+    store = ResultStore(path)
+    assert store.measured_repetitions() == {(KEY, 0)}
+    store.close()
+
+def test_load_cells_leaves_out_the_memory_pass(tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    store.record(KEY, "n_100_random.npy", 100, "random", 0, 1.0, 10)
+    store.record(KEY._replace(compile_flags="-O0 -DSORT_COUNT_ALLOCATIONS"), "n_100_random.npy", 100, "random", 0,
+                 5.0, 10, MEMORY_PASS_STATUS)
+    assert store.load_cells() == {("merge_sort", "random", 100): [(1.0, "ok")]}
+    store.close()
+
+def test_resume_runs_only_the_missing_repetitions(benchmark, tmp_path):
+    store = ResultStore(str(tmp_path / "results.sqlite"))
+    data_files = ["n_100_random.npy", "n_1000_random.npy"]
+    paths = [os.path.join(benchmark.TEST_DATA_DIR, data_file) for data_file in data_files]
+    executables = {"merge_sort": {"int32": "merge_sort-0"}}
+    run_keys = {("merge_sort", paths[0]): KEY, ("merge_sort", paths[1]): KEY._replace(data_hash="other")}
+    tasks = benchmark.build_experiment_matrix(executables, data_files, repetitions=3)
+    store.record(KEY, data_files[0], 100, "random", 0, 1.0, 10)
+    store.record(KEY, data_files[0], 100, "random", 2, 1.0, 10, "timeout")  # Failed runs are not run again
+    store.record(OTHER_KEY, data_files[1], 1000, "random", 0, 1.0, 10)  # Another build: no match
+
+    remaining = benchmark.unmeasured_tasks(tasks, run_keys, store.measured_repetitions())
+    assert [(task.data_filepath, task.repetition) for task in remaining] == \
+        [(paths[0], 1), (paths[1], 0), (paths[1], 1), (paths[1], 2)]
+
+    # An adaptive cell counts as measured as soon as any of its repetitions is stored
+    adaptive = benchmark.AdaptivePolicy(0, 3, 10, 0.05, None)
+    tasks = benchmark.build_experiment_matrix(executables, data_files, adaptive=adaptive)
+    remaining = benchmark.unmeasured_tasks(tasks, run_keys, store.measured_repetitions())
+    assert [task.data_filepath for task in remaining] == [paths[1]]
+    store.close()
@@ -0,0 +1,29 @@
+import pytest
+
+pytest.importorskip("matplotlib")
+
+def test_scaling_series_speedup(benchmark):
+    results = {
+        "parallel_merge_sort@1": {"random": [(1000, 2.0, 0), (10000, 20.0, 0)]},
+        "parallel_merge_sort@2": {"random": [(1000, 4.0, 0), (10000, 10.0, 0)]},
+        "merge_sort": {"random": [(1000, 1.0, 0)]},
+    }
+    assert benchmark.scaling_series(results, "random") == {"parallel_merge_sort": {2: [(1000, 0.5), (10000, 2.0)]}}
+
+def test_scaling_series_drops_empty_series(benchmark):
+    # Every 2-thread run failed, and the 4-thread runs have no single-thread counterpart
+    results = {
+        "parallel_radix_sort@1": {"random": [(1000, 1.0, 0)]},
+        "parallel_radix_sort@2": {"random": [(1000, float('inf'), 0)]},
+        "parallel_radix_sort@4": {"random": [(10000, 1.0, 0)]},
+        "parallel_merge_sort@1": {"random": [(1000, 2.0, 0)]},
+        "parallel_merge_sort@2": {"random": [(1000, 1.0, 0)]},
+        "parallel_merge_sort@4": {"random": []},
+    }
+    assert benchmark.scaling_series(results, "random") == {"parallel_merge_sort": {2: [(1000, 2.0)]}}
+
+def test_plot_scaling_without_plottable_sizes(benchmark, tmp_path):
+    # All points lie beyond MAX_PLOT_N: the axes stays empty and must not be log-scaled
+    results = {"Parallel Merge Sort": {2: [(benchmark.MAX_PLOT_N * 10, 1.5)]}}
+    [path] = benchmark.plot_scaling(results, "Random", str(tmp_path))
+    assert (tmp_path / "parallel_random_case_speedup.png").exists() and path.endswith(".png")